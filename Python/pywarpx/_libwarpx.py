@@ -169,6 +169,7 @@ class LibWarpX():
         self.libwarpx_so.amrex_init_with_inited_mpi.argtypes = (ctypes.c_int, _LP_LP_c_char, _MPI_Comm_type)
         self.libwarpx_so.warpx_getParticleStructs.restype = _LP_particle_p
         self.libwarpx_so.warpx_getParticleArrays.restype = _LP_LP_c_particlereal
+        self.libwarpx_so.warpx_getParticleArraysMulti.restype = _LP_LP_c_particlereal
         self.libwarpx_so.warpx_getParticleCompIndex.restype = ctypes.c_int
         self.libwarpx_so.warpx_getEfield.restype = _LP_LP_c_real
         self.libwarpx_so.warpx_getEfieldLoVects.restype = _LP_c_int
@@ -232,6 +233,8 @@ class LibWarpX():
         self.libwarpx_so.warpx_getParticleBoundaryBufferStructs.restype = _LP_LP_c_particlereal
         self.libwarpx_so.warpx_getParticleBoundaryBuffer.restype = _LP_LP_c_particlereal
         self.libwarpx_so.warpx_getParticleBoundaryBufferScrapedSteps.restype = _LP_LP_c_int
+        self.libwarpx_so.warpx_getParticleBoundaryBufferClearCount.restype = ctypes.c_int
+        self.libwarpx_so.warpx_getParticleBoundaryBufferReorderCount.restype = ctypes.c_int
 
         self.libwarpx_so.warpx_getEx_nodal_flag.restype = _LP_c_int
         self.libwarpx_so.warpx_getEy_nodal_flag.restype = _LP_c_int
@@ -279,6 +282,7 @@ class LibWarpX():
         self.libwarpx_so.warpx_maxStep.restype = ctypes.c_int
         self.libwarpx_so.warpx_stopTime.restype = c_real
         self.libwarpx_so.warpx_finestLevel.restype = ctypes.c_int
+        self.libwarpx_so.warpx_getLayoutVersion.restype = ctypes.c_int
         self.libwarpx_so.warpx_getMyProc.restype = ctypes.c_int
         self.libwarpx_so.warpx_getNProcs.restype = ctypes.c_int
         self.libwarpx_so.eval_expression_t.restype = c_real
@@ -299,7 +303,17 @@ class LibWarpX():
         self.libwarpx_so.warpx_sett_new.argtypes = [ctypes.c_int, c_real]
         self.libwarpx_so.warpx_getdt.argtypes = [ctypes.c_int]
         self.libwarpx_so.eval_expression_t.argtypes = [ctypes.c_char_p, c_real]
-        self.libwarpx_so.warpx_calcSchottkyWeight.argtypes = [ctypes.c_char_p, c_real, ctypes.c_int]
+        self.libwarpx_so.warpx_calcSchottkyWeight.argtypes = [
+            ctypes.c_char_p, ctypes.c_double,
+            _ndpointer(ctypes.c_double, flags="C_CONTIGUOUS"), ctypes.c_int,
+            ctypes.c_int
+        ]
+        self.libwarpx_so.warpx_injectSchottkyParticles.argtypes = [
+            ctypes.c_char_p, ctypes.c_char_p, ctypes.c_double,
+            _ndpointer(ctypes.c_double, flags="C_CONTIGUOUS"), ctypes.c_int,
+            ctypes.c_double, ctypes.c_double, ctypes.c_int,
+            _ndpointer(ctypes.c_double, flags="C_CONTIGUOUS")
+        ]
 
     def get_boundary_number(self, boundary):
         '''
@@ -461,6 +475,16 @@ class LibWarpX():
         '''
         return self.libwarpx_so.warpx_getistep(level)
 
+    def get_layout_version(self):
+        '''
+
+        Get a counter that is incremented whenever the box layout of the
+        mesh changes, i.e. on allocation, regrid or load balance. It can
+        be used to invalidate cached layout information.
+
+        '''
+        return self.libwarpx_so.warpx_getLayoutVersion()
+
     def gett_new(self, level=0):
         '''
 
@@ -642,6 +666,36 @@ class LibWarpX():
             x, y, z, ux, uy, uz, nattr, attr, unique_particles
         )
 
+    def particle_injector(self, species_name, extra_comps=None,
+                          unique_particles=True, capacity=0):
+        '''
+
+        Create a persistent handle for repeatedly adding particles of a
+        species without the per-call setup cost of `add_particles()`.
+
+        Parameters
+        ----------
+
+        species_name     : the species to add the particles to
+        extra_comps      : names of the extra particle attributes that will be
+                        set through the handle. Other runtime attributes
+                        are set to 0.
+        unique_particles : whether the particles are unique or duplicated on
+                        several processes. (default = True)
+        capacity         : initial number of particles the staging buffers can
+                        hold. (default = 0)
+
+        Returns
+        -------
+
+            A ParticleInjector instance.
+
+        '''
+        return ParticleInjector(
+            self, species_name, extra_comps=extra_comps,
+            unique_particles=unique_particles, capacity=capacity
+        )
+
     def get_particle_count(self, species_name, local=False):
         '''
 
@@ -753,6 +807,70 @@ class LibWarpX():
         _libc.free(data)
         return particle_data
 
+    def get_particle_arrays_multi(self, species_name, comp_names, level):
+        '''
+
+        This returns, for each tile on this process, a list of numpy arrays
+        containing the particle array data of every requested component. All
+        components are fetched in a single traversal of the particle tiles.
+
+        The data for the numpy arrays are not copied, but share the underlying
+        memory buffer with WarpX. The numpy arrays are fully writeable.
+
+        Parameters
+        ----------
+
+            species_name   : the species name that the data will be returned for
+            comp_names     : list of the components of the array data that
+                             will be returned.
+
+        Returns
+        -------
+
+            A List (one entry per non-empty tile) of lists of numpy arrays,
+            ordered as in comp_names.
+
+        '''
+
+        ncomps = len(comp_names)
+        c_comp_names = (ctypes.c_char_p * ncomps)(
+            *[comp_name.encode('utf-8') for comp_name in comp_names]
+        )
+
+        particles_per_tile = _LP_c_int()
+        num_tiles = ctypes.c_int(0)
+        data = self.libwarpx_so.warpx_getParticleArraysMulti(
+            ctypes.c_char_p(species_name.encode('utf-8')),
+            c_comp_names, ncomps,
+            level, ctypes.byref(num_tiles), ctypes.byref(particles_per_tile)
+        )
+
+        particle_data = []
+        for i in range(num_tiles.value):
+            if particles_per_tile[i] == 0:
+                continue
+            tile_data = []
+            for j in range(ncomps):
+                if not data[i*ncomps + j]:
+                    raise Exception(
+                        f'get_particle_arrays_multi: data[{i*ncomps + j}] '
+                        f'for tile {i} was not initialized'
+                    )
+                arr = np.ctypeslib.as_array(
+                    data[i*ncomps + j], (particles_per_tile[i],)
+                )
+                try:
+                    # This fails on some versions of numpy
+                    arr.setflags(write=1)
+                except ValueError:
+                    pass
+                tile_data.append(arr)
+            particle_data.append(tile_data)
+
+        _libc.free(particles_per_tile)
+        _libc.free(data)
+        return particle_data
+
     def get_particle_x(self, species_name, level=0):
         '''
 
@@ -1071,6 +1189,170 @@ class LibWarpX():
         _libc.free(data)
         return particle_data
 
+    def particle_boundary_buffer_cursor(self):
+        '''
+
+        Create a cursor to read particle boundary buffers incrementally with
+        `get_particle_boundary_buffer_since()`.
+
+        '''
+        return ParticleBoundaryBufferCursor()
+
+    def get_particle_boundary_buffer_since(self, species_name, boundary,
+                                           cursor, comp_names, level=0,
+                                           trim=False):
+        '''
+
+        This returns the particle data for a species that has been added to
+        the buffer of a specific simulation boundary since the previous call
+        made with the same cursor. Only the newly appended part of each tile
+        is read, so the cost scales with the number of newly scraped
+        particles instead of the size of the buffer.
+
+        Real components and "step_scraped" are returned as contiguous views
+        that share the underlying memory buffer with WarpX. Struct fields
+        ('x', 'y', 'z', 'id' and 'cpu', with the same meaning as in
+        `get_particle_boundary_buffer_structs()`) are returned as copies.
+        If the buffers were trimmed or redistributed, or the number of tiles
+        changed, since the previous call the cursor falls back to selecting
+        particles by the step at which they were scraped, and all returned
+        arrays are copies.
+
+        Parameters
+        ----------
+
+            species_name   : the species name that the data will be returned for.
+            boundary       : the boundary from which to get the scraped particle data.
+                            In the form x/y/z_hi/lo or eb.
+            cursor         : ParticleBoundaryBufferCursor recording what was
+                            already read. It is advanced by this call.
+            comp_names     : list of the components that will be returned.
+            level          : Which AMR level to retrieve scraped particle data from.
+            trim           : If True, remove the returned particles from the
+                            buffer. The returned arrays are then copies. Only
+                            use this if the caller is the only reader of
+                            the buffer.
+
+        Returns
+        -------
+
+            A dictionary with, for each requested component, a list of numpy
+            arrays (one per tile with new particles).
+
+        '''
+        particle_data = {comp_name: [] for comp_name in comp_names}
+        step = self.getistep(level)
+        clear_count = (
+            self.libwarpx_so.warpx_getParticleBoundaryBufferClearCount()
+        )
+        reorder_count = (
+            self.libwarpx_so.warpx_getParticleBoundaryBufferReorderCount()
+        )
+        # after a clear everything in the buffer is new
+        if cursor.clear_count != clear_count:
+            cursor.tile_offsets = []
+        cursor.clear_count = clear_count
+
+        # accessing an undefined buffer causes a segfault so check that
+        # there is something to read first
+        if self.get_particle_boundary_buffer_size(species_name, boundary) == 0:
+            cursor.tile_offsets = []
+            cursor.reorder_count = reorder_count
+            cursor.last_step = step
+            return particle_data
+
+        c_species_name = ctypes.c_char_p(species_name.encode('utf-8'))
+        boundary_num = self.get_boundary_number(boundary)
+
+        def _get_tile_pointers(func, *args):
+            particles_per_tile = _LP_c_int()
+            num_tiles = ctypes.c_int(0)
+            data = func(
+                c_species_name, boundary_num, level,
+                ctypes.byref(num_tiles), ctypes.byref(particles_per_tile),
+                *args
+            )
+            counts = [particles_per_tile[i] for i in range(num_tiles.value)]
+            pointers = [data[i] for i in range(num_tiles.value)]
+            _libc.free(particles_per_tile)
+            _libc.free(data)
+            return counts, pointers
+
+        counts, step_pointers = _get_tile_pointers(
+            self.libwarpx_so.warpx_getParticleBoundaryBufferScrapedSteps
+        )
+        num_tiles = len(counts)
+
+        offsets = cursor.get_tile_offsets(num_tiles, reorder_count)
+        offsets_valid = offsets is not None
+        if not offsets_valid:
+            offsets = [0] * num_tiles
+
+        # determine which part of each tile has not been read yet
+        selections = {}
+        for i in range(num_tiles):
+            if counts[i] == 0 or counts[i] <= offsets[i]:
+                continue
+            if offsets_valid:
+                selections[i] = slice(offsets[i], counts[i])
+            else:
+                steps = np.ctypeslib.as_array(step_pointers[i], (counts[i],))
+                selections[i] = np.nonzero(steps > cursor.last_step)[0]
+
+        struct_names = [
+            comp_name for comp_name in comp_names
+            if comp_name in self._p_dtype.names
+        ]
+        if struct_names:
+            _, struct_pointers = _get_tile_pointers(
+                self.libwarpx_so.warpx_getParticleBoundaryBufferStructs
+            )
+        for comp_name in comp_names:
+            if comp_name in struct_names:
+                pointers = struct_pointers
+            elif comp_name == 'step_scraped':
+                pointers = step_pointers
+            else:
+                _, pointers = _get_tile_pointers(
+                    self.libwarpx_so.warpx_getParticleBoundaryBuffer,
+                    ctypes.c_char_p(comp_name.encode('utf-8'))
+                )
+
+            for i, selection in selections.items():
+                if comp_name in struct_names:
+                    structs = self._array1d_from_pointer(
+                        pointers[i], self._p_dtype, counts[i]
+                    )
+                    arr = np.ascontiguousarray(structs[selection][comp_name])
+                else:
+                    arr = np.ctypeslib.as_array(pointers[i], (counts[i],))
+                    try:
+                        # This fails on some versions of numpy
+                        arr.setflags(write=1)
+                    except ValueError:
+                        pass
+                    arr = arr[selection]
+                    if trim:
+                        arr = arr.copy()
+                if len(arr) > 0:
+                    particle_data[comp_name].append(arr)
+
+        if trim:
+            num_consumed = (ctypes.c_int * num_tiles)(*counts)
+            self.libwarpx_so.warpx_trimParticleBoundaryBuffer(
+                c_species_name, boundary_num, level, num_consumed, num_tiles
+            )
+            cursor.tile_offsets = [0] * num_tiles
+            reorder_count = (
+                self.libwarpx_so.warpx_getParticleBoundaryBufferReorderCount()
+            )
+        else:
+            cursor.tile_offsets = counts
+        cursor.reorder_count = reorder_count
+        cursor.last_step = step
+
+        return particle_data
+
     def clearParticleBoundaryBuffer(self):
         '''
 
@@ -2677,4 +2959,174 @@ class LibWarpX():
         return self._get_nodal_flag(self.libwarpx_so.warpx_getG_pml_nodal_flag)
 
 
+class ParticleInjector():
+
+    """Persistent handle used to repeatedly add particles of one species.
+
+    The component layout of the species is looked up once, and the particle
+    data are staged in reusable buffers of the WarpX particle real type that
+    only grow when a larger batch is requested. Callers can either write
+    directly into the staged buffers (see ``stage`` and ``__getitem__``) or
+    pass arrays and scalars to ``inject``, which copies them into the buffers
+    without allocating new ones. Handles should be created through
+    ``LibWarpX.particle_injector`` after all runtime components of the
+    species have been added.
+    """
+
+    _coord_names = ('x', 'y', 'z', 'ux', 'uy', 'uz')
+
+    def __init__(self, lib, species_name, extra_comps=None,
+                 unique_particles=True, capacity=0):
+        self.lib = lib
+        self.species_name = species_name
+        self.unique_particles = unique_particles
+        self._c_species_name = ctypes.c_char_p(species_name.encode('utf-8'))
+        self.dtype = lib._numpy_particlereal_dtype
+
+        # --- The -3 is because the comps include the velocites
+        self.nattr = lib.get_nattr_species(species_name) - 3
+        self.extra_comps = list(extra_comps or [])
+        self.attr_cols = {'w': 0}
+        for comp in self.extra_comps:
+            # --- The -3 is because components 1 to 3 are velocities
+            self.attr_cols[comp] = (
+                lib.get_particle_comp_index(species_name, comp) - 3
+            )
+
+        self.capacity = 0
+        self.npart = 0
+        self._coord_bufs = {
+            name: np.zeros(0, self.dtype) for name in self._coord_names
+        }
+        self._attr_buf = np.zeros((0, self.nattr), self.dtype)
+        self.reserve(capacity)
+
+    def reserve(self, npart):
+        '''
+
+        Make sure the staging buffers can hold at least npart particles. The
+        capacity at least doubles whenever it grows so that slowly increasing
+        batch sizes only rarely trigger a reallocation. Staged data are not
+        preserved when the buffers grow.
+
+        '''
+        if npart <= self.capacity:
+            return
+        self.capacity = max(int(npart), 2*self.capacity)
+        for name in self._coord_names:
+            self._coord_bufs[name] = np.zeros(self.capacity, self.dtype)
+        # Runtime components not managed by this handle stay zero.
+        self._attr_buf = np.zeros((self.capacity, self.nattr), self.dtype)
+
+    def stage(self, npart):
+        '''
+
+        Prepare the staging buffers for a batch of npart particles. The
+        contents of the buffers are not reset, so every staged quantity
+        should be written before calling ``inject``.
+
+        '''
+        self.reserve(npart)
+        self.npart = int(npart)
+        return self
+
+    def __getitem__(self, name):
+        '''
+
+        Return a writeable view of the staged values of the given quantity
+        ('x', 'y', 'z', 'ux', 'uy', 'uz', 'w' or one of extra_comps) for the
+        currently staged batch.
+
+        '''
+        if name in self._coord_bufs:
+            return self._coord_bufs[name][:self.npart]
+        return self._attr_buf[:self.npart, self.attr_cols[name]]
+
+    def inject(self, **kwargs):
+        '''
+
+        Add the staged particles to the simulation.
+
+        Parameters
+        ----------
+
+        kwargs : optional arrays or scalars for any of the staged quantities.
+                 If any array is given the batch is restaged to its length.
+                 Position and velocity arrays that already have the right
+                 dtype and are contiguous are passed to WarpX without a copy;
+                 everything else is written into the staging buffers.
+                 Quantities not given keep their currently staged values.
+
+        '''
+        sizes = set(
+            np.size(val) for val in kwargs.values() if np.ndim(val) > 0
+        )
+        if len(sizes) > 1:
+            raise ValueError(
+                f"Inconsistent array lengths {sizes} passed to inject."
+            )
+        if sizes:
+            self.stage(sizes.pop())
+        npart = self.npart
+
+        coords = []
+        for name in self._coord_names:
+            val = kwargs.pop(name, None)
+            if (
+                isinstance(val, np.ndarray) and val.dtype == self.dtype
+                and val.flags.c_contiguous and val.size == npart
+            ):
+                coords.append(val)
+                continue
+            buf = self._coord_bufs[name][:npart]
+            if val is not None:
+                buf[...] = val
+            coords.append(buf)
+
+        for name, val in kwargs.items():
+            self[name][...] = val
+
+        self.lib.libwarpx_so.warpx_addNParticles(
+            self._c_species_name, npart, *coords, self.nattr,
+            self._attr_buf[:npart], self.unique_particles
+        )
+
+
+class ParticleBoundaryBufferCursor():
+
+    """Records how far a reader got through the per-tile particle boundary
+    buffers of one species and boundary, for use with
+    ``LibWarpX.get_particle_boundary_buffer_since``. Each reader of a buffer
+    should use its own cursor.
+    """
+
+    def __init__(self):
+        # number of particles already read in each tile
+        self.tile_offsets = []
+        # values of the buffer clear and reorder counters at the previous read
+        self.clear_count = None
+        self.reorder_count = None
+        # step at which the previous read happened
+        self.last_step = -1
+
+    def get_tile_offsets(self, num_tiles, reorder_count):
+        """Returns the number of particles already read in each of the
+        ``num_tiles`` tiles, or None if the previous read cannot be located in
+        the tiles anymore. That is the case after the buffers were reordered
+        or when tiles were added or removed, since the offsets are stored per
+        tile index; particles then have to be selected by the step at which
+        they were scraped.
+        """
+        if (self.reorder_count is not None
+                and self.reorder_count != reorder_count):
+            return None
+        # an empty list means nothing was left in the buffer at the previous
+        # read (or the buffer was cleared since), so everything is new
+        if not self.tile_offsets:
+            return [0] * num_tiles
+        if len(self.tile_offsets) != num_tiles:
+            return None
+        return self.tile_offsets
+
+
 libwarpx = LibWarpX()
@@ -16,7 +16,15 @@ For each call back type, the following three functions are defined.
  - isinstalled___: Checks if the function is installed
 
 These functions all take a function or instance method as an argument. Note that
-if an instance method is used, an extra reference to the method's object is saved.
+if an instance method is used, an extra reference to the method's object is saved,
+unless the install function is called with weak=True. In that case only a weak
+reference is kept and the method is dropped from the list once its object is deleted.
+
+The install functions also accept a period and offset. The function is then
+only called on steps where step % period == offset, with the step number as
+returned by libwarpx.getistep(0) at the time of the call. When all of the
+functions of a call back have a period, WarpX itself skips calling into Python
+on the other steps.
 
 The install can be done using a decorator, which has the prefix "callfrom". See example below.
 
@@ -51,19 +59,73 @@ def myplots():
   ppzx()
 installafterstep(myplots)
 
+Every call of an installed function is timed with ``time.perf_counter``. The
+per function statistics (call count, total, min and max durations and the most
+recent durations) can be accessed with getcallbackprofiles, reduced over all
+processors with gathercallbackprofiles and written to a JSON file with
+writecallbackprofiles. The timing can be turned off with
+enablecallbacktimers(False), in which case the functions are called directly
+without any timing overhead.
+
 """
 from __future__ import generators
 
+import collections
 import copy
 import ctypes
+import json
 import sys
 import time
 import types
+import weakref
 
 import numpy
 
+try:
+    from mpi4py import MPI as mpi
+    comm_world = mpi.COMM_WORLD
+    npes = comm_world.Get_size()
+except ImportError:
+    comm_world = None
+    npes = 1
+
 from ._libwarpx import libwarpx
 
+# --- Number of the most recent call durations saved for each function
+profile_history_length = 10
+
+
+class CallbackProfile(object):
+    """
+    Holds the timing statistics of a single call back function.
+    - ncalls: number of calls
+    - total: total time spent in the function
+    - min, max: shortest and longest single call
+    - last: the most recent call durations, up to profile_history_length
+    """
+
+    __slots__ = ('ncalls', 'total', 'min', 'max', 'last')
+
+    def __init__(self):
+        self.ncalls = 0
+        self.total = 0.
+        self.min = numpy.inf
+        self.max = 0.
+        self.last = collections.deque(maxlen=profile_history_length)
+
+    def add(self, dt):
+        """Records the duration of one call"""
+        self.ncalls += 1
+        self.total += dt
+        if dt < self.min: self.min = dt
+        if dt > self.max: self.max = dt
+        self.last.append(dt)
+
+    def todict(self):
+        return {'ncalls': self.ncalls, 'total': self.total,
+                'min': self.min if self.ncalls > 0 else 0., 'max': self.max,
+                'last': list(self.last)}
+
 
 class CallbackFunctions(object):
     """
@@ -76,25 +138,61 @@ class CallbackFunctions(object):
     the reference to the object (for example it can be created using a local
     variable in a function). It may be bad if the user thinks an object was
     deleted, but it actually isn't since it had (unkown to the user)
-    installed a method in one of the call back lists
+    installed a method in one of the call back lists. To avoid this, methods
+    can be installed with weak=True so that only a weak reference to the
+    instance is saved.
+
+    The installed functions are resolved into a tuple of callables which is
+    only rebuilt when functions are installed or uninstalled.
+
+    Functions can be installed with a period and offset, so that they are
+    only called on steps where step % period == offset. The schedules are
+    held in a list parallel to funcs, with None for functions called on every
+    step. When all functions have a schedule, it is also passed to WarpX so
+    that the call back is not called at all on the other steps.
     """
 
     def __init__(self,name=None,lcallonce=0):
         self.funcs = []
+        self.schedules = []
         self.time = 0.
         self.timers = {}
+        self.profiles = {}
         self.name = name
         self.lcallonce = lcallonce
+        self.ltimers = True
+        self._dispatch = None
+        self._dispatchnames = None
+        self._dispatchschedules = None
+        _callbacklists.append(self)
 
     def __call__(self,*args,**kw):
         """Call all of the functions in the list"""
-        tt = self.callfuncsinlist(*args,**kw)
-        self.time = self.time + tt
-        if self.lcallonce: self.funcs = []
+        if self.ltimers:
+            tt = self.callfuncsinlist(*args,**kw)
+            self.time = self.time + tt
+        else:
+            dispatch = self._dispatch
+            if dispatch is None:
+                dispatch = self._builddispatch()[0]
+            if self._dispatchschedules is None:
+                for f in dispatch:
+                    f(*args,**kw)
+            else:
+                step = libwarpx.libwarpx_so.warpx_getistep(0)
+                for f, schedule in zip(dispatch, self._dispatchschedules):
+                    if schedule is None or step % schedule[0] == schedule[1]:
+                        f(*args,**kw)
+        if self.lcallonce:
+            self.funcs = []
+            self.schedules = []
+            self._dispatch = None
 
     def clearlist(self):
         """Unregister/clear out all registered C callbacks"""
         self.funcs = []
+        self.schedules = []
+        self._dispatch = None
         libwarpx.libwarpx_so.warpx_clear_callback_py(
             ctypes.c_char_p(self.name.encode('utf-8'))
         )
@@ -111,20 +209,63 @@ class CallbackFunctions(object):
         """Checks if there are any functions installed"""
         return len(self.funcs) > 0
 
+    def _removefunc(self,func):
+        """Removes the entry from the list, along with its schedule"""
+        i = self.funcs.index(func)
+        del self.funcs[i]
+        del self.schedules[i]
+
+    def _setschedule(self):
+        """Passes the schedules to WarpX. If any function is called on every
+        step, WarpX is told to always call the call back."""
+        if self.funcs and None not in self.schedules:
+            schedules = sorted(set(self.schedules))
+        else:
+            schedules = []
+        periods = (ctypes.c_int*len(schedules))(*[p for p, o in schedules])
+        offsets = (ctypes.c_int*len(schedules))(*[o for p, o in schedules])
+        libwarpx.libwarpx_so.warpx_set_callback_py_schedule(
+            ctypes.c_char_p(self.name.encode('utf-8')),
+            len(schedules), periods, offsets
+        )
+
     def _getmethodobject(self,func):
-        """For call backs that are methods, returns the method's instance"""
+        """For call backs that are methods, returns the method's instance,
+        or None if it was saved as a weak reference and has been deleted"""
+        if isinstance(func[0],weakref.ref):
+            return func[0]()
         return func[0]
 
     def callbackfunclist(self):
-        """Generator returning callable functions from the list"""
+        """Returns an iterator over the callable functions from the list"""
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self._builddispatch()[0]
+        return iter(dispatch)
+
+    def _builddispatch(self):
+        """Resolves the installed functions into a tuple of callables, along
+        with a tuple of the names used for the timers. The tuple of schedules
+        of the callables is saved in _dispatchschedules, which is None if no
+        function has a schedule. The result is saved and reused until a
+        function is installed or uninstalled, unless a function installed by
+        name could not be found yet."""
+        lcomplete = True
+        lremoved = False
+        dispatch = []
+        schedules = []
         funclistcopy = copy.copy(self.funcs)
-        for f in funclistcopy:
+        for f, schedule in zip(funclistcopy, copy.copy(self.schedules)):
             if isinstance(f,list):
                 object = self._getmethodobject(f)
                 if object is None:
-                    self.funcs.remove(f)
+                    self._removefunc(f)
+                    lremoved = True
                     continue
-                result = getattr(object,f[1])
+                if isinstance(f[0],weakref.ref):
+                    result = _WeakMethodCall(self,f[0],getattr(object,f[1]))
+                else:
+                    result = getattr(object,f[1])
             elif isinstance(f,str):
                 import __main__
                 if f in __main__.__dict__:
@@ -133,6 +274,7 @@ class CallbackFunctions(object):
                     # --- name in the list with the function.
                     self.funcs[self.funcs.index(f)] = result
                 else:
+                    lcomplete = False
                     continue
             else:
                 result = f
@@ -149,10 +291,49 @@ class CallbackFunctions(object):
                     print("The name of the call back is %s"%f)
                 print("\n\n")
                 continue
-            yield result
+            dispatch.append(result)
+            schedules.append(schedule)
+
+        # --- If functions of deleted instances were dropped, update the C side
+        # --- as uninstallfuncinlist does
+        if lremoved:
+            if not self.hasfuncsinstalled():
+                self.clearlist()
+            else:
+                self._setschedule()
 
-    def installfuncinlist(self,f):
-        """Check if the specified function is installed"""
+        dispatch = tuple(dispatch)
+        if any(schedule is not None for schedule in schedules):
+            self._dispatchschedules = tuple(schedules)
+        else:
+            self._dispatchschedules = None
+        # --- For the timers, use the function (or method) name as the key.
+        # --- The profiles use the qualified name so that methods of
+        # --- different classes are kept separate.
+        names = tuple((f.__name__, getattr(f,'__qualname__',f.__name__))
+                      for f in dispatch)
+        if lcomplete:
+            self._dispatch = dispatch
+            self._dispatchnames = names
+        return dispatch, names
+
+    def installfuncinlist(self,f,weak=False,period=None,offset=0):
+        """Install the specified function. If weak is True and the function is
+        a method of a class instance, only a weak reference to the instance is
+        saved. If period is given, the function is only called on steps where
+        step % period == offset, with 0 <= offset < period."""
+        if period is None:
+            schedule = None
+        else:
+            period, offset = int(period), int(offset)
+            if period < 1:
+                raise ValueError(f'The period must be at least 1, not {period}')
+            if not 0 <= offset < period:
+                raise ValueError(
+                    f'The offset must be in [0, {period}), not {offset}'
+                )
+            schedule = (period, offset)
+        self._dispatch = None
         if len(self.funcs) == 0:
             # If this is the first function installed, set the callback in the C++
             # to call this class instance.
@@ -167,7 +348,10 @@ class CallbackFunctions(object):
             # --- reference to that instance and the method name.
             finstance = f.__self__
             fname = f.__name__
+            if weak:
+                finstance = weakref.ref(finstance)
             self.funcs.append([finstance,fname])
+            self.schedules.append(schedule)
         elif callable(f):
             # --- If a function had already been installed by name, then skip the install.
             # --- This is problematic, since no warning message is given, but it is unlikely
@@ -179,34 +363,38 @@ class CallbackFunctions(object):
             # --- is exec'd).
             if f.__name__ not in self.funcs:
                 self.funcs.append(f)
+                self.schedules.append(schedule)
         else:
             self.funcs.append(f)
+            self.schedules.append(schedule)
+        self._setschedule()
 
     def uninstallfuncinlist(self,f):
         """Uninstall the specified function"""
+        self._dispatch = None
         # --- An element by element search is needed
         # --- f can be a function or method object, or a name (string).
         # --- Note that method objects can not be removed by name.
         funclistcopy = copy.copy(self.funcs)
         for func in funclistcopy:
             if f == func:
-                self.funcs.remove(f)
+                self._removefunc(func)
                 break
             elif isinstance(func,list) and isinstance(f,types.MethodType):
                 object = self._getmethodobject(func)
                 if f.__self__ is object and f.__name__ == func[1]:
-                    self.funcs.remove(func)
+                    self._removefunc(func)
                     break
             elif isinstance(func,str):
                 if f.__name__ == func:
-                    self.funcs.remove(func)
+                    self._removefunc(func)
                     break
             elif isinstance(f,str):
                 if isinstance(func,str): funcname = func
                 elif isinstance(func,list): funcname = None
                 else:                        funcname = func.__name__
                 if f == funcname:
-                    self.funcs.remove(func)
+                    self._removefunc(func)
                     break
 
         # check that a function was removed
@@ -216,6 +404,8 @@ class CallbackFunctions(object):
         # if there are no functions left, remove the C callback
         if not self.hasfuncsinstalled():
             self.clearlist()
+        else:
+            self._setschedule()
 
     def isinstalledfuncinlist(self,f):
         """Checks if the specified function is installed"""
@@ -235,20 +425,66 @@ class CallbackFunctions(object):
 
     def callfuncsinlist(self,*args,**kw):
         """Call the functions in the list"""
-        bb = time.time()
-        for f in self.callbackfunclist():
+        bb = time.perf_counter()
+        dispatch, names = self._dispatch, self._dispatchnames
+        if dispatch is None:
+            dispatch, names = self._builddispatch()
+        schedules = self._dispatchschedules
+        if schedules is None:
+            schedules = (None,)*len(dispatch)
+        else:
+            step = libwarpx.libwarpx_so.warpx_getistep(0)
+        for f, (tname, fname), schedule in zip(dispatch, names, schedules):
+            if schedule is not None and step % schedule[0] != schedule[1]:
+                continue
             #barrier()
-            t1 = time.time()
+            t1 = time.perf_counter()
             f(*args,**kw)
             #barrier()
-            t2 = time.time()
-            # --- For the timers, use the function (or method) name as the key.
-            self.timers[f.__name__] = self.timers.get(f.__name__,0.) + (t2 - t1)
-        aa = time.time()
+            t2 = time.perf_counter()
+            self.timers[tname] = self.timers.get(tname,0.) + (t2 - t1)
+            profile = self.profiles.get(fname)
+            if profile is None:
+                profile = self.profiles[fname] = CallbackProfile()
+            profile.add(t2 - t1)
+        aa = time.perf_counter()
         return aa - bb
 
+    def clearprofiles(self):
+        """Resets the timers and profiles of the functions"""
+        self.time = 0.
+        self.timers = {}
+        self.profiles = {}
+
+
+class _WeakMethodCall(object):
+    """
+    Calls a method whose instance is only weakly referenced. If the instance
+    has been deleted, the call does nothing and the dispatch tuple of the call
+    back list is reset so that the method is removed from it.
+    """
+
+    __slots__ = ('callbacklist', 'ref', 'fname', '__name__', '__qualname__')
+
+    def __init__(self, callbacklist, ref, method):
+        self.callbacklist = callbacklist
+        self.ref = ref
+        self.fname = method.__name__
+        self.__name__ = method.__name__
+        self.__qualname__ = getattr(method, '__qualname__', method.__name__)
+
+    def __call__(self, *args, **kw):
+        object = self.ref()
+        if object is None:
+            self.callbacklist._dispatch = None
+            return
+        return getattr(object, self.fname)(*args, **kw)
+
 #=============================================================================
 
+# --- All of the call back lists, in the order they are created
+_callbacklists = []
+
 # --- Now create the actual instances.
 _afterinit = CallbackFunctions('afterinit')
 _beforecollisions = CallbackFunctions('beforecollisions')
@@ -270,38 +506,123 @@ _appliedfields = CallbackFunctions('appliedfields')
 
 
 #=============================================================================
+def enablecallbacktimers(enable=True):
+    """Turns the timing of the call back functions on or off. When off, the
+    functions are called directly and the timers and profiles are not updated.
+    - enable=True: whether the functions are timed
+    """
+    for c in _callbacklists:
+        c.ltimers = enable
+
+def callbacktimersenabled():
+    """Returns True if the call back functions are timed"""
+    return any(c.ltimers for c in _callbacklists)
+
+def getcallbackprofiles():
+    """Returns the profiles of the call back functions on this processor, as a
+    dictionary keyed by the call back name, then the function name. Each
+    profile is a dictionary with ncalls, total, min, max and last.
+    """
+    return {c.name: {fname: profile.todict() for fname, profile in c.profiles.items()}
+            for c in _callbacklists if c.profiles}
+
+def gathercallbackprofiles(root=0):
+    """Reduces the profiles of the call back functions over all processors.
+    This must be called by all processors. Returns the reduced profiles on the
+    root processor and None on the others. They are keyed by the call back name,
+    then the function name, and each has:
+    - ncalls: total number of calls summed over processors
+    - total_sum, total_min, total_avg, total_max: the total time spent in the
+      function, summed over processors and the min, average and max over
+      processors
+    - imbalance: total_max/total_avg, 1 for a perfectly balanced function
+    - call_min, call_max: the shortest and longest single call on any processor
+    - last: the most recent call durations on the root processor
+    - npes: the number of processors
+    - root: the root processor
+    """
+    local = getcallbackprofiles()
+    if npes > 1:
+        all_profiles = comm_world.gather(local, root=root)
+        if comm_world.rank != root:
+            return None
+    else:
+        all_profiles = [local]
+
+    result = {}
+    for cname in sorted(set().union(*all_profiles)):
+        fnames = set().union(*[p.get(cname, {}) for p in all_profiles])
+        result[cname] = {}
+        for fname in sorted(fnames):
+            pe_profiles = [p[cname][fname] for p in all_profiles
+                           if fname in p.get(cname, {})]
+            # --- Processors that never called the function contribute zero time
+            totals = numpy.zeros(npes)
+            totals[:len(pe_profiles)] = [p['total'] for p in pe_profiles]
+            total_avg = totals.mean()
+            result[cname][fname] = {
+                'ncalls': sum(p['ncalls'] for p in pe_profiles),
+                'total_sum': totals.sum(),
+                'total_min': totals.min(),
+                'total_avg': total_avg,
+                'total_max': totals.max(),
+                'imbalance': totals.max()/total_avg if total_avg > 0. else 1.,
+                'call_min': min(p['min'] for p in pe_profiles),
+                'call_max': max(p['max'] for p in pe_profiles),
+                'last': local.get(cname, {}).get(fname, {}).get('last', []),
+                'npes': npes,
+                'root': root,
+            }
+    return result
+
+def writecallbackprofiles(filename='callback_profile_data.json', root=0):
+    """Writes the profiles of the call back functions, reduced over all
+    processors, to a JSON file. The format follows the profile_data.json file
+    written by mewarpx's profileparser from the TinyProfiler output, with one
+    child per call back function named "<call back name>:<function name>".
+    This must be called by all processors, the file is written by root.
+    - filename='callback_profile_data.json': name of the file to write
+    - root=0: processor where the profiles are gathered and written
+    """
+    profiles = gathercallbackprofiles(root=root)
+    if profiles is None:
+        return
+    children = []
+    for cname, fprofiles in profiles.items():
+        for fname, metrics in fprofiles.items():
+            children.append({
+                "frame" : {"name" : f"{cname}:{fname}"},
+                "metrics" : metrics
+            })
+    profile_dicts = [{
+        "frame" : {"name" : "callback_profiles"},
+        "metrics" : {},
+        "children" : children
+    }]
+    with open(filename, "w") as data_file:
+        data_file.write(json.dumps(profile_dicts, indent=4))
+
 def printcallbacktimers(tmin=1.,lminmax=False,ff=None):
     """Prints timings of installed functions.
+    This must be called by all processors, the timings are printed by processor 0.
     - tmin=1.: only functions with time greater than tmin will be printed
     - lminmax=False: If True, prints the min and max times over all processors
     - ff=None: If given, timings will be written to the file object instead of stdout
     """
     if ff is None: ff = sys.stdout
-    for c in [_afterinit,_beforeEsolve,_poissonsolver,_afterEsolve,
-              _beforedeposition,_afterdeposition,
-              _particlescraper,
-              _particleloader,
-              _beforestep,_afterstep,
-              _afterdiagnostics,
-              _afterrestart,
-              _particleinjection,
-              _appliedfields]:
-        for fname, time in c.timers.items():
-            #vlist = numpy.array(gather(time))
-            vlist = numpy.array([time])
-            #if me > 0: continue
-            vsum = numpy.sum(vlist)
+    profiles = gathercallbackprofiles(root=0)
+    if profiles is None: return
+    it = libwarpx.libwarpx_so.warpx_getistep(0)
+    for cname, fprofiles in profiles.items():
+        for fname, metrics in fprofiles.items():
+            vsum = metrics['total_sum']
             if vsum <= tmin: continue
-            vrms = numpy.sqrt(max(0.,numpy.sum(vlist**2)/len(vlist) - (numpy.sum(vlist)/len(vlist))**2))
-            npes = 1. # Only works for one processor
-            ff.write('%20s %s %10.4f  %10.4f %10.4f'%(c.name,fname,vsum,vsum/npes,vrms))
+            vavg = metrics['total_avg']
+            ff.write('%20s %s %10.4f  %10.4f  %10.4f'%(cname,fname,vsum,vavg,metrics['imbalance']))
             if lminmax:
-                vmin = numpy.min(vlist)
-                vmax = numpy.max(vlist)
-                ff.write('  %10.4f  %10.4f'%(vmin,vmax))
-            it = libwarpx.libwarpx_so.warpx_getistep(0)
+                ff.write('  %10.4f  %10.4f'%(metrics['total_min'],metrics['total_max']))
             if it > 0:
-                ff.write('   %10.4f'%(vsum/npes/(it)))
+                ff.write('   %10.4f'%(vavg/it))
             ff.write('\n')
 
 #=============================================================================
@@ -309,9 +630,9 @@ def printcallbacktimers(tmin=1.,lminmax=False,ff=None):
 def callfromafterinit(f):
     installafterinit(f)
     return f
-def installafterinit(f):
+def installafterinit(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called after the init"
-    _afterinit.installfuncinlist(f)
+    _afterinit.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallafterinit(f):
     "Removes the function from the list of functions called after the init"
     _afterinit.uninstallfuncinlist(f)
@@ -323,9 +644,9 @@ def isinstalledafterinit(f):
 def callfrombeforecollisions(f):
     installbeforecollisions(f)
     return f
-def installbeforecollisions(f):
+def installbeforecollisions(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called before collisions"
-    _beforecollisions.installfuncinlist(f)
+    _beforecollisions.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallbeforecollisions(f):
     "Removes the function from the list of functions called before collisions"
     _beforecollisions.uninstallfuncinlist(f)
@@ -337,9 +658,9 @@ def isinstalledbeforecollisions(f):
 def callfromaftercollisions(f):
     installaftercollisions(f)
     return f
-def installaftercollisions(f):
+def installaftercollisions(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called after collisions"
-    _aftercollisions.installfuncinlist(f)
+    _aftercollisions.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallaftercollisions(f):
     "Removes the function from the list of functions called after collisions"
     _aftercollisions.uninstallfuncinlist(f)
@@ -351,9 +672,9 @@ def isinstalledaftercollisions(f):
 def callfrombeforeEsolve(f):
     installbeforeEsolve(f)
     return f
-def installbeforeEsolve(f):
+def installbeforeEsolve(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called before an E solve"
-    _beforeEsolve.installfuncinlist(f)
+    _beforeEsolve.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallbeforeEsolve(f):
     "Removes the function from the list of functions called before an E solve"
     _beforeEsolve.uninstallfuncinlist(f)
@@ -365,11 +686,14 @@ def isinstalledbeforeEsolve(f):
 def callfrompoissonsolver(f):
     installpoissonsolver(f)
     return f
-def installpoissonsolver(f):
-    """Installs an external function to solve Poisson's equation"""
+def installpoissonsolver(f, weak=False):
+    """Installs an external function to solve Poisson's equation.
+    Unlike the other call backs, no period can be given: while a solver is
+    installed WarpX skips computePhi on every step, so phi would be left at
+    its previous values on the steps the function was not called."""
     if _poissonsolver.hasfuncsinstalled():
         raise RuntimeError("Only one external Poisson solver can be installed.")
-    _poissonsolver.installfuncinlist(f)
+    _poissonsolver.installfuncinlist(f, weak=weak)
 def uninstallpoissonsolver(f):
     """Removes the external function to solve Poisson's equation"""
     _poissonsolver.uninstallfuncinlist(f)
@@ -381,9 +705,9 @@ def isinstalledpoissonsolver(f):
 def callfromafterEsolve(f):
     installafterEsolve(f)
     return f
-def installafterEsolve(f):
+def installafterEsolve(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called after an E solve"
-    _afterEsolve.installfuncinlist(f)
+    _afterEsolve.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallafterEsolve(f):
     "Removes the function from the list of functions called after an E solve"
     _afterEsolve.uninstallfuncinlist(f)
@@ -395,9 +719,9 @@ def isinstalledafterEsolve(f):
 def callfrombeforedeposition(f):
     installbeforedeposition(f)
     return f
-def installbeforedeposition(f):
+def installbeforedeposition(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called before a particle deposition"
-    _beforedeposition.installfuncinlist(f)
+    _beforedeposition.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallbeforedeposition(f):
     "Removes the function from the list of functions called before a particle deposition"
     _beforedeposition.uninstallfuncinlist(f)
@@ -409,9 +733,9 @@ def isinstalledbeforedeposition(f):
 def callfromafterdeposition(f):
     installafterdeposition(f)
     return f
-def installafterdeposition(f):
+def installafterdeposition(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called after a particle deposition"
-    _afterdeposition.installfuncinlist(f)
+    _afterdeposition.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallafterdeposition(f):
     "Removes the function from the list of functions called after a particle deposition"
     _afterdeposition.uninstallfuncinlist(f)
@@ -423,9 +747,9 @@ def isinstalledafterdeposition(f):
 def callfromparticlescraper(f):
     installparticlescraper(f)
     return f
-def installparticlescraper(f):
+def installparticlescraper(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called to scrape particles"
-    _particlescraper.installfuncinlist(f)
+    _particlescraper.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallparticlescraper(f):
     "Removes the function from the list of functions called to scrape particles"
     _particlescraper.uninstallfuncinlist(f)
@@ -437,9 +761,9 @@ def isinstalledparticlescraper(f):
 def callfromparticleloader(f):
     installparticleloader(f)
     return f
-def installparticleloader(f):
+def installparticleloader(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called to load particles"
-    _particleloader.installfuncinlist(f)
+    _particleloader.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallparticleloader(f):
     "Removes the function from the list of functions called to load particles"
     _particleloader.uninstallfuncinlist(f)
@@ -451,9 +775,9 @@ def isinstalledparticleloader(f):
 def callfrombeforestep(f):
     installbeforestep(f)
     return f
-def installbeforestep(f):
+def installbeforestep(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called before a step"
-    _beforestep.installfuncinlist(f)
+    _beforestep.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallbeforestep(f):
     "Removes the function from the list of functions called before a step"
     _beforestep.uninstallfuncinlist(f)
@@ -465,9 +789,9 @@ def isinstalledbeforestep(f):
 def callfromafterstep(f):
     installafterstep(f)
     return f
-def installafterstep(f):
+def installafterstep(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called after a step"
-    _afterstep.installfuncinlist(f)
+    _afterstep.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallafterstep(f):
     "Removes the function from the list of functions called after a step"
     _afterstep.uninstallfuncinlist(f)
@@ -479,9 +803,9 @@ def isinstalledafterstep(f):
 def callfromafterdiagnostics(f):
     installafterdiagnostics(f)
     return f
-def installafterdiagnostics(f):
+def installafterdiagnostics(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called after diagnostic output"
-    _afterdiagnostics.installfuncinlist(f)
+    _afterdiagnostics.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallafterdiagnostics(f):
     "Removes the function from the list of functions called after diagnostic output"
     _afterdiagnostics.uninstallfuncinlist(f)
@@ -494,10 +818,10 @@ def callfromafterrestart(f):
     raise Exception('restart call back not implemented yet')
     installafterrestart(f)
     return f
-def installafterrestart(f):
+def installafterrestart(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called immediately after a restart"
     raise Exception('restart call back not implemented yet')
-    _afterrestart.installfuncinlist(f)
+    _afterrestart.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallafterrestart(f):
     "Removes the function from the list of functions called immediately after a restart"
     raise Exception('restart call back not implemented yet')
@@ -511,9 +835,9 @@ def isinstalledafterrestart(f):
 def oncheckpointsignal(f):
     installoncheckpointsignal(f)
     return f
-def installoncheckpointsignal(f):
+def installoncheckpointsignal(f, weak=False, period=None, offset=0):
     "Adds a function to the list of functions called on checkpoint signal"
-    _oncheckpointsignal.installfuncinlist(f)
+    _oncheckpointsignal.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstalloncheckpointsignal(f):
     "Removes the function from the list of functions called on checkpoint signal"
     _oncheckpointsignal.uninstallfuncinlist(f)
@@ -525,13 +849,13 @@ def isinstalledoncheckpointsignal(f):
 def callfromparticleinjection(f):
     installparticleinjection(f)
     return f
-def installparticleinjection(f):
+def installparticleinjection(f, weak=False, period=None, offset=0):
     """
     Adds a user defined function that is to be called when particle
     injection happens, after the position advance and before deposition is
     called, allowing a user defined particle distribution to be injected
     each time step"""
-    _particleinjection.installfuncinlist(f)
+    _particleinjection.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallparticleinjection(f):
     "Removes the function installed by installparticleinjection"
     _particleinjection.uninstallfuncinlist(f)
@@ -544,13 +868,13 @@ def callfromappliedfields(f):
     raise Exception('applied fields call back not implemented yet')
     installappliedfields(f)
     return f
-def installappliedfields(f):
+def installappliedfields(f, weak=False, period=None, offset=0):
     """
     Adds a user defined function which can specify E and B fields which are applied
     to the particles during the particle advance.
     """
     raise Exception('applied fields call back not implemented yet')
-    _appliedfields.installfuncinlist(f)
+    _appliedfields.installfuncinlist(f, weak=weak, period=period, offset=offset)
 def uninstallappliedfields(f):
     "Removes the function installed by installappliedfields"
     raise Exception('applied fields call back not implemented yet')
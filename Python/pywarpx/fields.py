@@ -34,14 +34,18 @@ class _MultiFABWrapper(object):
      - get_fabs: routine that returns the list of FABs
      - get_nodal_flag: routine that returns the list of nodal flag
      - level: refinement level
+     - gather_to: where the data is assembled when indexing the wrapper, either
+                  'all' for every processor or the rank of a single processor
     """
-    def __init__(self, direction, get_lovects, get_fabs, get_nodal_flag, level, include_ghosts=False):
+    def __init__(self, direction, get_lovects, get_fabs, get_nodal_flag, level, include_ghosts=False,
+                 gather_to='all'):
         self.direction = direction
         self.get_lovects = get_lovects
         self.get_fabs = get_fabs
         self.get_nodal_flag = get_nodal_flag
         self.level = level
         self.include_ghosts = include_ghosts
+        self.gather_to = gather_to
 
         self.dim = libwarpx.dim
 
@@ -50,22 +54,84 @@ class _MultiFABWrapper(object):
         # This presumably will never change during a calculation.
         self.overlaps = self.get_nodal_flag()
 
-    def _getlovects(self):
+        # The box layout information is cached until the layout changes
+        self._layout = None
+
+    def _getlayout(self):
+        """Returns a dictionary with the box layout information: lovects, hivects,
+        ngrow, the shapes of the FABs, the global lowest and highest indices
+        along each axis and a cache of the per-box slices.
+        The layout is only recomputed when the WarpX layout version changes,
+        i.e. after a regrid or load balance. Since the layout changes on all
+        processors at once, the reduction of the global indices stays collective.
+        """
+        version = libwarpx.get_layout_version()
+        if self._layout is not None and self._layout['version'] == version:
+            return self._layout
+
         if self.direction is None:
             lovects, ngrow = self.get_lovects(self.level, self.include_ghosts)
         else:
             lovects, ngrow = self.get_lovects(self.level, self.direction, self.include_ghosts)
-        return lovects, ngrow
-
-    def _gethivects(self):
-        lovects, ngrow = self._getlovects()
-        fields = self._getfields()
+        shapes = [field.shape for field in self._getfields()]
 
         hivects = np.zeros_like(lovects)
-        for i in range(len(fields)):
-            hivects[:,i] = lovects[:,i] + np.array(fields[i].shape[:self.dim]) - self.overlaps
+        for i in range(len(shapes)):
+            hivects[:,i] = lovects[:,i] + np.array(shapes[i][:self.dim]) - self.overlaps
+
+        # --- The global extents are found with a single reduction, using the
+        # --- negated lower bounds.
+        extents = np.full(2*self.dim, np.iinfo(np.int64).min, dtype=np.int64)
+        if len(shapes) > 0:
+            extents[:self.dim] = -lovects.min(axis=1)
+            extents[self.dim:] = hivects.max(axis=1)
+        if npes > 1:
+            comm_world.Allreduce(mpi.IN_PLACE, extents, op=mpi.MAX)
+
+        self._layout = {
+            'version': version,
+            'lovects': lovects,
+            'hivects': hivects,
+            'ngrow': ngrow,
+            'shapes': shapes,
+            'global_lo': -extents[:self.dim, np.newaxis],
+            'global_hi': extents[self.dim:, np.newaxis],
+            'boxslices': {},
+        }
+        return self._layout
+
+    def _getboxslices(self, layout, ixstart, ixstop, iystart, iystop, izstart, izstop, ic):
+        """Returns the list of (box number, box slice, global slice) for the boxes
+        that overlap the requested region. The lists are cached with the layout.
+        """
+        if isinstance(ic, slice):
+            key = (ixstart, ixstop, iystart, iystop, izstart, izstop, (ic.start, ic.stop, ic.step))
+        else:
+            key = (ixstart, ixstop, iystart, iystop, izstart, izstop, ic)
+        boxslices = layout['boxslices'].get(key)
+        if boxslices is None:
+            boxslices = []
+            for i, shape in enumerate(layout['shapes']):
+                sss, vslice = self._get_vslice(
+                    layout['lovects'][:,i], shape, ixstart, ixstop, iystart,
+                    iystop, izstart, izstop, ic
+                )
+                if vslice is not None:
+                    boxslices.append((i, sss, vslice))
+            # --- Keep the cache from growing without bounds when many
+            # --- different regions are accessed.
+            if len(layout['boxslices']) >= 64:
+                layout['boxslices'].clear()
+            layout['boxslices'][key] = boxslices
+        return boxslices
 
-        return hivects, ngrow
+    def _getlovects(self):
+        layout = self._getlayout()
+        return layout['lovects'], layout['ngrow']
+
+    def _gethivects(self):
+        layout = self._getlayout()
+        return layout['hivects'], layout['ngrow']
 
     def _getfields(self):
         if self.direction is None:
@@ -73,6 +139,109 @@ class _MultiFABWrapper(object):
         else:
             return self.get_fabs(self.level, self.direction, self.include_ghosts)
 
+    def local_tiles(self, include_ghosts=None):
+        """Iterates over the FABs owned by this processor, without any communication.
+        For each FAB, a tuple is yielded with the slices that the FAB covers in the
+        full-domain array (i.e. the array returned by wrapper[...]) and a writable
+        view of the FAB data. The view shares memory with WarpX so it can be
+        modified in place. With node centering, the nodes on the boundaries between
+        boxes appear in the neighboring FABs.
+        - include_ghosts: whether to include the ghost cells. Defaults to the
+                          include_ghosts setting of the wrapper. The full-domain
+                          array that the slices refer to includes the ghost cells
+                          if and only if include_ghosts is True.
+        """
+        layout = self._getlayout()
+        origin = layout['global_lo'][:,0]
+        if include_ghosts is None or include_ghosts == self.include_ghosts:
+            lovects = layout['lovects']
+            fields = self._getfields()
+        else:
+            if self.direction is None:
+                lovects, ngrow = self.get_lovects(self.level, include_ghosts)
+                fields = self.get_fabs(self.level, include_ghosts)
+            else:
+                lovects, ngrow = self.get_lovects(self.level, self.direction, include_ghosts)
+                fields = self.get_fabs(self.level, self.direction, include_ghosts)
+            # --- The lovects only differ from the cached ones by the number of
+            # --- ghost cells, which shifts the global origin by the same amount.
+            if len(fields) > 0:
+                origin = origin + lovects[:,0] - layout['lovects'][:,0]
+
+        for i, field in enumerate(fields):
+            gslices = tuple(
+                slice(lovects[d,i] - origin[d], lovects[d,i] - origin[d] + field.shape[d])
+                for d in range(self.dim)
+            )
+            yield gslices, field
+
+    def scatter_from(self, value, root=0):
+        """Sets the data on the whole domain from an array that only needs to be
+        held by the root processor. Each processor is sent only the data of its
+        own FABs with Scatterv. This must be called by all processors.
+        - value: the full-domain array, with the same shape as wrapper[...]. It
+                 is only used on the root processor.
+        - root: rank of the processor holding value
+        """
+        tiles = list(self.local_tiles())
+        if npes == 1:
+            for gslices, view in tiles:
+                view[...] = value[gslices]
+            return
+
+        # --- The root needs the slices of every FAB on every processor. These
+        # --- only change with the layout, so they are cached with it. The
+        # --- cache is kept per root since only the root holds the slices.
+        layout = self._getlayout()
+        bounds_key = ('scatter_bounds', root)
+        if bounds_key not in layout:
+            bounds = np.array(
+                [[(sl.start, sl.stop) for sl in gslices] for gslices, view in tiles],
+                dtype=np.int64
+            ).ravel()
+            is_root = (comm_world.rank == root)
+            nbounds = np.array([bounds.size], dtype=np.int64)
+            all_nbounds = np.zeros(npes, dtype=np.int64) if is_root else None
+            comm_world.Gather(nbounds, all_nbounds, root=root)
+            if is_root:
+                all_bounds = np.zeros(all_nbounds.sum(), dtype=np.int64)
+                comm_world.Gatherv(bounds, [all_bounds, all_nbounds], root=root)
+                offsets = np.concatenate(([0], np.cumsum(all_nbounds)))
+                layout[bounds_key] = [
+                    all_bounds[offsets[r]:offsets[r+1]].reshape(-1, self.dim, 2)
+                    for r in range(npes)
+                ]
+            else:
+                comm_world.Gatherv(bounds, None, root=root)
+                layout[bounds_key] = None
+
+        dtype = libwarpx._numpy_real_dtype
+        if comm_world.rank == root:
+            pieces = []
+            counts = []
+            for rank_bounds in layout[bounds_key]:
+                count = 0
+                for box_bounds in rank_bounds:
+                    piece = value[tuple(slice(lo, hi) for lo, hi in box_bounds)]
+                    pieces.append(piece.ravel())
+                    count += piece.size
+                counts.append(count)
+            if pieces:
+                sendbuf = np.concatenate(pieces).astype(dtype, copy=False)
+            else:
+                sendbuf = np.zeros(0, dtype=dtype)
+            sendspec = [sendbuf, counts]
+        else:
+            sendspec = None
+
+        recvbuf = np.zeros(sum(view.size for gslices, view in tiles), dtype=dtype)
+        comm_world.Scatterv(sendspec, recvbuf, root=root)
+
+        offset = 0
+        for gslices, view in tiles:
+            view[...] = recvbuf[offset:offset + view.size].reshape(view.shape)
+            offset += view.size
+
     def __len__(self):
         lovects, ngrow = self._getlovects()
         return len(lovects)
@@ -102,10 +271,8 @@ class _MultiFABWrapper(object):
             raise Exception('Inappropriate direction given')
 
         # --- Get the total number of cells along the direction
-        hivects, ngrow = self._gethivects()
-        nn = hivects[idir,:].max() - ngrow[idir] + self.overlaps[idir]
-        if npes > 1:
-            nn = comm_world.allreduce(nn, op=mpi.MAX)
+        layout = self._getlayout()
+        nn = layout['global_hi'][idir,0] - layout['ngrow'][idir] + self.overlaps[idir]
 
         # --- Cell size in the direction
         dd = libwarpx.getCellSize(celldir, self.level)
@@ -222,13 +389,84 @@ class _MultiFABWrapper(object):
         else:
             return None, None
 
+    def _gather_datalist(self, datalist, resultglobal, gather_to):
+        """Assembles the (vslice, data) pairs of all processors into resultglobal.
+        The data is sent as raw buffers with Gatherv (or Allgatherv if gather_to
+        is 'all'), along with an integer description of each piece.
+        - datalist: list of (vslice, data) pairs owned by this processor
+        - resultglobal: the array to fill, only needed on receiving processors
+        - gather_to: 'all' or the rank of the receiving processor
+        """
+        # --- Each piece is described by the bounds of its vslice followed by
+        # --- the number of dimensions and the shape of its data.
+        nmeta = 2*self.dim + 5
+        meta = np.zeros((len(datalist), nmeta), dtype=np.int64)
+        for i, (vslice, ff) in enumerate(datalist):
+            if not isinstance(vslice, tuple):
+                vslice = (vslice,)
+            for d, sl in enumerate(vslice):
+                meta[i, 2*d:2*d + 2] = (sl.start, sl.stop)
+            meta[i, 2*self.dim] = ff.ndim
+            meta[i, 2*self.dim + 1:2*self.dim + 1 + ff.ndim] = ff.shape
+        meta = meta.ravel()
+        if datalist:
+            data = np.concatenate([ff.ravel() for vslice, ff in datalist])
+            data = data.astype(libwarpx._numpy_real_dtype, copy=False)
+        else:
+            data = np.zeros(0, dtype=libwarpx._numpy_real_dtype)
+
+        sizes = np.array([meta.size, data.size], dtype=np.int64)
+        if gather_to == 'all':
+            all_sizes = np.zeros((npes, 2), dtype=np.int64)
+            comm_world.Allgather(sizes, all_sizes)
+            all_meta = np.zeros(all_sizes[:,0].sum(), dtype=np.int64)
+            comm_world.Allgatherv(meta, [all_meta, all_sizes[:,0]])
+            all_data = np.zeros(all_sizes[:,1].sum(), dtype=data.dtype)
+            comm_world.Allgatherv(data, [all_data, all_sizes[:,1]])
+        else:
+            is_root = (comm_world.rank == gather_to)
+            all_sizes = np.zeros((npes, 2), dtype=np.int64) if is_root else None
+            comm_world.Gather(sizes, all_sizes, root=gather_to)
+            if is_root:
+                all_meta = np.zeros(all_sizes[:,0].sum(), dtype=np.int64)
+                all_data = np.zeros(all_sizes[:,1].sum(), dtype=data.dtype)
+                comm_world.Gatherv(meta, [all_meta, all_sizes[:,0]], root=gather_to)
+                comm_world.Gatherv(data, [all_data, all_sizes[:,1]], root=gather_to)
+            else:
+                comm_world.Gatherv(meta, None, root=gather_to)
+                comm_world.Gatherv(data, None, root=gather_to)
+                return
+
+        offset = 0
+        for piece in all_meta.reshape(-1, nmeta):
+            vslice = tuple(slice(piece[2*d], piece[2*d + 1]) for d in range(self.dim))
+            ndim = piece[2*self.dim]
+            shape = tuple(piece[2*self.dim + 1:2*self.dim + 1 + ndim])
+            size = int(np.prod(shape))
+            resultglobal[vslice] = all_data[offset:offset + size].reshape(shape)
+            offset += size
+
     def __getitem__(self, index):
         """Returns slices of a decomposed array, The shape of
         the object returned depends on the number of ix, iy and iz specified, which
         can be from none to all three. Note that the values of ix, iy and iz are
         relative to the fortran indexing, meaning that 0 is the lower boundary
         of the whole domain.
+        The data is assembled on the processors given by the gather_to attribute.
+        """
+        return self.gather(index, gather_to=self.gather_to)
+
+    def gather(self, index=Ellipsis, gather_to='all'):
+        """Returns slices of a decomposed array, assembled either on all
+        processors or only on a single one. See __getitem__ for the indexing.
+        - index: the index into the global array
+        - gather_to: 'all' to assemble the result on every processor, or the
+                     rank of the only processor that receives the result. The
+                     other processors then return None.
         """
+        if gather_to != 'all' and not 0 <= gather_to < npes:
+            raise ValueError(f"gather_to must be 'all' or a valid rank, not {gather_to}")
+
         if index == Ellipsis:
             index = tuple(self.dim*[slice(None)])
 
@@ -239,8 +477,7 @@ class _MultiFABWrapper(object):
                 index.append(slice(None))
             index = tuple(index)
 
-        lovects, ngrow = self._getlovects()
-        hivects, ngrow = self._gethivects()
+        layout = self._getlayout()
         fields = self._getfields()
 
         ix, iy, iz = self._get_indices(index)
@@ -258,18 +495,8 @@ class _MultiFABWrapper(object):
         else:
             ic = None
 
-        ixmin, iymin, izmin = self._get_min_indices(lovects)
-        ixmax, iymax, izmax = self._get_max_indices(hivects)
-
-        if npes > 1:
-            izmin = comm_world.allreduce(izmin, op=mpi.MIN)
-            izmax = comm_world.allreduce(izmax, op=mpi.MAX)
-            if self.dim > 1:
-                ixmin = comm_world.allreduce(ixmin, op=mpi.MIN)
-                ixmax = comm_world.allreduce(ixmax, op=mpi.MAX)
-            if self.dim == 3:
-                iymin = comm_world.allreduce(iymin, op=mpi.MIN)
-                iymax = comm_world.allreduce(iymax, op=mpi.MAX)
+        ixmin, iymin, izmin = self._get_min_indices(layout['global_lo'])
+        ixmax, iymax, izmax = self._get_max_indices(layout['global_hi'])
 
         # --- Setup the size of the array to be returned.
         if self.dim == 1:
@@ -299,26 +526,25 @@ class _MultiFABWrapper(object):
         # --- Space is added for multiple components if needed.
         if ncomps > 1 and ic is None:
             sss = tuple(list(sss) + [ncomps])
-        # --- Create the array to be returned.
-        resultglobal = np.zeros(sss, dtype=libwarpx._numpy_real_dtype)
-
-        datalist = []
-        for i in range(len(fields)):
-            sss, vslice = self._get_vslice(
-                lovects[:,i], fields[i].shape, ixstart, ixstop, iystart,
-                iystop, izstart, izstop, ic
-            )
-            if vslice is not None:
-                datalist.append((vslice, fields[i][sss]))
-
-        if npes == 1:
-            all_datalist = [datalist]
+        # --- Create the array to be returned, only where it is needed.
+        if npes == 1 or gather_to == 'all' or comm_world.rank == gather_to:
+            resultglobal = np.zeros(sss, dtype=libwarpx._numpy_real_dtype)
         else:
-            all_datalist = comm_world.allgather(datalist)
+            resultglobal = None
 
-        for datalist in all_datalist:
+        boxslices = self._getboxslices(
+            layout, ixstart, ixstop, iystart, iystop, izstart, izstop, ic
+        )
+        datalist = [(vslice, fields[i][sss]) for i, sss, vslice in boxslices]
+
+        if npes == 1:
             for vslice, ff in datalist:
                 resultglobal[vslice] = ff
+        else:
+            self._gather_datalist(datalist, resultglobal, gather_to)
+
+        if resultglobal is None:
+            return None
 
         # --- Now remove any of the reduced dimensions.
         if self.dim == 1:
@@ -358,8 +584,7 @@ class _MultiFABWrapper(object):
                 index.append(slice(None))
             index = tuple(index)
 
-        lovects, ngrow = self._getlovects()
-        hivects, ngrow = self._gethivects()
+        layout = self._getlayout()
         fields = self._getfields()
 
         ix, iy, iz = self._get_indices(index)
@@ -377,18 +602,8 @@ class _MultiFABWrapper(object):
         else:
             ic = None
 
-        ixmin, iymin, izmin = self._get_min_indices(lovects)
-        ixmax, iymax, izmax = self._get_max_indices(hivects)
-
-        if npes > 1:
-            izmin = comm_world.allreduce(izmin, op=mpi.MIN)
-            izmax = comm_world.allreduce(izmax, op=mpi.MAX)
-            if self.dim > 1:
-                ixmin = comm_world.allreduce(ixmin, op=mpi.MIN)
-                ixmax = comm_world.allreduce(ixmax, op=mpi.MAX)
-            if self.dim == 3:
-                iymin = comm_world.allreduce(iymin, op=mpi.MIN)
-                iymax = comm_world.allreduce(iymax, op=mpi.MAX)
+        ixmin, iymin, izmin = self._get_min_indices(layout['global_lo'])
+        ixmax, iymax, izmax = self._get_max_indices(layout['global_hi'])
 
         # --- Add extra dimensions so that the input has the same number of
         # --- dimensions as array.
@@ -421,16 +636,14 @@ class _MultiFABWrapper(object):
                 if not isinstance(iz, slice): sss[2:2] = [1]
             value3d.shape = sss
 
-        for i in range(len(fields)):
-            sss, vslice = self._get_vslice(
-                lovects[:,i], fields[i].shape, ixstart, ixstop, iystart,
-                iystop, izstart, izstop, ic
-            )
-            if vslice is not None:
-                if isinstance(value, np.ndarray):
-                    fields[i][sss] = value3d[vslice]
-                else:
-                    fields[i][sss] = value
+        boxslices = self._getboxslices(
+            layout, ixstart, ixstop, iystart, iystop, izstart, izstop, ic
+        )
+        for i, sss, vslice in boxslices:
+            if isinstance(value, np.ndarray):
+                fields[i][sss] = value3d[vslice]
+            else:
+                fields[i][sss] = value
 
 
 def ExWrapper(level=0, include_ghosts=False):
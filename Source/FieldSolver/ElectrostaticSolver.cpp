@@ -236,7 +236,8 @@ WarpX::AddSpaceChargeFieldLabFrame ()
     // set the boundary potentials appropriately
     setPhiBC(phi_fp);
 
-    // Compute the potential phi, by solving the Poisson equation
+    // Compute the potential phi, by solving the Poisson equation. The Python
+    // solver is installed without a schedule, so it runs on every step.
     if ( IsPythonCallBackInstalled("poissonsolver") ) ExecutePythonCallback("poissonsolver");
     else computePhi( rho_fp, phi_fp, beta, self_fields_required_precision,
                      self_fields_absolute_tolerance, self_fields_max_iters,
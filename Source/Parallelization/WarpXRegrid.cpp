@@ -331,6 +331,7 @@ WarpX::RemakeLevel (int lev, Real /*time*/, const BoxArray& ba, const Distributi
         }
 
         SetDistributionMap(lev, dm);
+        ++m_layout_version;
 
     } else
     {
@@ -19,6 +19,8 @@
 #include <AMReX_Tuple.H>
 #include <AMReX.H>
 
+#include <algorithm>
+
 struct IsOutsideDomainBoundary {
     amrex::GpuArray<amrex::Real, AMREX_SPACEDIM> m_plo;
     amrex::GpuArray<amrex::Real, AMREX_SPACEDIM> m_phi;
@@ -165,6 +167,7 @@ void ParticleBoundaryBuffer::redistribute () {
             }
         }
     }
+    ++m_num_reorders;
 }
 
 void ParticleBoundaryBuffer::clearParticles () {
@@ -181,6 +184,37 @@ void ParticleBoundaryBuffer::clearParticles (int const i) {
         auto& species_buffer = buffer[ispecies];
         if (species_buffer.isDefined()) species_buffer.clearParticles();
     }
+    ++m_num_clears;
+}
+
+void ParticleBoundaryBuffer::trimParticles (const std::string species_name, int boundary, int lev,
+                                            const int* num_consumed, int num_tiles) {
+    auto& species_buffer = getParticleBuffer(species_name, boundary);
+
+    int i = 0;
+    for (amrex::ParIter<0,0,PIdx::nattribs, 0, amrex::PinnedArenaAllocator> pti(species_buffer, lev);
+         pti.isValid() && i < num_tiles; ++pti, ++i) {
+        auto& ptile = pti.GetParticleTile();
+        const int np = ptile.numParticles();
+        const int nskip = std::min(num_consumed[i], np);
+        if (nskip == 0) continue;
+
+        // The buffers live in pinned memory, so the remaining particles can
+        // be shifted to the front of the tile on the host.
+        auto& aos = ptile.GetArrayOfStructs()();
+        std::copy(aos.begin() + nskip, aos.end(), aos.begin());
+        auto& soa = ptile.GetStructOfArrays();
+        for (int comp = 0; comp < soa.NumRealComps(); ++comp) {
+            auto& rdata = soa.GetRealData(comp);
+            std::copy(rdata.begin() + nskip, rdata.end(), rdata.begin());
+        }
+        for (int comp = 0; comp < soa.NumIntComps(); ++comp) {
+            auto& idata = soa.GetIntData(comp);
+            std::copy(idata.begin() + nskip, idata.end(), idata.begin());
+        }
+        ptile.resize(np - nskip);
+    }
+    ++m_num_reorders;
 }
 
 void ParticleBoundaryBuffer::gatherParticles (MultiParticleContainer& mypc,
@@ -26,6 +26,7 @@
 #include <AMReX_FArrayBox.H>
 #include <AMReX_FabArray.H>
 #include <AMReX_Geometry.H>
+#include <AMReX_GpuContainers.H>
 #include <AMReX_GpuControl.H>
 #include <AMReX_IndexType.H>
 #include <AMReX_IntVect.H>
@@ -34,10 +35,16 @@
 #include <AMReX_PODVector.H>
 #include <AMReX_ParIter.H>
 #include <AMReX_Particles.H>
+#include <AMReX_Reduce.H>
 #include <AMReX_StructOfArrays.H>
+#include <AMReX_Tuple.H>
+#include <AMReX_Vector.H>
 
 #include <array>
+#include <cmath>
 #include <cstdlib>
+#include <map>
+#include <string>
 
 namespace
 {
@@ -102,6 +109,169 @@ namespace
         }
         return nodal_flag_data;
     }
+
+    /** Multiply the weights of the particles in a tile by the Schottky
+     *  enhancement factor exp(pre_fac * sqrt(-E.n)), where E.n is the electric
+     *  field along the surface normal of each particle. The "norm_id"
+     *  component of each particle holds the row of its normal in the n x 3
+     *  table normals, which must be accessible on the device.
+     *
+     *  Returns the total weight and the total energy
+     *  w * (0.5 * mass * u^2 + potential_energy) of the particles in the tile
+     *  after the enhancement, computed in the same pass.
+     */
+    amrex::GpuTuple<amrex::ParticleReal, amrex::ParticleReal>
+    applySchottkyWeightTile (WarpXParIter& pti,
+                             const std::map<std::string, int>& particle_comps,
+                             const int lev, const double pre_fac,
+                             const amrex::Real* normals,
+                             const double mass, const double potential_energy)
+    {
+        using std::sqrt;
+        using std::exp;
+
+        WarpX& warpx = WarpX::GetInstance();
+        const auto & plo = warpx.Geom(lev).ProbLoArray();
+        const auto & dxi = warpx.Geom(lev).InvCellSizeArray();
+
+        // get the electric field components on the grid
+        const auto Ex_arr = warpx.getEfield(lev, 0)[pti].const_array();
+        const auto Ey_arr = warpx.getEfield(lev, 1)[pti].const_array();
+        const auto Ez_arr = warpx.getEfield(lev, 2)[pti].const_array();
+
+        // get the particle data
+        const long np = pti.numParticles();
+        const auto getPosition = GetParticlePosition(pti);
+
+        auto& attribs = pti.GetAttribs();
+        amrex::ParticleReal* w = attribs[PIdx::w].dataPtr();
+        const amrex::ParticleReal* ux = attribs[PIdx::ux].dataPtr();
+        const amrex::ParticleReal* uy = attribs[PIdx::uy].dataPtr();
+        const amrex::ParticleReal* uz = attribs[PIdx::uz].dataPtr();
+        const amrex::ParticleReal* norm_id = pti.GetAttribs(particle_comps.at("norm_id")).dataPtr();
+
+        // TODO change this function to instead take as argument the
+        // boundary from which injection is done and get the normal
+        // from `interp_normal` (in DistanceToEB.H) or as a hard coded
+        // vector for domain boundaries
+
+        amrex::ReduceOps<amrex::ReduceOpSum, amrex::ReduceOpSum> reduce_op;
+        amrex::ReduceData<amrex::ParticleReal, amrex::ParticleReal> reduce_data(reduce_op);
+        using ReduceTuple = typename decltype(reduce_data)::Type;
+
+        reduce_op.eval(np, reduce_data,
+            [=] AMREX_GPU_DEVICE (long ip) -> ReduceTuple
+            {
+                // get the particle position
+                amrex::ParticleReal xp, yp, zp;
+                getPosition(ip, xp, yp, zp);
+
+                // get the weight of each neigbouring node to use
+                // during interpolation
+                int i, j, k;
+                amrex::Real W[AMREX_SPACEDIM][2];
+                compute_weights_nodal(xp, yp, zp, plo, dxi, i, j, k, W);
+
+                // interpolate the electric field to the particle position
+                amrex::Real Ex_p = interp_field_nodal(i, j, k, W, Ex_arr);
+                amrex::Real Ey_p = interp_field_nodal(i, j, k, W, Ey_arr);
+                amrex::Real Ez_p = interp_field_nodal(i, j, k, W, Ez_arr);
+
+                // calculate the dot product of the electric field with the
+                // normal vector tied to the particle
+                const int inorm = 3 * static_cast<int>(norm_id[ip]);
+                double const normal_field = (
+                    Ex_p * normals[inorm] + Ey_p * normals[inorm + 1]
+                    + Ez_p * normals[inorm + 2]
+                );
+
+                // increase the particle weight by the Schottky enhancement
+                // factor if needed
+                w[ip] *= ((normal_field < 0.0) ?
+                    exp(pre_fac * sqrt(-normal_field)) : 1.0
+                );
+
+                const amrex::ParticleReal u2 = (
+                    ux[ip]*ux[ip] + uy[ip]*uy[ip] + uz[ip]*uz[ip]
+                );
+                return {w[ip], w[ip] * (0.5 * mass * u2 + potential_energy)};
+            });
+
+        return reduce_data.value();
+    }
+
+    /** Copy a host table of n x 3 surface normals to the device. */
+    amrex::Gpu::DeviceVector<amrex::Real> getNormalTable (
+        const double* normals, const int n_normals)
+    {
+        amrex::Gpu::DeviceVector<amrex::Real> normal_table(3 * n_normals);
+        amrex::Vector<amrex::Real> host_table(normals, normals + 3 * n_normals);
+        amrex::Gpu::copyAsync(amrex::Gpu::hostToDevice, host_table.begin(),
+                              host_table.end(), normal_table.begin());
+        amrex::Gpu::streamSynchronize();
+        return normal_table;
+    }
+
+    /** Append the particles of the tile at pti of the source species to the
+     *  same tile of the destination species. Components are matched by name,
+     *  so components only present in the source species are dropped and
+     *  components missing from it are set to zero.
+     */
+    void appendParticlesByName (WarpXParticleContainer& src_spc,
+                                WarpXParticleContainer& dst_spc,
+                                WarpXParIter& pti, const int lev)
+    {
+        auto& src_tile = src_spc.ParticlesAt(lev, pti);
+        auto& dst_tile = dst_spc.ParticlesAt(lev, pti);
+
+        const long src_np = src_tile.numParticles();
+        const long dst_np = dst_tile.numParticles();
+        dst_tile.resize(dst_np + src_np);
+
+        // positions and ids
+        auto& src_aos = src_tile.GetArrayOfStructs();
+        auto& dst_aos = dst_tile.GetArrayOfStructs();
+        amrex::Gpu::copyAsync(amrex::Gpu::deviceToDevice, src_aos.begin(),
+                              src_aos.end(), dst_aos.begin() + dst_np);
+
+        auto& src_soa = src_tile.GetStructOfArrays();
+        auto& dst_soa = dst_tile.GetStructOfArrays();
+
+        const auto src_comps = src_spc.getParticleComps();
+        for (const auto& comp : dst_spc.getParticleComps()) {
+            auto& dst_data = dst_soa.GetRealData(comp.second);
+            const auto search = src_comps.find(comp.first);
+            if (search != src_comps.end()) {
+                auto& src_data = src_soa.GetRealData(search->second);
+                amrex::Gpu::copyAsync(amrex::Gpu::deviceToDevice,
+                                      src_data.begin(), src_data.end(),
+                                      dst_data.begin() + dst_np);
+            } else {
+                amrex::ParticleReal* data = dst_data.dataPtr() + dst_np;
+                amrex::ParallelFor(src_np, [=] AMREX_GPU_DEVICE (long ip) {
+                    data[ip] = 0.0;
+                });
+            }
+        }
+
+        const auto src_icomps = src_spc.getParticleiComps();
+        for (const auto& comp : dst_spc.getParticleiComps()) {
+            auto& dst_data = dst_soa.GetIntData(comp.second);
+            const auto search = src_icomps.find(comp.first);
+            if (search != src_icomps.end()) {
+                auto& src_data = src_soa.GetIntData(search->second);
+                amrex::Gpu::copyAsync(amrex::Gpu::deviceToDevice,
+                                      src_data.begin(), src_data.end(),
+                                      dst_data.begin() + dst_np);
+            } else {
+                int* data = dst_data.dataPtr() + dst_np;
+                amrex::ParallelFor(src_np, [=] AMREX_GPU_DEVICE (long ip) {
+                    data[ip] = 0;
+                });
+            }
+        }
+        amrex::Gpu::streamSynchronize();
+    }
 }
 
     int warpx_Real_size()
@@ -187,6 +357,23 @@ namespace
     {
         const std::string callback_name(char_callback_name);
         warpx_callback_py_map.erase(callback_name);
+        warpx_callback_py_schedule.erase(callback_name);
+    }
+
+    void warpx_set_callback_py_schedule (
+        const char* char_callback_name, int nschedule,
+        const int* periods, const int* offsets)
+    {
+        const std::string callback_name(char_callback_name);
+        if (nschedule <= 0) {
+            warpx_callback_py_schedule.erase(callback_name);
+            return;
+        }
+        std::vector<std::pair<int,int>> schedule;
+        for (int i = 0; i < nschedule; i++) {
+            schedule.emplace_back(periods[i], offsets[i]);
+        }
+        warpx_callback_py_schedule[callback_name] = schedule;
     }
 
     void warpx_evolve (int numsteps)
@@ -487,6 +674,37 @@ namespace
         return data;
     }
 
+    amrex::ParticleReal** warpx_getParticleArraysMulti (
+            const char* char_species_name, const char** char_comp_names,
+            int ncomps, int lev, int* num_tiles, int** particles_per_tile ) {
+
+        const auto & mypc = WarpX::GetInstance().GetPartContainer();
+        const std::string species_name(char_species_name);
+        auto & myspc = mypc.GetParticleContainerFromName(species_name);
+
+        auto particle_comps = myspc.getParticleComps();
+        amrex::Vector<int> comps(ncomps);
+        for (int j = 0; j < ncomps; ++j) {
+            comps[j] = particle_comps.at(std::string(char_comp_names[j]));
+        }
+
+        *num_tiles = myspc.numLocalTilesAtLevel(lev);
+        *particles_per_tile = static_cast<int*>(malloc(*num_tiles*sizeof(int)));
+        memset(*particles_per_tile, 0, *num_tiles*sizeof(int));
+
+        // data is laid out tile-major: data[i*ncomps + j] is component j of tile i
+        auto data = static_cast<amrex::ParticleReal**>(malloc(*num_tiles*ncomps*sizeof(amrex::ParticleReal*)));
+        int i = 0;
+        for (WarpXParIter pti(myspc, lev); pti.isValid(); ++pti, ++i) {
+            auto& soa = pti.GetStructOfArrays();
+            for (int j = 0; j < ncomps; ++j) {
+                data[i*ncomps + j] = (amrex::ParticleReal*) soa.GetRealData(comps[j]).dataPtr();
+            }
+            (*particles_per_tile)[i] = pti.numParticles();
+        }
+        return data;
+    }
+
     int warpx_getParticleCompIndex (
          const char* char_species_name, const char* char_comp_name )
     {
@@ -598,6 +816,26 @@ namespace
         return data;
     }
 
+    void warpx_trimParticleBoundaryBuffer(const char* species_name, int boundary, int lev,
+                     const int* num_consumed, int num_tiles)
+    {
+        const std::string name(species_name);
+        auto& particle_buffers = WarpX::GetInstance().GetParticleBoundaryBuffer();
+        particle_buffers.trimParticles(name, boundary, lev, num_consumed, num_tiles);
+    }
+
+    int warpx_getParticleBoundaryBufferClearCount ()
+    {
+        auto& particle_buffers = WarpX::GetInstance().GetParticleBoundaryBuffer();
+        return particle_buffers.numClears();
+    }
+
+    int warpx_getParticleBoundaryBufferReorderCount ()
+    {
+        auto& particle_buffers = WarpX::GetInstance().GetParticleBoundaryBuffer();
+        return particle_buffers.numReorders();
+    }
+
     void warpx_clearParticleBoundaryBuffer () {
         auto& particle_buffers = WarpX::GetInstance().GetParticleBoundaryBuffer();
         particle_buffers.clearParticles();
@@ -706,6 +944,11 @@ namespace
         return warpx.stopTime();
     }
 
+    int warpx_getLayoutVersion () {
+        WarpX& warpx = WarpX::GetInstance();
+        return warpx.getLayoutVersion();
+    }
+
     int warpx_finestLevel () {
         WarpX& warpx = WarpX::GetInstance();
         return warpx.finestLevel();
@@ -757,75 +1000,56 @@ namespace
     }
 
     void warpx_calcSchottkyWeight(const char* char_species_name,
-        const double pre_fac, const int lev)
+        const double pre_fac, const double* normals, const int n_normals,
+        const int lev)
     {
-        using std::sqrt;
-        using std::exp;
-
         // get the particle container for the species of interest
         auto & mypc = WarpX::GetInstance().GetPartContainer();
         const std::string species_name(char_species_name);
         auto & myspc = mypc.GetParticleContainerFromName(species_name);
-        const auto & particle_comps = myspc.getParticleComps();
-
-        const auto & plo = myspc.Geom(lev).ProbLoArray();
-        const auto & dxi = myspc.Geom(lev).InvCellSizeArray();
-
-        // get the electric field components
-        auto& Ex = WarpX::GetInstance().getEfield(lev, 0);
-        auto& Ey = WarpX::GetInstance().getEfield(lev, 1);
-        auto& Ez = WarpX::GetInstance().getEfield(lev, 2);
+        const auto particle_comps = myspc.getParticleComps();
+        const auto normal_table = getNormalTable(normals, n_normals);
 
         for (WarpXParIter pti(myspc, lev); pti.isValid(); ++pti) {
+            applySchottkyWeightTile(pti, particle_comps, lev, pre_fac,
+                                    normal_table.dataPtr(), 0., 0.);
+        }
+    }
 
-            // get the data on the grid
-            const auto Ex_arr = Ex[pti].array();
-            const auto Ey_arr = Ey[pti].array();
-            const auto Ez_arr = Ez[pti].array();
-
-            // get the particle data
-            const long np = pti.numParticles();
-            const auto getPosition = GetParticlePosition(pti);
-
-            auto& attribs = pti.GetAttribs();
-            amrex::ParticleReal* w = attribs[PIdx::w].dataPtr();
-            amrex::ParticleReal* norm_x = pti.GetAttribs(particle_comps.at("norm_x")).dataPtr();
-            amrex::ParticleReal* norm_y = pti.GetAttribs(particle_comps.at("norm_y")).dataPtr();
-            amrex::ParticleReal* norm_z = pti.GetAttribs(particle_comps.at("norm_z")).dataPtr();
-
-            // TODO change this function to instead take as argument the
-            // boundary from which injection is done and get the normal
-            // from `interp_normal` (in DistanceToEB.H) or as a hard coded
-            // vector for domain boundaries
-
-            amrex::ParallelFor( np, [=] AMREX_GPU_DEVICE (long ip)
-            {
-                // get the particle position
-                amrex::ParticleReal xp, yp, zp;
-                getPosition(ip, xp, yp, zp);
+    void warpx_injectSchottkyParticles(const char* char_src_species_name,
+        const char* char_dst_species_name, const double pre_fac,
+        const double* normals, const int n_normals, const double mass,
+        const double potential_energy, const int lev, double* totals)
+    {
+        auto & mypc = WarpX::GetInstance().GetPartContainer();
+        const std::string src_species_name(char_src_species_name);
+        auto & src_spc = mypc.GetParticleContainerFromName(src_species_name);
+        const std::string dst_species_name(char_dst_species_name);
+        auto & dst_spc = mypc.GetParticleContainerFromName(dst_species_name);
+        const auto particle_comps = src_spc.getParticleComps();
+        const auto normal_table = getNormalTable(normals, n_normals);
 
-                // get the weight of each neigbouring node to use
-                // during interpolation
-                int i, j, k;
-                amrex::Real W[AMREX_SPACEDIM][2];
-                compute_weights_nodal(xp, yp, zp, plo, dxi, i, j, k, W);
+        totals[0] = 0.;
+        totals[1] = 0.;
+        totals[2] = 0.;
 
-                // interpolate the electric field to the particle position
-                amrex::Real Ex_p = interp_field_nodal(i, j, k, W, Ex_arr);
-                amrex::Real Ey_p = interp_field_nodal(i, j, k, W, Ey_arr);
-                amrex::Real Ez_p = interp_field_nodal(i, j, k, W, Ez_arr);
+        for (WarpXParIter pti(src_spc, lev); pti.isValid(); ++pti) {
+            const auto src_np = pti.numParticles();
 
-                // calculate the dot product of the electric field with the
-                // normal vector tied to the particle
-                double const normal_field = (
-                    Ex_p * norm_x[ip] + Ey_p * norm_y[ip] + Ez_p * norm_z[ip]
-                );
+            // enhance the weights and sum them and the energies in one pass
+            const auto tile_totals = applySchottkyWeightTile(
+                pti, particle_comps, lev, pre_fac, normal_table.dataPtr(),
+                mass, potential_energy
+            );
+            totals[0] += src_np;
+            totals[1] += amrex::get<0>(tile_totals);
+            totals[2] += amrex::get<1>(tile_totals);
 
-                // increase the particle weight by the Schottky enhancement
-                // factor if needed
-                w[ip] *= ((normal_field < 0.0) ?
-                    exp(pre_fac * sqrt(-normal_field)) : 1.0
-                );
-            });
+            // append the tile to the destination species, which does not
+            // carry the injection-only "norm_id" component
+            appendParticlesByName(src_spc, dst_spc, pti, lev);
         }
+
+        // clear the source species
+        src_spc.clearParticles();
     }
@@ -7,17 +7,32 @@
  */
 #include "WarpX_py.H"
 
+#include "WarpX.H"
+
 std::map< std::string, WARPX_CALLBACK_PY_FUNC_0 > warpx_callback_py_map;
+std::map< std::string, std::vector<std::pair<int,int>> > warpx_callback_py_schedule;
 
 bool IsPythonCallBackInstalled ( std::string name )
 {
     return (warpx_callback_py_map.count(name) == 1u);
 }
 
+bool IsPythonCallBackScheduled ( const std::string& name )
+{
+    auto const schedule = warpx_callback_py_schedule.find(name);
+    if (schedule == warpx_callback_py_schedule.end()) return true;
+
+    const int step = WarpX::GetInstance().getistep(0);
+    for (auto const& [period, offset] : schedule->second) {
+        if (step % period == offset) return true;
+    }
+    return false;
+}
+
 // Execute Python callbacks of the type given by the input string
 void ExecutePythonCallback ( std::string name )
 {
-    if ( IsPythonCallBackInstalled(name) ) {
+    if ( IsPythonCallBackInstalled(name) && IsPythonCallBackScheduled(name) ) {
         WARPX_PROFILE("warpx_py_"+name);
         warpx_callback_py_map[name]();
     }
@@ -1547,6 +1547,8 @@ WarpX::MakeNewLevelFromCoarse (int /*lev*/, amrex::Real /*time*/, const amrex::B
 void
 WarpX::ClearLevel (int lev)
 {
+    ++m_layout_version;
+
     for (int i = 0; i < 3; ++i) {
         Efield_aux[lev][i].reset();
         Bfield_aux[lev][i].reset();
@@ -1603,6 +1605,8 @@ WarpX::ClearLevel (int lev)
 void
 WarpX::AllocLevelData (int lev, const BoxArray& ba, const DistributionMapping& dm)
 {
+    ++m_layout_version;
+
     bool aux_is_nodal = (field_gathering_algo == GatheringAlgo::MomentumConserving);
 
 #if   defined(WARPX_DIM_1D_Z)
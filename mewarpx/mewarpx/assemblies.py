@@ -2,17 +2,184 @@
 Assembly implementations.
 """
 import collections
+import functools
 import logging
 
 import numpy as np
 from pywarpx import callbacks, picmi
 
 from mewarpx.mwxrun import mwxrun
-from mewarpx.utils_store.appendablearray import AppendableArray
+from mewarpx.utils_store.columnstore import ColumnStore
 
 # Get module-level logger
 logger = logging.getLogger(__name__)
 
+
+class LevelSetGrid(object):
+
+    """Uniform grid in x and z on which the level sets of assemblies are
+    tabulated, see :meth:`Assembly.bake_level_set`. Assemblies baked on the
+    same grid can be looked up together.
+
+    The level sets have gradients of at most unit length, so the bilinear
+    interpolation of a level set differs from its exact value by at most the
+    length of a cell diagonal, ``max_error``. Lookups whose result could
+    change within that error are evaluated analytically instead.
+    """
+
+    def __init__(self, xmin, xmax, zmin, zmax, dx, dz):
+        """Set up the grid. The grid nodes span at least the given limits.
+
+        Arguments:
+            x/zmin (float): Lower limits of the grid (m).
+            x/zmax (float): Upper limits of the grid (m).
+            dx, dz (float): Grid spacing (m).
+        """
+        self.xmin = xmin
+        self.zmin = zmin
+        self.dx = dx
+        self.dz = dz
+        self.nx = int(np.ceil((xmax - xmin) / dx)) + 1
+        self.nz = int(np.ceil((zmax - zmin) / dz)) + 1
+        self.xvec = xmin + dx * np.arange(self.nx)
+        self.zvec = zmin + dz * np.arange(self.nz)
+        self.max_error = np.sqrt(dx**2 + dz**2)
+
+    def locate(self, X, Z):
+        """Find the grid cell containing each point.
+
+        Arguments:
+            X (np.ndarray): n-length array of x coordinates.
+            Z (np.ndarray): n-length array of z coordinates.
+
+        Returns:
+            ii, kk (np.ndarray): Indices of the lower corner of the cell of
+                each point, clipped to the grid.
+            tx, tz (np.ndarray): Fractional position of each point in its
+                cell.
+            valid (np.ndarray): n-length boolean array, True for points inside
+                the grid.
+        """
+        fx = (X - self.xmin) / self.dx
+        fz = (Z - self.zmin) / self.dz
+        valid = (
+            (fx >= 0) & (fx <= self.nx - 1) & (fz >= 0) & (fz <= self.nz - 1)
+        )
+        ii = np.clip(np.floor(fx).astype(int), 0, self.nx - 2)
+        kk = np.clip(np.floor(fz).astype(int), 0, self.nz - 2)
+        return ii, kk, fx - ii, fz - kk, valid
+
+    def interpolate(self, tables, X, Z, cells=None):
+        """Bilinearly interpolate tabulated quantities.
+
+        Arguments:
+            tables (np.ndarray): Array of shape (..., nx, nz) with the values
+                at the grid nodes.
+            X (np.ndarray): n-length array of x coordinates.
+            Z (np.ndarray): n-length array of z coordinates.
+            cells (tuple): Result of :meth:`locate` for these points, if
+                already computed.
+
+        Returns:
+            values (np.ndarray): Array of shape (..., n) with the interpolated
+                values. Values at points outside the grid are meaningless.
+            valid (np.ndarray): n-length boolean array, True for points inside
+                the grid.
+        """
+        if cells is None:
+            cells = self.locate(X, Z)
+        ii, kk, tx, tz, valid = cells
+
+        values = (
+            tables[..., ii, kk] * (1. - tx) * (1. - tz)
+            + tables[..., ii + 1, kk] * tx * (1. - tz)
+            + tables[..., ii, kk + 1] * (1. - tx) * tz
+            + tables[..., ii + 1, kk + 1] * tx * tz
+        )
+        return values, valid
+
+
+# Level set grids by resolution factor, so that assemblies baked with the same
+# resolution share a grid
+_level_set_grids = {}
+
+
+def get_level_set_grid(res_fac=4.):
+    """Return the level set grid covering the simulation domain, with a
+    spacing res_fac times finer than the simulation grid and two extra nodes on
+    each side.
+
+    Arguments:
+        res_fac (float): Refinement of the grid relative to the simulation
+            grid. Default 4.
+
+    Returns:
+        grid (LevelSetGrid): The grid, shared by all callers with the same
+        res_fac.
+    """
+    if res_fac not in _level_set_grids:
+        dx = mwxrun.dx / res_fac
+        dz = mwxrun.dz / res_fac
+        _level_set_grids[res_fac] = LevelSetGrid(
+            mwxrun.xmin - 2.*dx, mwxrun.xmax + 2.*dx,
+            mwxrun.zmin - 2.*dz, mwxrun.zmax + 2.*dz, dx, dz
+        )
+    return _level_set_grids[res_fac]
+
+
+# Cells of a baked level set whose corner normals differ by more than this
+# (as the cosine of the angle between them) have their normals evaluated
+# analytically rather than interpolated.
+_SMOOTH_NORMAL_COS = 0.999
+
+
+def _use_baked_level_set(func):
+    """Decorator for ``isinside`` and ``calculatenormal`` of assemblies,
+    answering them from the baked level set if there is one. The decorated
+    (analytic) function is used instead for points outside the level set
+    grid, for points within ``max_error`` of the surface (or of the aura),
+    and for normals in cells where the tabulated normals are not smooth, eg
+    across the diagonals of a rectangle.
+    """
+    @functools.wraps(func)
+    def wrapper(self, X, Y, Z, *args, **kwargs):
+        if self.level_set_table is None:
+            return func(self, X, Y, Z, *args, **kwargs)
+
+        X, Y, Z = np.broadcast_arrays(X, Y, Z)
+        grid = self.level_set_grid
+        cells = grid.locate(X, Z)
+        if func.__name__ == 'isinside':
+            aura = kwargs.get('aura', args[0] if args else 0)
+            phi, valid = grid.interpolate(
+                self.level_set_table[0], X, Z, cells=cells
+            )
+            result = np.where(phi <= aura, 1, 0)
+            exact = valid & (np.abs(phi - aura) > grid.max_error)
+        else:
+            values, valid = grid.interpolate(
+                self.level_set_table, X, Z, cells=cells
+            )
+            norm = np.sqrt(values[1]**2 + values[2]**2)
+            norm[norm == 0] = 1.
+            result = np.zeros((3, len(X)))
+            result[0] = values[1] / norm
+            result[2] = values[2] / norm
+            exact = (
+                valid & (np.abs(values[0]) > grid.max_error)
+                & self.level_set_smooth[cells[0], cells[1]]
+            )
+
+        if not np.all(exact):
+            analytic = ~exact
+            result[..., analytic] = func(
+                self, X[analytic], Y[analytic], Z[analytic], *args, **kwargs
+            )
+        return result
+
+    return wrapper
+
+
 class Assembly(object):
 
     """An assembly represents any shape in the simulation; usually a conductor.
@@ -25,6 +192,17 @@ class Assembly(object):
     # current.
     scraper_diag = None
 
+    # dtype used to store the floating point attributes of scraped particles;
+    # can be set to np.float32 before diagnostic functions are added to halve
+    # the memory traffic
+    scraped_particle_float_dtype = np.float64
+
+    # Tabulated level set and surface normals, and which cells have smooth
+    # normals, set by bake_level_set()
+    level_set_grid = None
+    level_set_table = None
+    level_set_smooth = None
+
     # fields is used by the diags.FluxInjectorDiag to know what to write to
     # the CSV file. It can be overridden by child classes, but is not currently
     # adjustable by the user.
@@ -49,14 +227,14 @@ class Assembly(object):
         self.scraper_diag_fnlist = []
         # the step scraped will be recorded by default
         self.scraped_particle_attribs_list = ["step_scraped"]
-        # if needed will be an appendable array to store scraped particle
-        # properties for easy processing with diagnostic functions
+        # if needed will be a column store of scraped particle properties for
+        # easy processing with diagnostic functions
         self.scraped_particle_array = None
 
-        # currently the beforeEsolve callback is the most immediate after
-        # scraping callback
+        # the scraped particles are read from the particle boundary buffers
+        # for all assemblies at once
         if self.read_scraped_particles:
-            callbacks.installbeforeEsolve(self._run_scraper_diag_steps)
+            scrape_dispatcher.register(self)
 
     def check_geom(self):
         """Throw an error if the simulation geometry is unsupported by the
@@ -108,6 +286,67 @@ class Assembly(object):
                 potential=f'"{self.V}"'
             )
 
+    def level_set(self, X, Y, Z):
+        """Evaluate a level set function of the assembly: negative inside,
+        zero on the surface and positive outside, with a gradient of at most
+        unit length. A point is inside the assembly with a given aura if the
+        level set is at most the aura.
+
+        Arguments:
+            X (np.ndarray): array of x coordinates.
+            Y (np.ndarray): array of y coordinates.
+            Z (np.ndarray): array of z coordinates.
+
+        Returns:
+            phi (np.ndarray): The level set at the given coordinates.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not implement a level set."
+        )
+
+    def bake_level_set(self, res_fac=4., grid=None):
+        """Tabulate the level set and the surface normals on a fine grid
+        covering the simulation domain. Afterwards ``isinside`` and
+        ``calculatenormal`` are answered by a bilinear lookup in the table
+        instead of an analytic evaluation, which is cheaper for many points.
+        Points where the lookup could differ from the analytic result (close
+        to the surface, or where the normals change abruptly) are still
+        evaluated analytically. Only supported for assemblies that are
+        uniform in y.
+
+        Arguments:
+            res_fac (float): Refinement of the table relative to the
+                simulation grid, see :func:`get_level_set_grid`. Default 4.
+            grid (LevelSetGrid): Grid to tabulate on instead of the one
+                given by res_fac.
+        """
+        if grid is None:
+            grid = get_level_set_grid(res_fac)
+        X, Z = np.meshgrid(grid.xvec, grid.zvec, indexing='ij')
+        Y = np.zeros_like(X)
+        phi = self.level_set(X, Y, Z)
+
+        # the normals are tabulated from the analytic calculation, so that
+        # they are exact at the nodes
+        self.level_set_table = None
+        with np.errstate(divide='ignore', invalid='ignore'):
+            nhat = self.calculatenormal(X.ravel(), Y.ravel(), Z.ravel())
+        normals = nhat[[0, 2]].reshape((2,) + X.shape)
+
+        # cells are smooth if the normals at all corners are nearly parallel
+        # (which also excludes undefined normals)
+        smooth = np.ones((grid.nx - 1, grid.nz - 1), dtype=bool)
+        corner = normals[:, :-1, :-1]
+        for other in (
+            normals[:, 1:, :-1], normals[:, :-1, 1:], normals[:, 1:, 1:]
+        ):
+            with np.errstate(invalid='ignore'):
+                smooth &= np.sum(corner * other, axis=0) >= _SMOOTH_NORMAL_COS
+
+        self.level_set_grid = grid
+        self.level_set_smooth = smooth
+        self.level_set_table = np.stack([phi, normals[0], normals[1]])
+
     def add_diag_fn(self, diag_fn, attrib_list):
         """Add a diagnostic function to the diagnostic function list.
 
@@ -134,143 +373,241 @@ class Assembly(object):
         # the new particle attributes
         if new_attribs:
             if (self.scraped_particle_array is not None
-                and self.scraped_particle_array._datalen != 0
+                and len(self.scraped_particle_array) != 0
             ):
                 raise RuntimeError(
                     f"The scraped particle array of {self.name} is not empty; "
                     "cannot add new particle attribute to track."
                 )
-            # note the +1 in unitshape is to save species ID
-            self.scraped_particle_array = AppendableArray(
-                typecode='d',
-                unitshape=[len(self.scraped_particle_attribs_list)+1]
-            )
+            # the species ID and step are stored as integers
+            columns = collections.OrderedDict(species_id=np.int16)
+            for attrib in self.scraped_particle_attribs_list:
+                if attrib == 'step_scraped':
+                    columns[attrib] = np.int32
+                else:
+                    columns[attrib] = self.scraped_particle_float_dtype
+            self.scraped_particle_array = ColumnStore(columns)
 
     def _run_scraper_diag_steps(self):
-        """Perform the steps involved in diagnostics of scraped particles."""
-        # return early if no particle attributes will be recorded
-        if self.scraped_particle_array is None:
-            return
-
-        if not hasattr(self, 'scraper_label'):
-            raise AttributeError(
-                f"Cannot record particles scraped on {self.name} since it "
-                "does not have a scraper label."
-            )
-
-        # accumulate the scraped particle data
-        self._read_scraped_particles()
+        """Run the diagnostic functions on the scraped particles collected
+        by the :class:`ScrapeDispatcher` this step."""
         # construct dictionary of scraped particle data
         lpdict = self._get_scraped_particles_dict()
         # run all diagnostic functions
         for func in self.scraper_diag_fnlist:
             func(lpdict)
 
-    def _read_scraped_particles(self):
-        """Function to read the scraped particle buffer and populate the
-        scraped_particle_array."""
-        # loop over species and get the scraped particle data from the buffer
-        for species in mwxrun.simulation.species:
-            idx_list = []
+    def _append_scraped_particles(self, species_id, particle_data, idx=None):
+        """Append the scraped particles belonging to this assembly to the
+        scraped_particle_array.
 
-            # get the number of particles in the buffer - this is primarily
-            # to avoid trying to access the buffer if it is not defined
-            # which causes a segfault
-            buffer_count = mwxrun.sim_ext.get_particle_boundary_buffer_size(
-                species.name, self.scraper_label
-            )
-            # logger.info(f"{self.name} scraped {buffer_count} {species.name}")
+        Arguments:
+            species_id (int): Species number of the particles.
+            particle_data (dict): 1D arrays of the particle attributes of all
+                particles scraped this step on the boundary of this assembly.
+            idx (np.ndarray): Indices of the particles that belong to this
+                assembly. Default None for all particles.
+        """
+        self.scraped_particle_array.append(
+            particle_data, idx=idx, species_id=species_id
+        )
 
-            # if there are no particles in the buffer continue to next species
-            if buffer_count == 0:
+    def _get_scraped_particles_dict(self):
+        """Retrieve a dictionary containing the scraped particle data.
+
+        Returns:
+            scrapedparticles_dict (collections.OrderedDict): Keys are the
+                originally passed field strings for lost particles. Values are
+                an (n)-shape numpy array for each field. These are views of
+                the scraped_particle_array, only valid until particles are
+                scraped on the next step.
+        """
+        lpdict = self.scraped_particle_array.data()
+
+        self.scraped_particle_array.cleardata()
+        return lpdict
+
+
+class ScrapeDispatcher(object):
+
+    """Read the particle boundary buffers for all assemblies. Each (species,
+    boundary) buffer is read once per step, and particles scraped on the
+    embedded boundary are classified to the assemblies in a single pass. This
+    should be a singleton object.
+    """
+
+    def __init__(self):
+        # assemblies reading scraped particles, in order of registration
+        self.assemblies = []
+        # cursors used to read only the newly scraped particles from the
+        # particle boundary buffers, one per (species, boundary)
+        self.cursors = {}
+        self.installed = False
+        # level sets of the eb assemblies stacked for a combined lookup
+        self._level_set_key = None
+        self._level_set_stack = None
+
+    def register(self, assembly):
+        """Add an assembly whose scraped particles should be read.
+
+        Arguments:
+            assembly (Assembly): The assembly. Its scraper_label is looked up
+                when particles are read, since it may be set after
+                initialization of the base class.
+        """
+        self.assemblies.append(assembly)
+
+        # currently the beforeEsolve callback is the most immediate after
+        # scraping callback
+        if not self.installed:
+            callbacks.installbeforeEsolve(self.dispatch)
+            self.installed = True
+
+    def dispatch(self):
+        """Read the particles scraped this step and run the scraper
+        diagnostics of all assemblies."""
+        assemblies_by_label = collections.OrderedDict()
+        for assembly in self.assemblies:
+            # skip assemblies for which no particle attributes will be recorded
+            if assembly.scraped_particle_array is None:
                 continue
+            if not hasattr(assembly, 'scraper_label'):
+                raise AttributeError(
+                    f"Cannot record particles scraped on {assembly.name} "
+                    "since it does not have a scraper label."
+                )
+            assemblies_by_label.setdefault(
+                assembly.scraper_label, []).append(assembly)
 
-            # get the timesteps at which particles were scraped
-            comp_steps = mwxrun.sim_ext.get_particle_boundary_buffer(
-                species.name, self.scraper_label, "step_scraped", mwxrun.lev
-            )
-            # get the particles that were scraped in this timestep
-            for arr in comp_steps:
-                idx_list.append(np.where(arr == mwxrun.get_it())[0])
+        for label, assemblies in assemblies_by_label.items():
+            self._read_scraped_particles(label, assemblies)
+
+        for assemblies in assemblies_by_label.values():
+            for assembly in assemblies:
+                assembly._run_scraper_diag_steps()
 
-            raw_particle_data = {}
+    def _read_scraped_particles(self, label, assemblies):
+        """Read the particles scraped this step on one boundary and add them
+        to the scraped_particle_array of the assemblies they belong to.
 
-            # get the particle structs from the boundary buffer
-            structs = mwxrun.sim_ext.get_particle_boundary_buffer_structs(
-                species.name, self.scraper_label, mwxrun.lev
+        Arguments:
+            label (str): Scraper label of the boundary, eg 'eb'.
+            assemblies (list of Assembly): Assemblies on this boundary.
+        """
+        if mwxrun.geom_str == 'XZ' or mwxrun.geom_str == 'RZ':
+            coord_names = ['x', 'y']
+        elif mwxrun.geom_str == 'XYZ':
+            coord_names = ['x', 'y', 'z']
+        else:
+            raise NotImplementedError(
+                f"Scraping not implemented for {mwxrun.geom_str}."
             )
-            if mwxrun.geom_str == 'XZ' or mwxrun.geom_str == 'RZ':
-                raw_particle_data['x'] = [struct['x'] for struct in structs]
-                raw_particle_data['y'] = [
-                    np.zeros(len(struct['y'])) for struct in structs]
-                raw_particle_data['z'] = [struct['y'] for struct in structs]
-            elif mwxrun.geom_str == 'XYZ':
-                raw_particle_data['x'] = [struct['x'] for struct in structs]
-                raw_particle_data['y'] = [struct['y'] for struct in structs]
-                raw_particle_data['z'] = [struct['z'] for struct in structs]
-            else:
-                raise NotImplementedError(
-                    f"Scraping not implemented for {mwxrun.geom_str}."
+        comp_names = ["step_scraped"] + coord_names
+        for assembly in assemblies:
+            comp_names += [
+                attrib for attrib in assembly.scraped_particle_attribs_list
+                if attrib not in comp_names + ['z']
+            ]
+
+        # loop over species and get the scraped particle data from the buffer
+        for species in mwxrun.simulation.species:
+            key = (species.name, label)
+            if key not in self.cursors:
+                self.cursors[key] = (
+                    mwxrun.sim_ext.particle_boundary_buffer_cursor()
                 )
 
-            # sort the particles appropriately if this is an eb
-            if self.scraper_label == 'eb':
-                temp_idx_list = []
-
-                for i in range(len(idx_list)):
-                    is_inside = self.isinside(
-                        raw_particle_data['x'][i][idx_list[i]],
-                        raw_particle_data['y'][i][idx_list[i]],
-                        raw_particle_data['z'][i][idx_list[i]]
-                    )
-                    temp_idx_list.append(idx_list[i][np.where(is_inside)])
+            new_data = mwxrun.sim_ext.get_particle_boundary_buffer_since(
+                species.name, label, self.cursors[key], comp_names,
+                mwxrun.lev
+            )
 
-                    # set the scraped timestep to -1 for particles in this
-                    # EB so that they are not considered again
-                    comp_steps[i][idx_list[i][np.where(is_inside)]] = -1
+            # if there are no new particles continue to next species
+            if len(new_data['step_scraped']) == 0:
+                continue
 
-                idx_list = temp_idx_list
+            # get the particles that were scraped in this timestep, from all
+            # tiles together
+            comp_steps = np.concatenate(new_data['step_scraped'])
+            step_idx = np.where(comp_steps == mwxrun.get_it())[0]
+            if len(step_idx) == 0:
+                continue
 
-            for ii, attrib in enumerate(self.scraped_particle_attribs_list):
-                # get the desired particle property
-                if attrib not in ['x', 'y', 'z']:
-                    raw_particle_data[attrib] = (
-                        mwxrun.sim_ext.get_particle_boundary_buffer(
-                            species.name, self.scraper_label, attrib, mwxrun.lev
-                        )
-                    )
+            particle_data = {
+                comp: np.concatenate(new_data[comp])[step_idx]
+                for comp in comp_names if comp != 'step_scraped'
+            }
+            particle_data['step_scraped'] = comp_steps[step_idx]
+            if len(coord_names) == 2:
+                particle_data['z'] = particle_data['y']
+                particle_data['y'] = np.zeros(len(step_idx))
 
-            # loop over all tiles and append the particle data from that tile
-            # to scraped_particle_data
-            for ii, idxs in enumerate(idx_list):
-                if len(idxs) == 0:
-                    continue
-                data = np.zeros(
-                    (len(idxs), len(self.scraped_particle_attribs_list)+1)
+            # sort the particles appropriately if this is an eb
+            if label == 'eb':
+                owners = self._classify(
+                    assemblies, particle_data['x'], particle_data['y'],
+                    particle_data['z']
                 )
-                data[:,0] = species.species_number
-                for jj in range(0, len(self.scraped_particle_attribs_list)):
-                    data[:,jj+1] = raw_particle_data[
-                        self.scraped_particle_attribs_list[jj]][ii][idxs]
-                self.scraped_particle_array.append(data)
+                for ii, assembly in enumerate(assemblies):
+                    assembly._append_scraped_particles(
+                        species.species_number, particle_data,
+                        np.where(owners == ii)[0]
+                    )
+            else:
+                for assembly in assemblies:
+                    assembly._append_scraped_particles(
+                        species.species_number, particle_data
+                    )
 
-    def _get_scraped_particles_dict(self):
-        """Retrieve a dictionary containing the scraped particle data.
+    def _classify(self, assemblies, X, Y, Z):
+        """Find the assembly each particle belongs to: the first one it is
+        inside of. If all assemblies have baked level sets on the same grid,
+        they are looked up together, except for particles close enough to a
+        surface that the lookup could be wrong.
+
+        Arguments:
+            assemblies (list of Assembly): Candidate assemblies.
+            X, Y, Z (np.ndarray): Particle coordinates.
 
         Returns:
-            scrapedparticles_dict (collections.OrderedDict): Keys are the
-                originally passed field strings for lost particles. Values are
-                an (n)-shape numpy array for each field.
+            owners (np.ndarray): Index in assemblies of the assembly owning
+            each particle, -1 for particles inside none of them.
         """
-        lpdata = self.scraped_particle_array.data()
+        owners = np.full(len(X), -1)
+        unclaimed = np.arange(len(X))
+
+        grid = assemblies[0].level_set_grid
+        if grid is not None and all(
+            assembly.level_set_grid is grid for assembly in assemblies
+        ):
+            key = tuple(id(assembly.level_set_table) for assembly in assemblies)
+            if self._level_set_key != key:
+                self._level_set_key = key
+                self._level_set_stack = np.stack([
+                    assembly.level_set_table[0] for assembly in assemblies
+                ])
+            phi, valid = grid.interpolate(self._level_set_stack, X, Z)
+            certain = valid & np.all(np.abs(phi) > grid.max_error, axis=0)
+            inside = phi[:, certain] <= 0
+            owners[certain] = np.where(
+                np.any(inside, axis=0), np.argmax(inside, axis=0), -1
+            )
+            unclaimed = unclaimed[~certain]
+
+        for ii, assembly in enumerate(assemblies):
+            if len(unclaimed) == 0:
+                break
+            is_inside = np.asarray(
+                assembly.isinside(X[unclaimed], Y[unclaimed], Z[unclaimed]),
+                dtype=bool
+            )
+            owners[unclaimed[is_inside]] = ii
+            unclaimed = unclaimed[~is_inside]
 
-        lpdict = collections.OrderedDict(
-            [(name, np.array(lpdata[:, ii], copy=True)) for ii, name in
-            enumerate(["species_id"]+self.scraped_particle_attribs_list)]
-        )
+        return owners
 
-        self.scraped_particle_array.cleardata()
-        return lpdict
+
+scrape_dispatcher = ScrapeDispatcher()
 
 
 class ZPlane(Assembly):
@@ -473,6 +810,15 @@ class InfCylinderY(Assembly):
         if install_in_simulation:
             self._install_in_simulation()
 
+    def level_set(self, X, Y, Z):
+        """The signed distance to the cylinder surface, see
+        :meth:`Assembly.level_set`."""
+        return (
+            np.sqrt((X - self.center_x)**2 + (Z - self.center_z)**2)
+            - self.radius
+        )
+
+    @_use_baked_level_set
     def isinside(self, X, Y, Z, aura=0):
         """
         Determines whether the given coordinates are inside the assembly.
@@ -496,6 +842,7 @@ class InfCylinderY(Assembly):
 
         return result
 
+    @_use_baked_level_set
     def calculatenormal(self, px, py, pz):
         """
         Calculates Normal of particle inside/outside of conductor to nearest
@@ -734,6 +1081,16 @@ class Rectangle(Assembly):
         if install_in_simulation:
             self._install_in_simulation()
 
+    def level_set(self, X, Y, Z):
+        """The largest signed distance to the planes of the four faces, see
+        :meth:`Assembly.level_set`. This matches the aura used by
+        :meth:`isinside`."""
+        return np.maximum(
+            np.maximum(X - self.xmax, self.xmin - X),
+            np.maximum(Z - self.zmax, self.zmin - Z)
+        )
+
+    @_use_baked_level_set
     def calculatenormal(self, px, py, pz):
         """
         Calculates Normal of particle inside/outside of conductor to nearest
@@ -842,6 +1199,7 @@ class Rectangle(Assembly):
 
         return idx
 
+    @_use_baked_level_set
     def isinside(self, X, Y, Z, aura=0):
         """
         Determines whether the given coordinates are inside the assembly.
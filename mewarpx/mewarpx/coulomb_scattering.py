@@ -8,6 +8,7 @@ from pywarpx import callbacks, picmi
 
 from mewarpx.mwxrun import mwxrun
 import mewarpx.utils_store.mwxconstants as constants
+from mewarpx.utils_store.rng import mwxrng
 import mewarpx.utils_store.util as mwxutil
 
 # Get module-level logger
@@ -139,16 +140,14 @@ class LangevinElectronIonScattering(object):
         structs = mwxrun.sim_ext.get_particle_structs(self.collider.name, 0)
 
         # collect electron particle velocities (array-of-structs)
-        ux_arrays = mwxrun.sim_ext.get_particle_ux(self.collider.name)
-        uy_arrays = mwxrun.sim_ext.get_particle_uy(self.collider.name)
-        uz_arrays = mwxrun.sim_ext.get_particle_uz(self.collider.name)
+        vel_arrays = mwxrun.sim_ext.get_particle_arrays_multi(
+            self.collider.name, ['ux', 'uy', 'uz'], 0
+        )
 
         # loop over tiles and scatter the electrons appropriately
         for ii in range(len(structs)):
 
-            ux = ux_arrays[ii]
-            uy = uy_arrays[ii]
-            uz = uz_arrays[ii]
+            ux, uy, uz = vel_arrays[ii]
 
             # create a new array of the velocity components for convenience
             v = np.array([ux, uy, uz])
@@ -173,8 +172,9 @@ class LangevinElectronIonScattering(object):
 
             # generate diffusion scattering vectors in the perpendicular plane
             sigma = np.sqrt(mwxrun.get_dt()*d11)
-            Q1 = np.random.normal(0, sigma, len(v_mag))
-            Q2 = np.random.normal(0, sigma, len(v_mag))
+            rng = mwxrng.get_generator("langevin")
+            Q1 = rng.normal(0, sigma, len(v_mag))
+            Q2 = rng.normal(0, sigma, len(v_mag))
 
             # calculate rotation angles to parallel coordinates frame
             cos_theta = v[2] / v_mag
@@ -186,7 +186,7 @@ class LangevinElectronIonScattering(object):
             dif = v_mag**2 - Q1**2 - Q2**2
             # pick out unphysical points - for these we use isotropic scattering
             idx = np.where(dif <= 0)[0]
-            isotropized_vels = mwxutil.get_vel_vector(v_mag[idx])
+            isotropized_vels = mwxutil.get_vel_vector(v_mag[idx], rng=rng)
             Q1[idx] = isotropized_vels[:, 0]
             Q2[idx] = isotropized_vels[:, 1]
             dif[idx] = isotropized_vels[:, 2]**2
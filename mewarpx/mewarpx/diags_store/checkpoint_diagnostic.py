@@ -50,7 +50,9 @@ class CheckPointDiagnostic(WarpXDiagnostic):
         # if checkpoints will only be created with an interrupt signal or
         # the end of the simulation, we don't need to install the callback
         if self.checkpoint_steps != mwxrun.simulation.max_steps:
-            callbacks.installafterdiagnostics(self.checkpoint_manager)
+            self.install_periodic_callback(
+                callbacks.installafterdiagnostics, self.checkpoint_manager
+            )
 
     def add_checkpoint(self):
         diagnostic = picmi.Checkpoint(
@@ -82,6 +82,25 @@ class WarpXDiagnostic(object):
         if hasattr(self, "write_dir") and mwxrun.me == 0:
             mwxutil.mkdir_p(self.write_dir)
 
+    def install_periodic_callback(self, install_func, func):
+        """Install a callback that can only do work on steps where
+        check_timestep() may be True. Unless ``manual_timesteps`` is used, the
+        callback is installed with the diagnostic period and offset so that
+        WarpX does not call into Python on the other steps. The callback should
+        still use check_timestep() to handle ``extended_interval_level``.
+
+        Arguments:
+            install_func (function): The install function from
+                ``pywarpx.callbacks``, e.g. ``callbacks.installafterstep``.
+            func (function): The callback to install.
+        """
+        if self.manual_timesteps is None:
+            install_func(
+                func, period=self.diag_steps, offset=self.diag_step_offset
+            )
+        else:
+            install_func(func)
+
     def check_timestep(self):
         """Check if the diagnostic should run on this timestep.
 
@@ -208,7 +227,9 @@ class TextDiag(WarpXDiagnostic):
         callbacks.installafterinit(self.init_timers_and_counters)
 
         if install:
-            callbacks.installafterstep(self.text_diag)
+            self.install_periodic_callback(
+                callbacks.installafterstep, self.text_diag
+            )
 
     def init_timers_and_counters(self):
         """Start timers."""
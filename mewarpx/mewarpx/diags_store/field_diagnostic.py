@@ -82,7 +82,14 @@ class FieldDiagnostic(WarpXDiagnostic):
         self.post_processing = post_processing
         self.kwargs = kwargs
 
-        callbacks.installafterstep(self.fields_diag)
+        # post processing happens on the last step, which may not be a
+        # diagnostic step
+        if self.post_processing:
+            callbacks.installafterstep(self.fields_diag)
+        else:
+            self.install_periodic_callback(
+                callbacks.installafterstep, self.fields_diag
+            )
 
         if self.install_field_diagnostic:
             self.add_field_diag()
@@ -101,8 +108,8 @@ class FieldDiagnostic(WarpXDiagnostic):
 
     def fields_diag(self):
         """Function to process (get, plot and save) field quantities. This
-        function is called on every step, but only executes if check_timestep()
-        evaluated to True.
+        function is only called on diagnostic steps unless post processing is
+        on, and only executes if check_timestep() evaluated to True.
         """
         if (self.post_processing
             and (mwxrun.get_it() == mwxrun.simulation.max_steps)
@@ -115,8 +122,11 @@ class FieldDiagnostic(WarpXDiagnostic):
         logger.info("Analyzing fields...")
         self.it = mwxrun.get_it()
 
+        # The gathered data is only used on the root processor
         if self.process_phi:
-            data = mwxrun.get_gathered_phi_grid(include_ghosts=False)
+            data = mwxrun.get_gathered_phi_grid(
+                include_ghosts=False, gather_to=0
+            )
             self.process_field(
                 data=data,
                 titlestr='Electrostatic potential',
@@ -134,11 +144,15 @@ class FieldDiagnostic(WarpXDiagnostic):
                 draw_contourlines=False)
         if self.process_rho:
             # assume that rho_fp still holds the net charge density
-            data = mwxrun.get_gathered_rho_grid(include_ghosts=False) * 1e-6
-            if mwxrun.dim == 1:
-                data = data[:,0]
-            elif mwxrun.dim == 2:
-                data = data[:,:,0]
+            data = mwxrun.get_gathered_rho_grid(
+                include_ghosts=False, gather_to=0
+            )
+            if mwxrun.me == 0:
+                data = data * 1e-6
+                if mwxrun.dim == 1:
+                    data = data[:,0]
+                elif mwxrun.dim == 2:
+                    data = data[:,:,0]
 
             self.process_field(
                 data=data,
@@ -148,15 +162,16 @@ class FieldDiagnostic(WarpXDiagnostic):
 
             # deposit the charge density for each species
             for species in self.species_list:
-                data = (
-                    mwxrun.get_gathered_rho_grid(
-                        species_name=species.name, include_ghosts=False
-                    ) / species.sq * 1e-6
+                data = mwxrun.get_gathered_rho_grid(
+                    species_name=species.name, include_ghosts=False,
+                    gather_to=0
                 )
-                if mwxrun.dim == 1:
-                    data = data[:,0]
-                elif mwxrun.dim == 2:
-                    data = data[:,:,0]
+                if mwxrun.me == 0:
+                    data = data / species.sq * 1e-6
+                    if mwxrun.dim == 1:
+                        data = data[:,0]
+                    elif mwxrun.dim == 2:
+                        data = data[:,:,0]
 
                 self.process_field(
                     data=data,
@@ -12,9 +12,10 @@ import pandas
 from pywarpx import callbacks
 
 from mewarpx.diags_store import diag_base, timeseries
+from mewarpx.diags_store.flux_ledger import flux_ledger
+from mewarpx.diags_store.flux_records import (RECORD_EXTENSION,
+                                              FluxRecordFile, FluxRecordWriter)
 from mewarpx.mwxrun import mwxrun
-from mewarpx.utils_store import parallel_util
-from mewarpx.utils_store.appendablearray import AppendableArray
 import mewarpx.utils_store.util as mwxutil
 
 logger = logging.getLogger(__name__)
@@ -24,14 +25,17 @@ class ParticleCSVDiag(diag_base.WarpXDiagnostic):
 
     """Handles writing out, and accumulating real-time, a per-step record of
     charge injected or deposited. Provides a base for specific implementations.
-    At present species_name is a required column and must be str.
+    The records are handled as dicts of numpy columns; pandas is only used to
+    write CSV files. They can also be saved as binary record files, see
+    :mod:`mewarpx.diags_store.flux_records`. At present species_id is a
+    required column and must be int.
     """
 
     # Columns not to accumulate internally
     columns_no_accumulate = ['t', 'step', 'species_id']
 
     def __init__(self, diag_steps, write_dir=None, save_name=None,
-                 **kwargs):
+                 save_csv=True, save_records=False, **kwargs):
         """Basic initialization.
         If ``write_dir`` or ``save_name`` are ``None``, no data is saved to file
         and only accumulated data is kept.
@@ -41,13 +45,26 @@ class ParticleCSVDiag(diag_base.WarpXDiagnostic):
             write_dir (string): Directory to write CSV files to.
             save_name(string): Full filename within the directory to write CSV
                 files to.
+            save_csv (bool): Whether to write a CSV file. Default True.
+            save_records (bool): Whether to write a binary record file, named
+                as save_name with its extension replaced by
+                ``RECORD_EXTENSION``. Default False.
             kwargs: See :class:`mewarpx.diags_store.diag_base.WarpXDiagnostic`
                 for more timing options.
         """
-        self.save = (write_dir is not None) and (save_name is not None)
+        self.save = (
+            (write_dir is not None) and (save_name is not None)
+            and (save_csv or save_records)
+        )
+        self.save_csv = self.save and save_csv
+        self.save_records = self.save and save_records
         if self.save:
             self.write_dir = write_dir
             self.save_path = os.path.join(self.write_dir, save_name)
+            self.records_path = (
+                os.path.splitext(self.save_path)[0] + RECORD_EXTENSION
+            )
+        self.record_writer = None
 
         self.accumulate_dict = {}
 
@@ -61,21 +78,34 @@ class ParticleCSVDiag(diag_base.WarpXDiagnostic):
         pass
 
     def charge_accum_diag(self):
-        """Generate flux dataframe; write to CSV if requested.
+        """Generate flux columns; write to CSV and/or record file if
+        requested.
         Called by the FluxDiag owning this at appropriate timesteps.
-        """
-        df = self._collect_dataframe()
-        self._accumulate_columns(df)
-        if self.save:
-            self._write_dataframe(df)
 
-        return df
-
-    def _collect_dataframe(self):
-        """Gather the dataframe of per-step information and return it."""
+        Returns:
+            columns (collections.OrderedDict): A numpy array for each field,
+            see :meth:`_collect_columns`.
+        """
+        columns = self._collect_columns()
+        self._accumulate_columns(columns)
+        if self.save_csv:
+            self._write_dataframe(pandas.DataFrame(columns))
+        if self.save_records:
+            self._write_records(columns)
+
+        return columns
+
+    def _collect_columns(self, clear=True):
+        """Gather the per-step information and return it as a dict with a
+        numpy array for each field."""
         raise NotImplementedError("Must implement in child object.")
 
-    def _accumulate_columns(self, df, accumulate_dict=None):
+    def _collect_dataframe(self, clear=True):
+        """Gather the per-step information as a pandas.DataFrame."""
+        columns = self._collect_columns(clear=clear)
+        return pandas.DataFrame(columns, columns=list(columns.keys()))
+
+    def _accumulate_columns(self, columns, accumulate_dict=None):
         """Track summed quantities only
         accumulate_dict not None will update that dict rather than the
         built-in dict.
@@ -83,14 +113,17 @@ class ParticleCSVDiag(diag_base.WarpXDiagnostic):
         if accumulate_dict is None:
             accumulate_dict = self.accumulate_dict
 
-        species_list = np.unique(df['species_id'])
+        species_ids = columns['species_id']
+        species_list = np.unique(species_ids)
 
-        for column in df.columns:
+        for column, values in columns.items():
             if column not in self.columns_no_accumulate:
+                # sum the column for every species at once
+                sums = np.bincount(species_ids, weights=values)
                 for species_id in species_list:
                     accumulate_dict[(column, species_id)] = (
                         accumulate_dict.setdefault((column, species_id), 0.)
-                        + np.sum(df[df['species_id'] == species_id][column])
+                        + sums[species_id]
                     )
 
     def get_species_list(self):
@@ -109,13 +142,20 @@ class ParticleCSVDiag(diag_base.WarpXDiagnostic):
             else:
                 df.to_csv(self.save_path, mode='w', header=True, index=False)
 
+    def _write_records(self, columns):
+        """Append the columns to the binary record file."""
+        if mwxrun.me == 0:
+            if self.record_writer is None:
+                self.record_writer = FluxRecordWriter(self.records_path)
+            self.record_writer.append(columns)
+
     def get_updated_accumulators(self):
         """Return up-to-date accumulated values in a separate dictionary,
         without clearing and/or writing the values.
         """
         acdict = self.accumulate_dict.copy()
-        df = self._collect_dataframe(clear=False)
-        self._accumulate_columns(df, accumulate_dict=acdict)
+        columns = self._collect_columns(clear=False)
+        self._accumulate_columns(columns, accumulate_dict=acdict)
         return acdict
 
 
@@ -155,14 +195,13 @@ class InjectorFluxDiag(ParticleCSVDiag):
             **kwargs
         )
 
-    def _collect_dataframe(self, clear=True):
+    def _collect_columns(self, clear=True):
         partdict = self.injector.get_injectedparticles(clear=clear)
         # Convert species_name & step to int, because they come out as floats.
         partdict['species_id'] = partdict['species_id'].astype(int)
         partdict['step'] = partdict['step'].astype(int)
-        df = pandas.DataFrame(partdict, columns=list(partdict.keys()))
 
-        return df
+        return partdict
 
 
 class SurfaceFluxDiag(ParticleCSVDiag):
@@ -172,8 +211,8 @@ class SurfaceFluxDiag(ParticleCSVDiag):
     This class is used by FluxDiag; rarely used directly.
     """
 
-    # IF CHANGING THIS, CHANGE IN self._record_particle_flux() AS WELL.
-    fields = ['t', 'step', 'species_id', 'V_e', 'n', 'q', 'E_total']
+    # IF CHANGING THIS, CHANGE IN FluxLedger AS WELL.
+    fields = flux_ledger.fields
 
     def __init__(self, diag_steps, surface, write_dir, **kwargs):
         """Initialize surface-specific features.
@@ -209,9 +248,8 @@ class SurfaceFluxDiag(ParticleCSVDiag):
             diag_fn=self._record_particle_flux, attrib_list=["w", "E_total"]
         )
 
-        # create the flux_dict to track fluxes
-        self.flux_array = AppendableArray(
-            typecode='d', unitshape=[len(self.fields)])
+        # register with the flux ledger shared by all injectors and surfaces
+        self._ledger_id = flux_ledger.register()
 
     def _record_particle_flux(self, scraped_particle_dict):
         """Function to process the scraped particle dict for the total
@@ -227,29 +265,29 @@ class SurfaceFluxDiag(ParticleCSVDiag):
             The total charge scraped and energy of the particles scraped
             is multiplied by -1 since these quantities are leaving the system.
         """
-        # loop over species and process scraped particle data
-        for species in mwxrun.simulation.species:
-            data = np.zeros(7)
-            data[0] = mwxrun.get_t()
-            data[1] = mwxrun.get_it()
-            data[2] = species.species_number
-            data[3] = self.surface.getvoltage_e()
+        # loop over species and process scraped particle data, recording one
+        # row per species
+        data = np.zeros((len(mwxrun.simulation.species), 7))
+        data[:, 0] = mwxrun.get_t()
+        data[:, 1] = mwxrun.get_it()
+        data[:, 3] = self.surface.getvoltage_e()
+        for ii, species in enumerate(mwxrun.simulation.species):
+            data[ii, 2] = species.species_number
 
             # When pre-seeding a simulation with plasma we inject particles over
             # embedded boundaries which causes the first scraping step to
             # show very large currents. For this reason we skip that first step
             # but note that we inject after the first step so we need to skip
             # scraping step 2.
-            if data[1] == 2:
-                self.flux_array.append(data)
+            if data[ii, 1] == 2:
                 continue
 
-            idx = np.where(scraped_particle_dict["species_id"] == data[2])
-            data[4] = np.size(idx)
-            data[5] = -species.sq * np.sum(scraped_particle_dict["w"][idx])
-            data[6] = -np.sum(scraped_particle_dict["E_total"][idx])
+            idx = np.where(scraped_particle_dict["species_id"] == data[ii, 2])
+            data[ii, 4] = np.size(idx)
+            data[ii, 5] = -species.sq * np.sum(scraped_particle_dict["w"][idx])
+            data[ii, 6] = -np.sum(scraped_particle_dict["E_total"][idx])
 
-            self.flux_array.append(data)
+        flux_ledger.append(self._ledger_id, data)
 
     def _get_total_particle_flux(self, clear=False):
         """Get a dictionary containing the fluxes summed over processors.
@@ -263,28 +301,17 @@ class SurfaceFluxDiag(ParticleCSVDiag):
                 originally passed field strings for lost particles. Values are
                 an (n)-shape numpy array for each field.
         """
-        lpdata = self.flux_array.data()
-
-        # Sum all except t/step/jsid/V_e from all processors
-        lpdata[:,4:] = parallel_util.parallelsum(np.array(lpdata[:,4:]))
-
-        lpdict = collections.OrderedDict(
-            [(fieldname, np.array(lpdata[:, ii], copy=True))
-             for ii, fieldname in enumerate(self.fields)])
+        # Sum all except t/step/jsid/V_e from all processors, together with
+        # all other injectors and surfaces
+        return flux_ledger.get_rows(self._ledger_id, clear=clear)
 
-        if clear:
-            self.flux_array.cleardata()
-
-        return lpdict
-
-    def _collect_dataframe(self, clear=True):
+    def _collect_columns(self, clear=True):
         partdict = self._get_total_particle_flux(clear=clear)
         # Convert species_id & step to int, because they come out as floats.
         partdict['species_id'] = partdict['species_id'].astype(int)
         partdict['step'] = partdict['step'].astype(int)
-        df = pandas.DataFrame(partdict, columns=list(partdict.keys()))
 
-        return df
+        return partdict
 
 
 class FluxDiagBase(diag_base.WarpXDiagnostic):
@@ -653,7 +680,8 @@ class FluxDiagnostic(FluxDiagBase):
                  printed_qtys=None,
                  check_charge_conservation=True,
                  print_per_diagnostic=True, print_total=False,
-                 plot=True, save_csv=False, profile_decorator=None,
+                 plot=True, save_csv=False, save_records=False,
+                 profile_decorator=None,
                  **kwargs):
         """Generate and install function to write out fluxes.
 
@@ -681,6 +709,10 @@ class FluxDiagnostic(FluxDiagBase):
                 period.
             save_csv (bool): Whether to save csv files of scraped / injected
                 particles.
+            save_records (bool): Whether to save binary record files of
+                scraped / injected particles, see
+                :mod:`mewarpx.diags_store.flux_records`. These are much faster
+                to write and read than csv files.
             profile_decorator (decorator): A decorator used to profile the
                 timeseries update methods and related functions.
             kwargs: See :class:`mewarpx.diags_store.diag_base.WarpXDiagnostic`
@@ -695,7 +727,7 @@ class FluxDiagnostic(FluxDiagBase):
         self.print_total = print_total
         self.plot = plot
 
-        if save_csv:
+        if save_csv or save_records:
             csv_write_dir = os.path.join(self.DIAG_DIR, self.FLUX_DIAG_DIR)
         else:
             csv_write_dir = None
@@ -719,6 +751,8 @@ class FluxDiagnostic(FluxDiagBase):
                 InjectorFluxDiag(diag_steps=diag_steps,
                                  injector=injector,
                                  write_dir=csv_write_dir,
+                                 save_csv=save_csv,
+                                 save_records=save_records,
                                  **kwargs)
                 for injector in self.injector_dict[key]
             ]
@@ -729,6 +763,8 @@ class FluxDiagnostic(FluxDiagBase):
                 SurfaceFluxDiag(diag_steps=diag_steps,
                                 surface=surface,
                                 write_dir=csv_write_dir,
+                                save_csv=save_csv,
+                                save_records=save_records,
                                 **kwargs)
                 for surface in self.surface_dict[key]
             ]
@@ -756,7 +792,9 @@ class FluxDiagnostic(FluxDiagBase):
             self._load_checkpoint_flux() if mwxrun.restart else None
         )
 
-        callbacks.installafterstep(self._flux_ana)
+        self.install_periodic_callback(
+            callbacks.installafterstep, self._flux_ana
+        )
 
     def check_scraping(self):
         """Checks that particles scraping at the appropriate boundaries is
@@ -822,14 +860,20 @@ class FluxDiagnostic(FluxDiagBase):
 
         for (keytype, key), diaglist in self.diags_dict.items():
             for diagobj in diaglist:
-                df = diagobj.charge_accum_diag()
+                columns = diagobj.charge_accum_diag()
                 # only need to hold a copy of the timeseries on root
                 if mwxrun.me == 0:
                     species_list = diagobj.get_species_list()
+                    species_columns = group_by_species(columns)
                     for sp in species_list:
-                        subdf = df[df['species_id'] == sp]
+                        subcolumns = species_columns.get(sp)
+                        if subcolumns is None:
+                            subcolumns = collections.OrderedDict(
+                                (name, values[:0])
+                                for name, values in columns.items()
+                            )
                         ts = FluxCalcDataframe(
-                            df=subdf,
+                            df=subcolumns,
                             area=self.runinfo.area,
                             step_begin=self.last_run_step + 1,
                             step_end=mwxrun.get_it() + 1
@@ -939,7 +983,7 @@ class FluxDiagnostic(FluxDiagBase):
 
 class FluxCalcDataframe(timeseries.Timeseries):
 
-    """A FluxCalc created from a pandas Dataframe.
+    """A FluxCalc created from a pandas Dataframe or a dict of numpy columns.
     Dataframes passed to this class should only consist of a single species; as
     a result multiple lines at the same timestep are not supported. Desired
     concatenation or summation across timeseries should be done on the
@@ -955,7 +999,8 @@ class FluxCalcDataframe(timeseries.Timeseries):
         array.
 
         Arguments:
-            df (pandas.DataFrame): A single dataframe with columns:
+            df (pandas.DataFrame or dict): A single dataframe, or dict of
+                numpy arrays, with columns:
             - t: Time in sec
             - step: Step number, integer, with constant dt necessary.
             - n: Number of macroparticles
@@ -1066,6 +1111,9 @@ class FluxDiagFromFile(FluxDiagBase):
             fs (s3fs filesystem): Optional S3 filesystem to load data directly
                 from a S3 bucket.
         """
+        self.basedir = basedir
+        self.fs = fs
+
         if fs is None:
             self.open_command = open
             self.exists_command = os.path.exists
@@ -1097,6 +1145,60 @@ class FluxDiagFromFile(FluxDiagBase):
             )
         return flux_files[-1]
 
+    def get_flux_records(self, records_dir=None):
+        """Open the binary record files written with ``save_records=True``.
+        Local files are memory-mapped, so only the data that is used gets
+        read; use :meth:`FluxRecordFile.get_records` to select a range of
+        steps.
+
+        Arguments:
+            records_dir (str): Directory of the record files. Default the
+                fluxes directory in the base directory.
+
+        Returns:
+            records_dict (dict): Keys are the filenames without extension, eg
+            ``cathode_scraped``, values the
+            :class:`mewarpx.diags_store.flux_records.FluxRecordFile` objects.
+        """
+        if records_dir is None:
+            records_dir = os.path.join(self.basedir, self.FLUX_DIAG_DIR)
+        record_files = sorted(
+            self.glob_command(os.path.join(records_dir, '*' + RECORD_EXTENSION))
+        )
+        return {
+            os.path.basename(filename)[:-len(RECORD_EXTENSION)]:
+            FluxRecordFile(filename, fs=self.fs)
+            for filename in record_files
+        }
+
+
+def group_by_species(columns):
+    """Split flux records by species, with a single stable sort so the rows
+    of each species stay in order.
+
+    Arguments:
+        columns (dict): A numpy array for each field, including an integer
+            ``species_id`` field.
+
+    Returns:
+        species_columns (dict): For each species ID present, a
+        collections.OrderedDict with the arrays of that species' rows.
+    """
+    species_ids = columns['species_id']
+    order = np.argsort(species_ids, kind='stable')
+    sorted_ids = species_ids[order]
+    uniq, starts = np.unique(sorted_ids, return_index=True)
+    ends = np.append(starts[1:], len(sorted_ids))
+
+    sorted_columns = {name: values[order] for name, values in columns.items()}
+    return {
+        sp: collections.OrderedDict(
+            (name, values[start:end])
+            for name, values in sorted_columns.items()
+        )
+        for sp, start, end in zip(uniq, starts, ends)
+    }
+
 
 # ### Numba functions for FluxCalcDataframe ###
 @numba.jit(nopython=True)
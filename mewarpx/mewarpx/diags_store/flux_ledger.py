@@ -0,0 +1,202 @@
+"""
+Shared store of the injected and scraped particle totals recorded by injectors
+and surfaces between flux diagnostic outputs.
+
+Each source (an injector or a surface diagnostic) records, per species and
+step, the number of macroparticles, charge and energy it injected or
+absorbed. The totals of all sources live in a single array spanning the
+current diagnostic period, so they are summed over processors with one
+``Allreduce`` per period rather than one per source.
+
+Usage::
+
+    from mewarpx.diags_store.flux_ledger import flux_ledger
+
+    source_id = flux_ledger.register()
+    flux_ledger.append(source_id, data)
+    rows = flux_ledger.get_rows(source_id, clear=True)
+"""
+import collections
+
+import numpy as np
+
+from mewarpx.mwxrun import mwxrun
+from mewarpx.utils_store import parallel_util
+
+
+class FluxLedger(object):
+
+    """Record injected and scraped particle totals of all sources. This should
+    be a singleton object.
+
+    Note:
+        As before with the per-source arrays, all processors have to register
+        the sources in the same order and record the same (source, species,
+        step) entries, even if they have no particles to add. Reading the
+        rows of any source is a collective operation whenever something was
+        recorded since the last reduction.
+    """
+
+    # IF CHANGING THIS, CHANGE IN self.append() AS WELL.
+    fields = ['t', 'step', 'species_id', 'V_e', 'n', 'q', 'E_total']
+
+    # Quantities summed over processors: a flag marking recorded entries,
+    # followed by n, q and E_total.
+    _nsummed = 4
+
+    def __init__(self, capacity=64):
+        """Initialize an empty ledger.
+
+        Arguments:
+            capacity (int): Initial number of steps the ledger can hold. It
+                grows as needed, so this only avoids reallocations.
+        """
+        self.nsources = 0
+        self.step_begin = None
+        self._cleared = set()
+        self._allocate(0, 0, capacity)
+
+    def _allocate(self, nsources, nspecies, nsteps):
+        """(Re)allocate the arrays, keeping the recorded data."""
+        totals = np.zeros((nsources, nspecies, nsteps, self._nsummed))
+        times = np.zeros((nsources, nsteps))
+        voltages = np.zeros((nsources, nsteps))
+
+        if hasattr(self, '_totals'):
+            ns, nsp, nst, _ = self._totals.shape
+            totals[:ns, :nsp, :nst] = self._totals
+            times[:ns, :nst] = self._times
+            voltages[:ns, :nst] = self._voltages
+
+        self._totals = totals
+        self._times = times
+        self._voltages = voltages
+        self._reduced = None
+
+    def _reserve(self, nsources, nspecies, nsteps):
+        """Make sure the arrays can hold the given number of sources, species
+        and steps. The step capacity at least doubles when it grows."""
+        ns, nsp, nst, _ = self._totals.shape
+        if nsources <= ns and nspecies <= nsp and nsteps <= nst:
+            return
+        if nsteps > nst:
+            nsteps = max(nsteps, 2*nst)
+        self._allocate(
+            max(nsources, ns), max(nspecies, nsp), max(nsteps, nst)
+        )
+
+    def register(self):
+        """Add a source to the ledger.
+
+        Returns:
+            source_id (int): Index of the source, used to record and read its
+            data.
+        """
+        source_id = self.nsources
+        self.nsources += 1
+        self._reserve(self.nsources, 0, 0)
+        return source_id
+
+    def append(self, source_id, data):
+        """Record one or more rows of particle data for a source. Rows for a
+        species and step that was already recorded are added to it.
+
+        Arguments:
+            source_id (int): Index returned by :meth:`register`.
+            data (np.ndarray): Array of shape (m) or (n, m), with the m
+                ``fields`` of each of the n rows.
+        """
+        data = np.atleast_2d(data)
+        if data.shape[1] != len(self.fields):
+            raise ValueError(
+                f"Rows of {data.shape[1]} fields given but the ledger "
+                f"records {len(self.fields)} fields."
+            )
+        if self.step_begin is None:
+            self.step_begin = int(data[:, 1].min())
+
+        steps = data[:, 1].astype(int) - self.step_begin
+        species_ids = data[:, 2].astype(int)
+        if np.any(steps < 0):
+            raise ValueError(
+                f"Cannot record steps before step {self.step_begin}."
+            )
+        self._reserve(
+            self.nsources, species_ids.max() + 1, steps.max() + 1
+        )
+
+        self._times[source_id, steps] = data[:, 0]
+        self._voltages[source_id, steps] = data[:, 3]
+        np.add.at(
+            self._totals, (source_id, species_ids, steps),
+            np.column_stack((np.ones(len(data)), data[:, 4:]))
+        )
+        self._reduced = None
+        self._cleared.discard(source_id)
+
+    def reduce(self):
+        """Sum the data of all sources over all processors with a single
+        reduction, if anything was recorded since the last one. Called by
+        :meth:`get_rows` as needed."""
+        if self._reduced is not None:
+            return
+
+        # All processors hold the same number of steps up to the current one
+        nsteps = 0
+        if self.step_begin is not None:
+            nsteps = mwxrun.get_it() - self.step_begin + 1
+        self._reserve(self.nsources, len(mwxrun.simulation.species), nsteps)
+
+        self._reduced = parallel_util.parallelsum(
+            np.array(self._totals[:, :len(mwxrun.simulation.species), :nsteps])
+        )
+
+    def get_rows(self, source_id, clear=False):
+        """Retrieve the processor-summed data of a source.
+
+        Arguments:
+            source_id (int): Index returned by :meth:`register`.
+            clear (bool): If True, clear the data of this source. Once all
+                sources are cleared the ledger starts a new period. Default
+                False.
+
+        Returns:
+            rows_dict (collections.OrderedDict): Keys are the ``fields``.
+            Values are an (n)-shape numpy array for each field, with one row
+            per recorded species and step, ordered by step.
+        """
+        self.reduce()
+
+        # Recorded entries, as (step, species) to order rows by step
+        totals = self._reduced[source_id].transpose(1, 0, 2)
+        steps, species_ids = np.nonzero(totals[:, :, 0])
+
+        rows_dict = collections.OrderedDict([
+            ('t', self._times[source_id, steps]),
+            ('step', (steps + (self.step_begin or 0)).astype(float)),
+            ('species_id', species_ids.astype(float)),
+            ('V_e', self._voltages[source_id, steps]),
+            ('n', totals[steps, species_ids, 1]),
+            ('q', totals[steps, species_ids, 2]),
+            ('E_total', totals[steps, species_ids, 3]),
+        ])
+
+        if clear:
+            self._clear(source_id)
+
+        return rows_dict
+
+    def _clear(self, source_id):
+        """Clear the data of a source, in the local and reduced arrays."""
+        self._totals[source_id] = 0.
+        self._times[source_id] = 0.
+        self._voltages[source_id] = 0.
+        self._reduced[source_id] = 0.
+        self._cleared.add(source_id)
+
+        if len(self._cleared) == self.nsources:
+            self.step_begin = None
+            self._cleared = set()
+
+
+flux_ledger = FluxLedger()
@@ -0,0 +1,201 @@
+"""
+Append-only binary storage of injected and scraped flux records.
+
+Each file holds the rows of one injector or surface as fixed-size binary
+records behind a small header describing the columns. Writing a diagnostic
+period appends the raw bytes of its rows, and reading memory-maps the file so
+that only the requested steps are loaded. The rows are kept sorted by step,
+which allows range queries by binary search.
+
+Usage::
+
+    from mewarpx.diags_store.flux_records import FluxRecordFile
+
+    records = FluxRecordFile("diags/fluxes/cathode_scraped.fluxrec")
+    columns = records.get_records(step_begin=1000, step_end=2000)
+"""
+import collections
+import json
+import os
+import struct
+
+import numpy as np
+
+RECORD_EXTENSION = '.fluxrec'
+_MAGIC = b'MWXFLUX1'
+# Records start at a multiple of this many bytes
+_ALIGNMENT = 64
+
+
+def _read_header(fileobj):
+    """Read the header of a record file.
+
+    Returns:
+        dtype (np.dtype): Structured dtype of the records.
+        offset (int): Byte offset of the first record.
+    """
+    magic = fileobj.read(len(_MAGIC))
+    if magic != _MAGIC:
+        raise IOError('Not a flux record file.')
+    (header_len,) = struct.unpack('<I', fileobj.read(4))
+    header = json.loads(fileobj.read(header_len).decode('utf-8'))
+    dtype = np.dtype([tuple(field) for field in header['fields']])
+    return dtype, header['offset']
+
+
+class FluxRecordWriter(object):
+
+    """Append flux records to a binary record file. The columns are fixed by
+    the first rows written to a new file.
+    """
+
+    def __init__(self, path):
+        """Set up the writer. Nothing is written until rows are appended.
+
+        Arguments:
+            path (str): Path of the record file. If it exists, rows are
+                appended to it.
+        """
+        self.path = path
+        self.dtype = None
+        self.offset = None
+
+        if os.path.isfile(self.path):
+            with open(self.path, 'rb') as rfile:
+                self.dtype, self.offset = _read_header(rfile)
+            # drop a partially written record, eg from an interrupted run
+            nbytes = os.path.getsize(self.path) - self.offset
+            with open(self.path, 'r+b') as rfile:
+                rfile.truncate(
+                    self.offset + nbytes // self.dtype.itemsize
+                    * self.dtype.itemsize
+                )
+
+    def _write_header(self, columns):
+        """Start a new file with columns as dict of arrays."""
+        self.dtype = np.dtype([
+            (name, np.asarray(values).dtype.newbyteorder('<'))
+            for name, values in columns.items()
+        ])
+        fields = [[name, self.dtype[name].str] for name in self.dtype.names]
+
+        # the offset only depends on the header length, so iterate to get it
+        self.offset = 0
+        while True:
+            header = json.dumps(
+                {'fields': fields, 'offset': self.offset}
+            ).encode('utf-8')
+            offset = len(_MAGIC) + 4 + len(header)
+            offset = -(-offset // _ALIGNMENT) * _ALIGNMENT
+            if offset == self.offset:
+                break
+            self.offset = offset
+
+        with open(self.path, 'wb') as wfile:
+            wfile.write(_MAGIC)
+            wfile.write(struct.pack('<I', len(header)))
+            wfile.write(header)
+            wfile.write(b'\0' * (self.offset - wfile.tell()))
+
+    def append(self, columns):
+        """Append rows to the file. Rows at or after the first step given
+        that are already in the file (eg written before a restart) are
+        replaced, so the file stays sorted by step.
+
+        Arguments:
+            columns (dict): A numpy array for each field, including ``step``,
+                with the rows sorted by step.
+        """
+        if self.dtype is None:
+            self._write_header(columns)
+
+        nrows = len(columns['step'])
+        if nrows == 0:
+            return
+        records = np.empty(nrows, dtype=self.dtype)
+        for name in self.dtype.names:
+            records[name] = columns[name]
+
+        stored = FluxRecordFile(self.path)
+        if len(stored) > 0 and stored.records['step'][-1] >= records['step'][0]:
+            nkeep = stored.search_step(records['step'][0])
+            del stored
+            with open(self.path, 'r+b') as rfile:
+                rfile.truncate(self.offset + nkeep * self.dtype.itemsize)
+        else:
+            del stored
+
+        with open(self.path, 'ab') as wfile:
+            wfile.write(records.tobytes())
+
+
+class FluxRecordFile(object):
+
+    """Read a flux record file. Local files are memory-mapped, so opening a
+    file and querying a range of steps only reads the needed parts.
+    """
+
+    def __init__(self, path, fs=None):
+        """Open the record file.
+
+        Arguments:
+            path (str): Path of the record file.
+            fs (s3fs filesystem): Optional S3 filesystem to load the file
+                from. The file is then read fully into memory.
+        """
+        self.path = path
+
+        if fs is None:
+            with open(path, 'rb') as rfile:
+                self.dtype, offset = _read_header(rfile)
+            nrecords = (os.path.getsize(path) - offset) // self.dtype.itemsize
+            if nrecords == 0:
+                self.records = np.zeros(0, dtype=self.dtype)
+            else:
+                self.records = np.memmap(
+                    path, dtype=self.dtype, mode='r', offset=offset,
+                    shape=(nrecords,)
+                )
+        else:
+            with fs.open(path, 'rb') as rfile:
+                self.dtype, offset = _read_header(rfile)
+                rfile.seek(offset)
+                buffer = rfile.read()
+            nrecords = len(buffer) // self.dtype.itemsize
+            self.records = np.frombuffer(
+                buffer, dtype=self.dtype, count=nrecords
+            )
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def fields(self):
+        """List of the column names."""
+        return list(self.dtype.names)
+
+    def search_step(self, step):
+        """Return the index of the first record at or after step."""
+        return int(np.searchsorted(self.records['step'], step, side='left'))
+
+    def get_records(self, step_begin=None, step_end=None):
+        """Return the records of a range of steps.
+
+        Arguments:
+            step_begin (int): First step to include. Default from the start.
+            step_end (int): Step after the last step to include. Default up
+                to the end.
+
+        Returns:
+            columns (collections.OrderedDict): A numpy array (a view of the
+            file for local files) for each field.
+        """
+        start = 0 if step_begin is None else self.search_step(step_begin)
+        end = (
+            len(self.records) if step_end is None
+            else self.search_step(step_end)
+        )
+        records = self.records[start:end]
+        return collections.OrderedDict(
+            (name, records[name]) for name in self.dtype.names
+        )
@@ -1,8 +1,9 @@
 """
 Module for various types of particle emission in WarpX.
 """
-import collections
 # import collections
+import concurrent.futures
+import contextlib
 import logging
 import warnings
 
@@ -15,16 +16,65 @@ import scipy.interpolate
 import scipy.stats
 import skimage.measure
 
+from mewarpx.diags_store.flux_ledger import flux_ledger
 from mewarpx.mespecies import Species
 from mewarpx.mwxrun import mwxrun
-from mewarpx.utils_store import appendablearray, parallel_util
+from mewarpx.utils_store import parallel_util
 import mewarpx.utils_store.mwxconstants as constants
+from mewarpx.utils_store.rng import mwxrng
 import mewarpx.utils_store.util as mwxutil
 
 # Get module-level logger
 logger = logging.getLogger(__name__)
 
 
+class ParticlePrefetcher(object):
+
+    """Sample the next batch of particles in a background thread.
+
+    While WarpX advances a step, the worker thread samples the batch for the
+    next injection (numpy releases the GIL during most of the sampling), so
+    the injection callback only collects a ready batch. Only one batch is
+    sampled ahead: while a batch is injected the next one is being sampled.
+    The sampling function must not call into WarpX or use the per-step random
+    number counters.
+    """
+
+    def __init__(self):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="mewarpx_prefetch"
+        )
+        self._future = None
+
+    @property
+    def pending(self):
+        """True if a batch has been submitted and not yet collected."""
+        return self._future is not None
+
+    def submit(self, func, *args, **kwargs):
+        """Start sampling the next batch by calling func(*args, **kwargs) in
+        the worker thread."""
+        if self.pending:
+            raise RuntimeError("The previous batch has not been collected.")
+        self._future = self._executor.submit(func, *args, **kwargs)
+
+    def collect(self):
+        """Wait for the submitted batch and return it. Exceptions raised in
+        the worker thread are raised here."""
+        if not self.pending:
+            raise RuntimeError("No batch has been submitted.")
+        future = self._future
+        self._future = None
+        return future.result()
+
+    def shutdown(self):
+        """Stop the worker thread, discarding any pending batch."""
+        if self._future is not None:
+            self._future.cancel()
+            self._future = None
+        self._executor.shutdown(wait=True)
+
+
 class Injector(object):
 
     """Base class for injection.
@@ -45,6 +95,19 @@ class Injector(object):
     # IF CHANGING THIS, CHANGE IN self.record_injectedparticles() AS WELL.
     fields = ['t', 'step', 'species_id', 'V_e', 'n', 'q', 'E_total']
 
+    # If True, each processor only injects particles inside the boxes it owns,
+    # see :meth:`mewarpx.emission.BaseEmitter.compute_local_npart`.
+    local_injection = False
+
+    # Samples the next batch of particles in the background if prefetching is
+    # enabled, see get_particle_batch().
+    prefetcher = None
+    rseed = None
+
+    # Handle used to add particles to WarpX, created by injectors that use
+    # one on their first injection.
+    particle_injector = None
+
     # @staticmethod
     # def setup_warp():
     #     """Stuff that needs to be set before injectors are used."""
@@ -90,6 +153,96 @@ class Injector(object):
 
         return npart
 
+    def compute_injection_npart(self, npart_total):
+        """Compute the number of particles this processor injects at a given
+        timestep, either split between processors by
+        :meth:`compute_npart` or, with local injection, by the part of the
+        emitter overlapping each processor's boxes.
+
+        Arguments:
+            npart_total (int): Integer number of total particles to insert this
+                timestep.
+
+        Returns:
+            npart (int): Integer number of total particles for this processor
+                to insert this timestep.
+        """
+        if self.local_injection:
+            return self.emitter.compute_local_npart(npart_total)
+
+        return self.compute_npart(
+            npart_total=npart_total, unique_particles=self.unique_particles
+        )
+
+    def _get_npart_total(self):
+        """Return the total number of particles to inject at the next
+        injection. Must be implemented by injectors using
+        :meth:`get_particle_batch`."""
+        raise NotImplementedError
+
+    def _sample_particles(self, npart, rseed, regions):
+        """Sample a batch of particles without anything depending on the
+        simulation state; runs in the worker thread when prefetching. See
+        :meth:`mewarpx.emission.BaseEmitter.sample_particles`."""
+        return self.emitter.sample_particles(
+            npart=npart, w=self.weight, m=self.species.sm, rseed=rseed,
+            regions=regions
+        )
+
+    def _submit_batch(self):
+        """Start sampling the batch for the next injection in the background.
+        Everything needing the main thread (processor counts, local regions
+        and the seed) is computed here."""
+        npart = self.compute_injection_npart(self._get_npart_total())
+        regions = None
+        if self.local_injection:
+            regions = self.emitter.get_local_regions()[:2]
+        rseed = self.rseed
+        if rseed is None:
+            rseed = mwxrng.get_seed("prefetch_" + self.name)
+        self.prefetcher.submit(self._sample_particles, npart, rseed, regions)
+
+    def get_particle_batch(self):
+        """Return the particle dict to inject this step.
+
+        If prefetching, the batch sampled in the background since the last
+        injection is collected and finished here with the quantities that
+        depend on the simulation state (variable weights and E_total), and
+        sampling of the next batch is started.
+        """
+        # TODO randomdt and velhalfstep are False simply because they're
+        # not supported at present
+        if self.prefetcher is None:
+            npart = self.compute_injection_npart(self._get_npart_total())
+            return self.emitter.get_newparticles(
+                npart=npart, w=self.weight,
+                q=self.species.sq, m=self.species.sm,
+                rseed=self.rseed,
+                randomdt=False, velhalfstep=False,
+                local=self.local_injection
+            )
+
+        if not self.prefetcher.pending:
+            self._submit_batch()
+        particles_dict = self.prefetcher.collect()
+        self._submit_batch()
+
+        return self.emitter.get_newparticles(
+            npart=len(particles_dict['x']), w=self.weight,
+            q=self.species.sq, m=self.species.sm,
+            randomdt=False, velhalfstep=False,
+            particles_dict=particles_dict
+        )
+
+    def _check_local_injection(self):
+        """Raise an error if local injection is requested for particles that
+        are not unique."""
+        if self.local_injection and not self.unique_particles:
+            raise ValueError(
+                "local_injection requires unique_particles=True, since each "
+                "processor injects a different set of particles."
+            )
+
     def getvoltage_e(self):
         """Return the electrical voltage of the injector. Defaults to returning
         0, unless an emitter is associated with this injector (it should be) in
@@ -102,17 +255,22 @@ class Injector(object):
         return 0.
 
     def init_injectedparticles(self, fieldlist):
-        """Set up the injected particles array. Call before
+        """Register this injector with the shared flux ledger. Call before
         append_injectedparticles.
 
         Arguments:
             fieldlist (list): List of string titles for the fields. Order is
                 important; it must match the order for future particle appends
-                that are made.
+                that are made, and the fields of
+                :class:`mewarpx.diags_store.flux_ledger.FluxLedger`.
         """
+        if list(fieldlist) != flux_ledger.fields:
+            raise ValueError(
+                f"Injected particle fields {fieldlist} do not match the flux "
+                f"ledger fields {flux_ledger.fields}."
+            )
         self._injectedparticles_fields = fieldlist
-        self._injectedparticles_data = appendablearray.AppendableArray(
-            typecode='d', unitshape=[len(fieldlist)])
+        self._ledger_id = flux_ledger.register()
 
     def record_injectedparticles(self, species, w=0, E_total=None,
                                  n=None):
@@ -123,9 +281,9 @@ class Injector(object):
         Note:
             Assumes the fixed form of fields given in Injector().  Doesn't
             check since this is called many times.
-            Since a parallelsum is performed on ``_injectedparticles_data``
-            when calling ``get_injectedparticles``, this function has to be
-            called by all processors. Call this function with only the species
+            Since the flux ledger is summed over processors when calling
+            ``get_injectedparticles``, this function has to be called by all
+            processors. Call this function with only the species
             argument if no particles are being added by this processor.
 
         Arguments:
@@ -173,7 +331,7 @@ class Injector(object):
             data (np.ndarray): Array of shape (m) or (n, m) where m is the
                 number of fields and n is the number of rows of data to append.
         """
-        self._injectedparticles_data.append(data)
+        flux_ledger.append(self._ledger_id, data)
 
     def get_injectedparticles(self, clear=False):
         """Retrieve a copy of injectedparticles data.
@@ -187,19 +345,9 @@ class Injector(object):
                 originally passed field strings for lost particles. Values are
                 an (n)-shape numpy array for each field.
         """
-        lpdata = self._injectedparticles_data.data()
-
-        # Sum all except t/step/species_id/V_e from all processors
-        lpdata[:,4:] = parallel_util.parallelsum(np.array(lpdata[:,4:]))
-
-        lpdict = collections.OrderedDict(
-            [(fieldname, np.array(lpdata[:, ii], copy=True))
-             for ii, fieldname in enumerate(self._injectedparticles_fields)])
-
-        if clear:
-            self._injectedparticles_data.cleardata()
-
-        return lpdict
+        # n/q/E_total of all injectors and surfaces are summed over
+        # processors together, at most once per diagnostic period
+        return flux_ledger.get_rows(self._ledger_id, clear=clear)
 
 
 class FixedNumberInjector(Injector):
@@ -209,7 +357,8 @@ class FixedNumberInjector(Injector):
     def __init__(self, emitter, species, npart,
                  injectfreq=None, injectoffset=1,
                  weight=0., rseed=None,
-                 name=None, unique_particles=True):
+                 name=None, unique_particles=True, local_injection=False,
+                 prefetch=False):
         """Sets up user-specified injection with fixed timestep and weights.
 
         Arguments:
@@ -230,6 +379,13 @@ class FixedNumberInjector(Injector):
             unique_particles (bool): Whether WarpX will keep all particles
                 given it from every processor (True) or keep only a fraction of
                 particles based on processor count (False).
+            local_injection (bool): If True, each processor only injects
+                particles on the part of the emitter overlapping its own
+                boxes, so the injected particles never need to be
+                redistributed. Requires unique_particles. Default False.
+            prefetch (bool): If True, sample each batch of particles in a
+                background thread during the steps before its injection.
+                Default False.
         """
         # Save class parameters
         self.emitter = emitter
@@ -245,6 +401,10 @@ class FixedNumberInjector(Injector):
         if self.name is None:
             self.name = "fixed_injector_" + self.species.name
         self.unique_particles = unique_particles
+        self.local_injection = local_injection
+        self._check_local_injection()
+        if prefetch:
+            self.prefetcher = ParticlePrefetcher()
 
         logger.info(
             f"Fixed injection of {self.npart_total} particles, "
@@ -261,20 +421,7 @@ class FixedNumberInjector(Injector):
         effective_it = mwxrun.get_it() - self.injectoffset
         if effective_it >= 0 and effective_it % self.injectfreq == 0:
 
-            # Adjust npart for processor number if needed
-            npart = self.compute_npart(
-                npart_total=self.npart_total,
-                unique_particles=self.unique_particles
-            )
-
-            # TODO randomdt and velhalfstep are False simply because they're
-            # not supported at present
-            particles_dict = self.emitter.get_newparticles(
-                npart=npart, w=self.weight,
-                q=self.species.sq, m=self.species.sm,
-                rseed=self.rseed,
-                randomdt=False, velhalfstep=False
-            )
+            particles_dict = self.get_particle_batch()
 
             logger.info(f"Inject {len(particles_dict['x'])} particles")
 
@@ -302,6 +449,10 @@ class FixedNumberInjector(Injector):
                     E_total=particles_dict['E_total'],
                 )
 
+    def _get_npart_total(self):
+        """Return the fixed number of particles to inject."""
+        return self.npart_total
+
 
 class ThermionicInjector(Injector):
 
@@ -311,7 +462,8 @@ class ThermionicInjector(Injector):
                  WF=None, A=constants.A0*1e4, use_Schottky=True,
                  allow_poisson=False, wfac=1.0,
                  name=None, profile_decorator=None,
-                 unique_particles=True):
+                 unique_particles=True, local_injection=False,
+                 prefetch=False):
         """Sets up user-specified injection for warpX.
 
         Arguments:
@@ -346,6 +498,13 @@ class ThermionicInjector(Injector):
             unique_particles (bool): Whether WarpX will keep all particles
                 given it from every processor (True) or keep only a fraction of
                 particles based on processor count (False). Default True.
+            local_injection (bool): If True, each processor only injects
+                particles on the part of the emitter overlapping its own
+                boxes, so the injected particles never need to be
+                redistributed. Requires unique_particles. Default False.
+            prefetch (bool): If True, sample the particles (and their surface
+                normals) for the next step in a background thread while WarpX
+                advances the current step. Default False.
         """
         # sanity check species
         if species.particle_type != 'electron':
@@ -380,6 +539,10 @@ class ThermionicInjector(Injector):
         if self.name is None:
             self.name = "thermionic_injector_" + self.species.name
         self.unique_particles = unique_particles
+        self.local_injection = local_injection
+        self._check_local_injection()
+        if prefetch:
+            self.prefetcher = ParticlePrefetcher()
 
         area = self.emitter.area
         dt = mwxrun.get_dt()
@@ -439,62 +602,81 @@ class ThermionicInjector(Injector):
         self.injection_species.add_pid("E_total")
 
         if self.use_Schottky:
-            # add PIDs to hold the normal vector
-            # TODO work out a better way to handle these PIDs since this is not
-            # a great use of memory
-            self.species.add_pid("norm_x")
-            self.species.add_pid("norm_y")
-            self.species.add_pid("norm_z")
-            self.injection_species.add_pid("norm_x")
-            self.injection_species.add_pid("norm_y")
-            self.injection_species.add_pid("norm_z")
-
-    def inject_particles(self):
-        """Perform the actual injection!"""
-        if self.poisson:
-            num_injections = np.random.poisson(self.ptcl_per_step)
+            # add a PID holding the index of the surface normal of each
+            # particle in the table passed to WarpX. Only the temporary
+            # injection species needs it; it is dropped when particles are
+            # moved to the real species.
+            self.injection_species.add_pid("norm_id")
+
+    def _get_npart_total(self):
+        """Return the number of particles to inject, drawn from a Poisson
+        distribution if needed."""
+        if not self.poisson:
+            return self.ptcl_per_step
+
+        # With local injection every processor needs the same total to
+        # split between them.
+        if self.local_injection:
+            rng = mwxrng.shared_generator("injection")
         else:
-            num_injections = self.ptcl_per_step
+            rng = mwxrng.get_generator("injection")
+        return rng.poisson(self.ptcl_per_step)
 
-        # Adjust npart for processor number if needed
-        npart = self.compute_npart(
-            npart_total=num_injections,
-            unique_particles=self.unique_particles
+    def _sample_particles(self, npart, rseed, regions):
+        """Also compute the surface normals in the worker thread when
+        prefetching, since they only depend on the sampled positions."""
+        particles_dict = super()._sample_particles(npart, rseed, regions)
+        if self.use_Schottky:
+            self._add_normal_ids(particles_dict)
+        return particles_dict
+
+    def _add_normal_ids(self, particles_dict):
+        """Add the table of surface normals and the index of each particle's
+        normal in it to the particle dict."""
+        normal_table, normal_ids = self.emitter.get_normal_ids(
+            particles_dict['x'], particles_dict['y'], particles_dict['z']
         )
+        particles_dict['normal_table'] = normal_table
+        particles_dict['normal_ids'] = normal_ids
 
-        # TODO randomdt and velhalfstep are False simply because they're
-        # not supported at present
-        particles_dict = self.emitter.get_newparticles(
-            npart=npart, w=self.weight, q=self.species.sq, m=self.species.sm,
-            randomdt=False, velhalfstep=False
-        )
+    def inject_particles(self):
+        """Perform the actual injection!"""
+        particles_dict = self.get_particle_batch()
+        npart = len(particles_dict['x'])
+
+        # The injection handle caches the species component layout and
+        # reuses its staging buffers from step to step. It can only be built
+        # once WarpX is initialized, so create it on the first injection.
+        if self.particle_injector is None:
+            extra_comps = ['E_total']
+            if self.use_Schottky:
+                extra_comps += ['norm_id']
+            self.particle_injector = mwxrun.sim_ext.particle_injector(
+                self.injection_species.name, extra_comps=extra_comps,
+                unique_particles=self.unique_particles
+            )
 
-        extra_pids = {}
-        extra_pids['E_total'] = particles_dict['E_total']
-        extra_pids['w'] = particles_dict['w']
+        self.particle_injector.stage(len(particles_dict['x']))
+        self.particle_injector['w'][:] = particles_dict['w']
+        self.particle_injector['E_total'][:] = particles_dict['E_total']
         if self.use_Schottky:
-            # Determine the local surface normal for each particle
-            normal_vectors = self.emitter.get_normals(
-                particles_dict['x'], particles_dict['y'], particles_dict['z']
-            )
-            extra_pids['norm_x'] = normal_vectors[:, 0]
-            extra_pids['norm_y'] = normal_vectors[:, 1]
-            extra_pids['norm_z'] = normal_vectors[:, 2]
+            # Determine the local surface normal for each particle, unless
+            # that was already done while prefetching
+            if 'normal_ids' not in particles_dict:
+                self._add_normal_ids(particles_dict)
+            self.particle_injector['norm_id'][:] = particles_dict['normal_ids']
 
         # Note some parts of WarpX call the variables ux and some parts vx,
         # and they're referred to as momenta. But I don't see anywhere
         # they're actually used as momenta including the particle mass -
         # the actual update is in Source/Particles/Pusher/UpdatePosition.H
-        mwxrun.sim_ext.add_particles(
-            self.injection_species.name,
+        self.particle_injector.inject(
             x=particles_dict['x'],
             y=particles_dict['y'],
             z=particles_dict['z'],
             ux=particles_dict['vx'],
             uy=particles_dict['vy'],
             uz=particles_dict['vz'],
-            unique_particles=self.unique_particles,
-            **extra_pids
         )
 
         if self.use_Schottky:
@@ -504,37 +686,17 @@ class ThermionicInjector(Injector):
                 np.sqrt(constants.e / (4.0 * np.pi * constants.epsilon_0))
                 / (constants.kb_eV * self.emitter.T)
             )
-            mwxrun.calc_Schottky_weight(
-                self.injection_species.name, pre_fac
-            )
 
-            # get the total injected weight and energy
-            total_weight = 0.
-            total_energy = 0.
-            npart = 0
-            weight_arrays = mwxrun.sim_ext.get_particle_arrays(
-                self.injection_species.name, 'w', 0
-            )
-            ux_arrays = mwxrun.sim_ext.get_particle_arrays(
-                self.injection_species.name, 'ux', 0
-            )
-            uy_arrays = mwxrun.sim_ext.get_particle_arrays(
-                self.injection_species.name, 'uy', 0
-            )
-            uz_arrays = mwxrun.sim_ext.get_particle_arrays(
-                self.injection_species.name, 'uz', 0
-            )
-            for ii, w in enumerate(weight_arrays):
-                npart += len(w)
-                total_weight += np.sum(w)
-                total_energy += np.sum(self.emitter._get_E_total(
-                    ux_arrays[ii], uy_arrays[ii], uz_arrays[ii],
-                    constants.e, constants.m_e, w
-                ))
-
-            # Move particles from temporary container to "real" container
-            mwxrun.move_particles_between_species(
-                self.injection_species.name, self.species.name
+            # Apply the enhancement, sum the injected weight and energy, and
+            # move the particles from the temporary container to the "real"
+            # container, all in one pass over the particles
+            npart, total_weight, total_energy = (
+                mwxrun.inject_Schottky_particles(
+                    self.injection_species.name, self.species.name, pre_fac,
+                    normal_table=particles_dict['normal_table'],
+                    m=constants.m_e,
+                    qV=constants.e * self.emitter.getvoltage()
+                )
             )
         else:
             total_weight = np.sum(particles_dict['w'])
@@ -552,8 +714,8 @@ class ThermionicInjector(Injector):
 class PlasmaInjector(Injector):
 
     """Inject particles at simulation start, or at regular timesteps, to
-    seed a plasma. Can use any emitter object. The defining feature is that the
-    2nd species positions and weights are copied from the first species, so the
+    seed a plasma. Can use any emitter object. The defining feature is that all
+    species share the positions and weights of the first species, so the
     spatial distribution is always identical to start. Velocities are
     independent, however.
     """
@@ -562,9 +724,11 @@ class PlasmaInjector(Injector):
                  plasma_density=None, ionization_frac=None,
                  P_neutral=None, T_neutral=None,
                  injectfreq=None, injectoffset=1,
-                 rseed=None, name=None, unique_particles=True
+                 rseed=None, name=None, unique_particles=True,
+                 extra_species=None, extra_T=None
                  ):
-        """Initialize injection of a plasma with two species and given emitter.
+        """Initialize injection of a plasma with two or more species and given
+        emitter.
 
         Arguments:
             emitter (:class:`mewarpx.emission.BaseEmitter`): BaseEmitter object
@@ -599,13 +763,30 @@ class PlasmaInjector(Injector):
             unique_particles (bool): Whether WarpX will keep all particles
                 given it from every processor (True) or keep only a fraction of
                 particles based on processor count (False). Default True.
+            extra_species (list of :class:`mewarpx.mespecies.Species`): Any
+                further species to inject at the same positions, eg other ion
+                species.
+            extra_T (list of floats): If specified, the temperature of each of
+                the extra_species. None entries use the emitter temperature.
         """
         # Save class parameters
         self.emitter = emitter
-        self.npart_per_species = npart // 2
         self.species1 = species1
         self.species2 = species2
         self.T_2 = T_2
+        self.species_list = [species1, species2]
+        self.T_list = [None, T_2]
+        if extra_species is not None:
+            self.species_list += list(extra_species)
+            if extra_T is None:
+                extra_T = [None] * len(extra_species)
+            if len(extra_T) != len(extra_species):
+                raise ValueError(
+                    "extra_T must give a temperature for each of the "
+                    "extra_species."
+                )
+            self.T_list += list(extra_T)
+        self.npart_per_species = npart // len(self.species_list)
         if injectfreq is None:
             injectfreq = np.inf
         self.injectfreq = injectfreq
@@ -623,17 +804,18 @@ class PlasmaInjector(Injector):
                 T_neutral=T_neutral,
             )
 
+        species_names = [species.name for species in self.species_list]
         self.name = name
         if self.name is None:
-            self.name = (
-                f"plasma_injector_{self.species1.name}_{self.species2.name}"
-            )
+            self.name = "plasma_injector_" + "_".join(species_names)
         self.unique_particles = unique_particles
+        # handles used to add particles to WarpX, created on first injection
+        self.particle_injectors = None
 
         logger.info(
             f"Plasma injection {self.name}: "
-            f"{self.npart_per_species} particles each of {self.species1.name} "
-            f"and {self.species2.name}, every {self.injectfreq} timesteps,"
+            f"{self.npart_per_species} particles each of "
+            f"{', '.join(species_names)}, every {self.injectfreq} timesteps,"
         )
 
         # Surface emission
@@ -674,8 +856,8 @@ class PlasmaInjector(Injector):
         callbacks.installparticleinjection(self.inject_particles)
 
         # add E_total PID to the species involved
-        self.species1.add_pid("E_total")
-        self.species2.add_pid("E_total")
+        for species in self.species_list:
+            species.add_pid("E_total")
 
     def _calc_plasma_density(self, plasma_density, ionization_frac, P_neutral,
                              T_neutral):
@@ -711,73 +893,141 @@ class PlasmaInjector(Injector):
                 unique_particles=self.unique_particles
             )
 
+            # Positions and weights are sampled once for all species; only
+            # the velocities differ.
             # TODO randomdt and velhalfstep are False simply because they're
             # not supported at present
-            particles1_dict = self.emitter.get_newparticles(
-                npart=npart, w=self.weight, q=self.species1.sq,
-                m=self.species1.sm, rseed=self.rseed,
-                randomdt=False, velhalfstep=False
-            )
-
-            # if requested get particles for species2 at the specified
-            # temperature
-            if self.T_2 is not None:
-                T_temp, self.emitter.T = self.emitter.T, self.T_2
-
-            # TODO randomdt and velhalfstep are False simply because they're
-            # not supported at present
-            particles2_dict = self.emitter.get_newparticles(
-                npart=npart, w=self.weight, q=self.species2.sq,
-                m=self.species2.sm, rseed=self.rseed,
-                randomdt=False, velhalfstep=False
+            particle_dicts = self.emitter.get_newparticles_multi(
+                npart=npart, w=self.weight,
+                species_params=[
+                    (species.sq, species.sm, T)
+                    for species, T in zip(self.species_list, self.T_list)
+                ],
+                rseed=self.rseed, randomdt=False, velhalfstep=False
             )
-            if self.T_2 is not None:
-                self.emitter.T = T_temp
-
-            for key in ['x', 'y', 'z', 'w']:
-                particles2_dict[key] = particles1_dict[key]
 
             logger.info(
-                f"Inject {len(particles1_dict['x'])} particles each of "
-                f"{self.species1.name} and {self.species2.name}."
-            )
-            mwxrun.sim_ext.add_particles(
-                self.species1.name,
-                x=particles1_dict['x'],
-                y=particles1_dict['y'],
-                z=particles1_dict['z'],
-                ux=particles1_dict['vx'],
-                uy=particles1_dict['vy'],
-                uz=particles1_dict['vz'],
-                w=particles1_dict['w'],
-                E_total=particles1_dict['E_total'],
-                unique_particles=self.unique_particles
-            )
-            mwxrun.sim_ext.add_particles(
-                self.species2.name,
-                x=particles2_dict['x'],
-                y=particles2_dict['y'],
-                z=particles2_dict['z'],
-                ux=particles2_dict['vx'],
-                uy=particles2_dict['vy'],
-                uz=particles2_dict['vz'],
-                w=particles2_dict['w'],
-                E_total=particles2_dict['E_total'],
-                unique_particles=self.unique_particles
+                f"Inject {len(particle_dicts[0]['x'])} particles each of "
+                f"{', '.join(species.name for species in self.species_list)}."
             )
 
+            # The injection handles cache the component layout of each species
+            # and reuse their staging buffers between injections. They can
+            # only be built once WarpX is initialized.
+            if self.particle_injectors is None:
+                self.particle_injectors = [
+                    mwxrun.sim_ext.particle_injector(
+                        species.name, extra_comps=['E_total'],
+                        unique_particles=self.unique_particles
+                    )
+                    for species in self.species_list
+                ]
+
+            for particle_injector, particles_dict in zip(
+                    self.particle_injectors, particle_dicts):
+                particle_injector.inject(
+                    x=particles_dict['x'],
+                    y=particles_dict['y'],
+                    z=particles_dict['z'],
+                    ux=particles_dict['vx'],
+                    uy=particles_dict['vy'],
+                    uz=particles_dict['vz'],
+                    w=particles_dict['w'],
+                    E_total=particles_dict['E_total'],
+                )
+
             if self.injector_diag is not None:
-                self.record_injectedparticles(
-                    species=self.species1,
-                    w=particles1_dict['w'],
-                    E_total=particles1_dict['E_total'],
+                for species, particles_dict in zip(
+                        self.species_list, particle_dicts):
+                    self.record_injectedparticles(
+                        species=species,
+                        w=particles_dict['w'],
+                        E_total=particles_dict['E_total'],
+                    )
 
-                )
-                self.record_injectedparticles(
-                    species=self.species2,
-                    w=particles2_dict['w'],
-                    E_total=particles2_dict['E_total'],
-                )
+
+def _owns_position(pos, lims, domain_lims):
+    """Return whether a position belongs to a box with the given limits.
+
+    Boxes own the half-open interval [lo, hi), except that the box at the upper
+    edge of the domain also owns its upper limit, so every position is owned by
+    exactly one box. A small tolerance makes the result robust to round-off in
+    the box limits.
+
+    Arguments:
+        pos (float or np.ndarray): Position(s) along one axis.
+        lims (np.ndarray): Lower and upper limit of the box along the axis.
+        domain_lims (list): Lower and upper limit of the domain along the axis.
+
+    Returns:
+        owned (bool or np.ndarray): True where the position is owned.
+    """
+    lo, hi = lims
+    if np.isinf(lo) and np.isinf(hi):
+        return np.ones_like(pos, dtype=bool)
+
+    tol = 1e-9 * (domain_lims[1] - domain_lims[0])
+    if np.isclose(lo, domain_lims[0], rtol=0, atol=tol):
+        lo = -np.inf
+    if np.isclose(hi, domain_lims[1], rtol=0, atol=tol):
+        hi = np.inf
+    return (pos >= lo - tol) & (pos < hi - tol)
+
+
+@numba.jit(nopython=True)
+def _build_alias_table(weights):
+    """Build a table for drawing indices with probabilities proportional to
+    weights in constant time per draw (Vose's alias method).
+
+    Arguments:
+        weights (np.ndarray): n-length array of non-negative weights.
+
+    Returns:
+        prob (np.ndarray): n-length array with the probability of keeping
+            each index once it is drawn uniformly.
+        alias (np.ndarray): n-length integer array with the index used
+            instead otherwise.
+    """
+    n = weights.shape[0]
+    scaled = weights * n / np.sum(weights)
+    prob = np.ones(n)
+    alias = np.arange(n)
+
+    small = np.empty(n, dtype=np.int64)
+    large = np.empty(n, dtype=np.int64)
+    nsmall = 0
+    nlarge = 0
+    for ii in range(n):
+        if scaled[ii] < 1.0:
+            small[nsmall] = ii
+            nsmall += 1
+        else:
+            large[nlarge] = ii
+            nlarge += 1
+
+    while nsmall > 0 and nlarge > 0:
+        nsmall -= 1
+        ss = small[nsmall]
+        ll = large[nlarge - 1]
+        prob[ss] = scaled[ss]
+        alias[ss] = ll
+        scaled[ll] -= 1.0 - scaled[ss]
+        if scaled[ll] < 1.0:
+            nlarge -= 1
+            small[nsmall] = ll
+            nsmall += 1
+
+    # Whatever is left has probability 1 up to rounding errors
+    return prob, alias
+
+
+def _draw_alias(alias_table, rng, npart):
+    """Draw npart indices from a table built by :func:`_build_alias_table`,
+    using one uniform random number per index."""
+    prob, alias = alias_table
+    u = rng.random(npart) * len(prob)
+    idx = np.minimum(u.astype(np.int64), len(prob) - 1)
+    return np.where(u - idx < prob[idx], idx, alias[idx])
 
 
 class BaseEmitter(object):
@@ -803,6 +1053,15 @@ class BaseEmitter(object):
     _wfnlist = None
     # Needs to be overridden to specify acceptable geometries
     geoms = []
+    # (layout version, regions, measures, processor fractions) used for local
+    # injection, see get_local_regions()
+    _local_regions = None
+    # If True, _get_v_coords() samples only velocities for further species in
+    # get_newparticles_multi(). Otherwise a full draw of _get_xv_coords() is
+    # made and the positions are discarded. Subclasses overriding
+    # _get_xv_coords() with their own velocity distribution must leave this
+    # False.
+    supports_velocity_only_draw = False
 
     def __init__(self):
         """Check geometry and any other universal initialization.
@@ -884,7 +1143,8 @@ class BaseEmitter(object):
         return E_total
 
     def get_newparticles(self, npart, w, q, m, rseed=None,
-                         randomdt=True, velhalfstep=True):
+                         randomdt=True, velhalfstep=True, local=False,
+                         particles_dict=None):
         """Return dict with coordinates, velocities, and KE
 
         Note:
@@ -902,13 +1162,21 @@ class BaseEmitter(object):
                 electron mass if not otherwise specified.
             rseed (int): Random seed, if specified, can be used to provide
                 reproducible results. Typically used for test / not production
-                runs.
+                runs. Independent child seeds are derived from it for the
+                coordinates and the random time advance.
             randomdt (bool): If True, move each particle ahead a random delta t
                 in [0, dt), advancing both position and velocity together.
                 Default True.
             velhalfstep (bool): If True, push the velocities a negative
                 half-step using the E-field. Aligns position and velocities
                 correctly for the leapfrog algorithm.
+            local (bool): If True, only sample the part of the emitter that
+                overlaps the boxes owned by this processor. npart should then
+                come from :meth:`compute_local_npart`. Default False.
+            particles_dict (dict): A batch already sampled by
+                :meth:`sample_particles`, e.g. in a background thread. If
+                given, only the quantities depending on the simulation state
+                are added to it; npart and local are ignored.
 
         Returns:
             particle_dict (dict): Contains lists, each with length equal to the
@@ -920,26 +1188,133 @@ class BaseEmitter(object):
                   & potential.
                 - ``w`` contains particle weights.
         """
-        if rseed is not None:
-            nprstate = np.random.get_state()
-            np.random.seed(rseed)
-            rseedxv = np.random.randint(1000000000)
-            rseedt = np.random.randint(1000000000)
+        rseedxv, rseedt = mwxrng.spawn_seeds(rseed, 2)
+
+        if particles_dict is None:
+            regions = None
+            if local:
+                regions = self.get_local_regions()[:2]
+            particle_dict = self.sample_particles(
+                npart=npart, w=w, m=m, rseed=rseedxv, regions=regions
+            )
         else:
-            rseedxv = None
-            rseedt = None
+            particle_dict = particles_dict
+
+        if self._wfnlist is not None:
+            for wfn in self._wfnlist:
+                particle_dict['w'] = wfn(particle_dict)
 
-        x, y, z, vx, vy, vz = self._get_xv_coords(
-            npart=npart, m=m, rseed=rseedxv
+        return self._finish_particles(
+            particle_dict, q=q, m=m, rseed=rseedt, randomdt=randomdt,
+            velhalfstep=velhalfstep
         )
-        particle_dict = self._gen_particle_dict(
-            x=x, y=y, z=z, vx=vx, vy=vy, vz=vz, w=w
+
+    def get_newparticles_multi(self, npart, w, species_params, rseed=None,
+                               randomdt=True, velhalfstep=True, local=False):
+        """Return dicts of new particles for several species sharing the same
+        positions and weights. The positions and weights are sampled once;
+        only the velocities are sampled separately for each species, at its
+        own temperature and mass. Unless the emitter sets
+        ``supports_velocity_only_draw`` and a seed is given (here or with
+        ``mwxrng.set_seed``), the velocities of each further species come
+        from a full draw of positions and velocities, in the same order as
+        separate :meth:`get_newparticles` calls.
+
+        Note:
+            The weight functions added with :meth:`add_wfn` are evaluated
+            once, on the batch of the first species.
+
+        Arguments:
+            npart (int): Number of particles of each species to inject
+            w (float): Weight of the particles
+            species_params (list): (q, m, T) tuple for each species, with the
+                charge, mass and temperature of its particles. If T is None
+                the emitter temperature is used.
+            rseed (int): Random seed, see :meth:`get_newparticles`. The first
+                species gets the same particles as from
+                :meth:`get_newparticles` with this seed.
+            randomdt (bool): See :meth:`get_newparticles`.
+            velhalfstep (bool): See :meth:`get_newparticles`.
+            local (bool): See :meth:`get_newparticles`.
+
+        Returns:
+            particle_dicts (list): A particle dict (see
+            :meth:`get_newparticles`) for each species. The weight arrays of
+            all species are the same object, and so are the position arrays
+            unless randomdt is True.
+        """
+        # The first two seeds match those of get_newparticles
+        seeds = mwxrng.spawn_seeds(rseed, 2*len(species_params))
+
+        # Without any seed the draws come from numpy's global random state.
+        # Make a full draw for each further species then, as separate
+        # get_newparticles() calls did, so results seeded with np.random.seed
+        # don't change.
+        velocity_only = self.supports_velocity_only_draw and not (
+            rseed is None and mwxrng.seed is None
         )
 
+        regions = None
+        if local:
+            regions = self.get_local_regions()[:2]
+        _, m, T = species_params[0]
+        with self._temperature(T):
+            particle_dict = self.sample_particles(
+                npart=npart, w=w, m=m, rseed=seeds[0], regions=regions
+            )
+
         if self._wfnlist is not None:
             for wfn in self._wfnlist:
                 particle_dict['w'] = wfn(particle_dict)
 
+        # Sample all velocities before any positions are advanced
+        particle_dicts = [particle_dict]
+        for ii, (_, m, T) in enumerate(species_params[1:], start=1):
+            with self._temperature(T):
+                if velocity_only:
+                    vx, vy, vz = self._get_v_coords(
+                        particle_dict['x'], particle_dict['y'],
+                        particle_dict['z'], m=m, rseed=seeds[2*ii]
+                    )
+                else:
+                    _, _, _, vx, vy, vz = self._get_xv_coords(
+                        npart=len(particle_dict['x']), m=m,
+                        rseed=seeds[2*ii]
+                    )
+            species_dict = {
+                key: particle_dict[key] for key in ['x', 'y', 'z', 'w']
+            }
+            if randomdt:
+                for key in ['x', 'y', 'z']:
+                    species_dict[key] = species_dict[key].copy()
+            species_dict.update(vx=vx, vy=vy, vz=vz)
+            particle_dicts.append(species_dict)
+
+        for ii, ((q, m, _), species_dict) in enumerate(
+                zip(species_params, particle_dicts)):
+            self._finish_particles(
+                species_dict, q=q, m=m, rseed=seeds[2*ii + 1],
+                randomdt=randomdt, velhalfstep=velhalfstep
+            )
+
+        return particle_dicts
+
+    @contextlib.contextmanager
+    def _temperature(self, T):
+        """Temporarily set the emitter temperature to T, if not None."""
+        if T is None:
+            yield
+            return
+        T_orig, self.T = self.T, T
+        try:
+            yield
+        finally:
+            self.T = T_orig
+
+    def _finish_particles(self, particle_dict, q, m, rseed, randomdt,
+                          velhalfstep):
+        """Add E_total to a sampled batch of particles and advance them, see
+        :meth:`get_newparticles`."""
         particle_dict['E_total'] = self._get_E_total(
             vx=particle_dict['vx'],
             vy=particle_dict['vy'],
@@ -952,7 +1327,7 @@ class BaseEmitter(object):
             self.particle_helper.advance_random_deltat(
                 particle_dict['x'], particle_dict['y'], particle_dict['z'],
                 particle_dict['vx'], particle_dict['vy'], particle_dict['vz'],
-                q=q, m=m, rseed=rseedt
+                q=q, m=m, rseed=rseed
             )
 
         if velhalfstep:
@@ -962,11 +1337,41 @@ class BaseEmitter(object):
                 q=q, m=m
             )
 
-        if rseed is not None:
-            np.random.set_state(nprstate)
-
         return particle_dict
 
+    def sample_particles(self, npart, w, m, rseed=None, regions=None):
+        """Return dict with coordinates, velocities and weights of new
+        particles. Nothing depending on the simulation state (such as the
+        variable weights or E_total) is computed, so this can run outside the
+        main thread; see :meth:`get_newparticles` for the full particle data.
+
+        Arguments:
+            npart (int): Total number of particles to sample
+            w (float): Weight of the particles
+            m (float): Mass of the particles, usually species.sm.
+            rseed (int or np.random.SeedSequence): Random seed, see
+                :meth:`get_newparticles`.
+            regions (tuple): (regions, measures) as returned by
+                :meth:`get_local_regions` to only sample those parts of the
+                emitter. Default None to sample the whole emitter.
+
+        Returns:
+            particle_dict (dict): Contains ``x``, ``y``, ``z``, ``vx``,
+            ``vy``, ``vz`` and ``w`` arrays.
+        """
+        if regions is None:
+            x, y, z, vx, vy, vz = self._get_xv_coords(
+                npart=npart, m=m, rseed=rseed
+            )
+        else:
+            x, y, z, vx, vy, vz = self._get_local_xv_coords(
+                npart, m, rseed, *regions
+            )
+
+        return self._gen_particle_dict(
+            x=x, y=y, z=z, vx=vx, vy=vy, vz=vz, w=w
+        )
+
     def _update_params(self):
         """Update local parameters if needed based on WarpX settings.
         By default does nothing, but subclasses can implement it to update
@@ -985,6 +1390,115 @@ class BaseEmitter(object):
         raise NotImplementedError(
             "BaseEmitter subclasses must implement _get_xv_coords")
 
+    def _get_v_coords(self, x, y, z, m, rseed):
+        """Per-subclass implementation of sampling only the velocities of new
+        particles at the given positions, used by emitters that set
+        ``supports_velocity_only_draw``.
+
+        Returns:
+            vx, vy, vz (np.array): Each must be a 1D numpy array.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support velocity only draws")
+
+    def get_local_regions(self):
+        """Return the parts of the emitter overlapping this processor's boxes.
+        The result is cached until the box layout changes.
+
+        Returns:
+            regions (list): Subclass-specific description of each part, passed
+                to ``_get_xv_coords_region()``.
+            measures (np.ndarray): Area (or volume) of each part.
+            fractions (np.ndarray): Fraction of the total emitter area (or
+                volume) overlapping the boxes of each processor.
+        """
+        version = mwxrun.sim_ext.get_layout_version()
+        if (self._local_regions is None
+                or self._local_regions[0] != version):
+            regions, measures = self._get_local_regions(
+                mwxrun.get_local_box_bounds()
+            )
+            measures = np.array(measures, dtype=float)
+            rank_measures = np.array(
+                parallel_util.comm_world.allgather(np.sum(measures))
+            )
+            total_measure = np.sum(rank_measures)
+            # Note the negation here will catch nans, checking <= 0 won't.
+            if not (total_measure > 0):
+                raise RuntimeError(
+                    "Emitter does not overlap the simulation domain."
+                )
+            self._local_regions = (
+                version, regions, measures, rank_measures / total_measure
+            )
+
+        return self._local_regions[1:]
+
+    def compute_local_npart(self, npart_total):
+        """Compute the number of particles this processor injects when each
+        processor only injects on its own part of the emitter. The total is
+        split between processors by a multinomial draw weighted by the area
+        (or volume) of the emitter overlapping each processor's boxes. The
+        draw is made identically on every processor, so this must be called
+        by all processors.
+
+        Arguments:
+            npart_total (int): Integer number of total particles to insert this
+                timestep.
+
+        Returns:
+            npart (int): Integer number of particles for this processor to
+                insert this timestep.
+        """
+        fractions = self.get_local_regions()[2]
+        counts = mwxrng.shared_generator("local_injection").multinomial(
+            npart_total, fractions
+        )
+        return counts[mwxrun.me]
+
+    def _get_local_regions(self, box_bounds):
+        """Per-subclass implementation of splitting the emitter into the parts
+        overlapping the given boxes. Each position on the emitter must belong
+        to at most one part, see :func:`_owns_position`.
+
+        Arguments:
+            box_bounds (np.ndarray): Box limits, see
+                :meth:`mewarpx.mwxrun.MEWarpXRun.get_local_box_bounds`.
+
+        Returns:
+            regions (list): Description of each part.
+            measures (list): Area (or volume) of each part.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support local injection")
+
+    def _get_xv_coords_region(self, npart, m, rng, region):
+        """Per-subclass implementation of generating new particle data in one
+        part of the emitter, as returned by ``_get_local_regions()``.
+
+        Returns:
+            x, y, z, vx, vy, vz (np.array): Each must be a 1D numpy array.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support local injection")
+
+    def _get_local_xv_coords(self, npart, m, rseed, regions, measures):
+        """Generate new particle data on the given parts of the emitter,
+        distributing particles between the parts according to their area (or
+        volume).
+        """
+        if npart == 0 or len(regions) == 0:
+            return tuple(np.zeros(0) for _ in range(6))
+
+        rng = mwxrng.get_generator("emission", rseed)
+        counts = rng.multinomial(npart, measures / np.sum(measures))
+        coords = [
+            self._get_xv_coords_region(n, m, rng, region)
+            for n, region in zip(counts, regions) if n > 0
+        ]
+
+        return tuple(np.concatenate(arrays) for arrays in zip(*coords))
+
     def add_wfn(self, wfn):
         """Add a variable weight function to the emitter.
 
@@ -1082,6 +1596,29 @@ class Emitter(BaseEmitter):
         raise NotImplementedError("Normal calculations must be implemented by "
                                   "Emitter sub-classes.")
 
+    def get_normal_ids(self, x, y, z):
+        """Calculate local surface normals at specified coordinates as a table
+        of distinct normals and the index of each particle's normal in it. This
+        is the compact form passed to WarpX for Schottky enhancement. By
+        default the distinct normals are found from :meth:`get_normals`;
+        sub-classes with tabulated normals can override this.
+
+        Arguments:
+            x (np.ndarray): x-coordinates of emitted particles (in meters).
+            y (np.ndarray): y-coordinates of emitted particles (in meters).
+            z (np.ndarray): z-coordinates of emitted particles (in meters).
+
+        Returns:
+            normal_table (np.ndarray): mx3 array of outward surface normals.
+            normal_ids (np.ndarray): n-length integer array with the row of
+                normal_table at each particle location.
+        """
+        normals = self.get_normals(x, y, z)
+        normal_table, normal_ids = np.unique(
+            normals, axis=0, return_inverse=True
+        )
+        return normal_table, normal_ids.ravel()
+
 
 class ZPlaneEmitter(Emitter):
     """This is the standard injection for a planar cathode."""
@@ -1153,30 +1690,53 @@ class ZPlaneEmitter(Emitter):
 
         See :func:`mewarpx.emission.BaseEmitter.get_newparticles` for details.
         """
-        if rseed is not None:
-            nprstate = np.random.get_state()
-            np.random.seed(rseed)
-            rseedv = np.random.randint(1000000000)
-            rseedx = np.random.randint(1000000000)
-        else:
-            rseedv = None
-            rseedx = None
+        rng = mwxrng.get_generator("emission", rseed)
+
+        return self._get_xv_coords_region(npart, m, rng, self.bounds)
+
+    def _get_local_regions(self, box_bounds):
+        """Split the emitter into rectangles [xmin, xmax, ymin, ymax], one for
+        each box containing the emitter plane."""
+        regions = []
+        measures = []
+        for box in box_bounds:
+            if not _owns_position(self.z, box[2], [mwxrun.zmin, mwxrun.zmax]):
+                continue
+            region = [
+                max(self.bounds[0], box[0, 0]), min(self.bounds[1], box[0, 1]),
+                max(self.bounds[2], box[1, 0]), min(self.bounds[3], box[1, 1])
+            ]
+            x_range = region[1] - region[0]
+            y_range = region[3] - region[2]
+            if x_range <= 0 or y_range <= 0:
+                continue
+
+            # Same conventions for unresolved directions as self.area
+            if self.solver_geom == 'Z':
+                measures.append(1.)
+            elif self.solver_geom == 'XZ':
+                measures.append(x_range)
+            else:
+                measures.append(x_range * y_range)
+            regions.append(region)
 
+        return regions, measures
+
+    def _get_xv_coords_region(self, npart, m, rng, region):
+        """Get particle coordinates on the rectangle region = [xmin, xmax,
+        ymin, ymax] of the emitter."""
         vx, vy, vz = mwxutil.get_velocities(
             npart, self.T, m=m, transverse_fac=self.transverse_fac,
-            emission_type=self.emission_type, rseed=rseedv)
+            emission_type=self.emission_type, rng=rng)
         x, y, z = mwxutil.get_positions(
-            npart, xmin=self.bounds[0], xmax=self.bounds[1],
-            ymin=self.bounds[2], ymax=self.bounds[3], z=self.z,
-            rseed=rseedx)
+            npart, xmin=region[0], xmax=region[1],
+            ymin=region[2], ymax=region[3], z=self.z,
+            rng=rng)
 
         # Flip z velocities for anode emission. This appears to be faster than
         # an if statement for 10000 or fewer particles.
         vz = -self.zsign * vz
 
-        if rseed is not None:
-            np.random.set_state(nprstate)
-
         return x, y, z, vx, vy, vz
 
     def get_normals(self, x, y, z):
@@ -1195,6 +1755,11 @@ class ZPlaneEmitter(Emitter):
         normals[:, 2] = -self.zsign
         return normals
 
+    def get_normal_ids(self, x, y, z):
+        """All particles share the normal of the plane, see
+        :meth:`mewarpx.emission.Emitter.get_normal_ids`."""
+        return self.get_normals([0.], [0.], [0.]), np.zeros(len(x), dtype=int)
+
 
 class ZPlanePatchyEmitter(object):
     """Injection for a patchy cathode."""
@@ -1261,21 +1826,38 @@ class ZPlanePatchSet(ZPlaneEmitter):
         """
         x, y, z, vx, vy, vz = super()._get_xv_coords(npart, m, rseed)
 
-        # move x to be centered on conductor.x_start (assumes
-        # ``ZPlanePatchyEmitter`` set the emitter up centered at x=0)
-        x += self.conductor.x_start
-
-        point = self.conductor.x_start + self.conductor.patch_size
-        while point < mwxrun.xmax:
-            x[np.where(x > point)] += self.conductor.patch_size
-            point += 2.0*self.conductor.patch_size
+        return self._map_to_patches(x), y, z, vx, vy, vz
 
-        point = self.conductor.x_start
-        while point > mwxrun.xmin:
-            x[np.where(x < point)] -= self.conductor.patch_size
-            point -= 2.0*self.conductor.patch_size
+    def _map_to_patches(self, x):
+        """Map x positions sampled from the emitter (centered on x=0, as set
+        up by ``ZPlanePatchyEmitter``) onto the patches of this set, which
+        start at conductor.x_start and repeat every 2*patch_size.
 
-        return x, y, z, vx, vy, vz
+        Positions are first centered on conductor.x_start; each patch
+        boundary in the domain that a position lies beyond (away from
+        x_start) then moves it one more patch size outwards, skipping the
+        patches of the other set. This is computed in closed form rather
+        than by looping over the patches.
+        """
+        patch_size = self.conductor.patch_size
+        x_start = self.conductor.x_start
+
+        # Number of patch boundaries in the domain above and below x_start
+        n_above = max(0, int(np.ceil(
+            (mwxrun.xmax - x_start - patch_size) / (2.0*patch_size)
+        )))
+        n_below = max(0, int(np.ceil(
+            (x_start - mwxrun.xmin) / (2.0*patch_size)
+        )))
+
+        shifts = np.clip(np.floor(x / patch_size), -n_below, n_above)
+        return x + x_start + shifts * patch_size
+
+    def _get_local_regions(self, box_bounds):
+        """The patches are mapped onto the cathode after sampling, so the
+        sampled rectangle does not correspond to the boxes."""
+        raise NotImplementedError(
+            "ZPlanePatchSet does not support local injection")
 
 
 class XPlaneEmitter(Emitter):
@@ -1368,33 +1950,54 @@ class XPlaneEmitter(Emitter):
 
         See :func:`mewarpx.emission.BaseEmitter.get_newparticles` for details.
         """
-        if rseed is not None:
-            nprstate = np.random.get_state()
-            np.random.seed(rseed)
-            rseedv = np.random.randint(1000000000)
-            rseedx = np.random.randint(1000000000)
-        else:
-            rseedv = None
-            rseedx = None
+        rng = mwxrng.get_generator("emission", rseed)
+
+        return self._get_xv_coords_region(npart, m, rng, self.bounds)
+
+    def _get_local_regions(self, box_bounds):
+        """Split the emitter into rectangles [ymin, ymax, zmin, zmax], one for
+        each box containing the emitter plane."""
+        regions = []
+        measures = []
+        for box in box_bounds:
+            if not _owns_position(self.x, box[0], [mwxrun.xmin, mwxrun.xmax]):
+                continue
+            region = [
+                max(self.bounds[0], box[1, 0]), min(self.bounds[1], box[1, 1]),
+                max(self.bounds[2], box[2, 0]), min(self.bounds[3], box[2, 1])
+            ]
+            y_range = region[1] - region[0]
+            z_range = region[3] - region[2]
+            if y_range <= 0 or z_range <= 0:
+                continue
+
+            # Same conventions for unresolved directions as self.area
+            if self.solver_geom == 'XZ':
+                measures.append(z_range)
+            else:
+                measures.append(y_range * z_range)
+            regions.append(region)
 
+        return regions, measures
+
+    def _get_xv_coords_region(self, npart, m, rng, region):
+        """Get particle coordinates on the rectangle region = [ymin, ymax,
+        zmin, zmax] of the emitter."""
         # in sampling the positions and the velocities the x and z coordinates
         # are swapped so that the same functions as for the ZPlaneEmitter can
         # be used
         vz, vy, vx = mwxutil.get_velocities(
             npart, self.T, m=m, transverse_fac=self.transverse_fac,
-            emission_type=self.emission_type, rseed=rseedv)
+            emission_type=self.emission_type, rng=rng)
         z, y, x = mwxutil.get_positions(
-            npart, xmin=self.bounds[2], xmax=self.bounds[3],
-            ymin=self.bounds[0], ymax=self.bounds[1], z=self.x,
-            rseed=rseedx)
+            npart, xmin=region[2], xmax=region[3],
+            ymin=region[0], ymax=region[1], z=self.x,
+            rng=rng)
 
         # Flip x velocities if needed. This appears to be faster than
         # an if statement for 10000 or fewer particles.
         vx = self.xdir * vx
 
-        if rseed is not None:
-            np.random.set_state(nprstate)
-
         return x, y, z, vx, vy, vz
 
     def get_normals(self, x, y, z):
@@ -1413,6 +2016,11 @@ class XPlaneEmitter(Emitter):
         normals[:, 0] = self.xdir
         return normals
 
+    def get_normal_ids(self, x, y, z):
+        """All particles share the normal of the plane, see
+        :meth:`mewarpx.emission.Emitter.get_normal_ids`."""
+        return self.get_normals([0.], [0.], [0.]), np.zeros(len(x), dtype=int)
+
 
 class ZDiscEmitter(Emitter):
 
@@ -1471,30 +2079,20 @@ class ZDiscEmitter(Emitter):
 
         See :func:`mewarpx.emission.BaseEmitter.get_newparticles` for details.
         """
-        if rseed is not None:
-            nprstate = np.random.get_state()
-            np.random.seed(rseed)
-            rseedv = np.random.randint(1000000000)
-            rseedx = np.random.randint(1000000000)
-        else:
-            rseedv = None
-            rseedx = None
+        rng = mwxrng.get_generator("emission", rseed)
 
         vx, vy, vz = mwxutil.get_velocities(
             npart, self.T, m=m, transverse_fac=self.transverse_fac,
-            emission_type=self.emission_type, rseed=rseedv)
+            emission_type=self.emission_type, rng=rng)
         x, y, z = mwxutil.get_positions_RZ(
             npart, rmin=self.inner_emission_radius,
             rmax=self.outer_emission_radius, z=self.z,
-            rseed=rseedx)
+            rng=rng)
 
         # Flip z velocities for anode emission. This appears to be faster than
         # an if statement for 10000 or fewer particles.
         vz = -self.zsign * vz
 
-        if rseed is not None:
-            np.random.set_state(nprstate)
-
         return x, y, z, vx, vy, vz
 
     def get_normals(self, x, y, z):
@@ -1513,6 +2111,11 @@ class ZDiscEmitter(Emitter):
         normals[:, 2] = -self.zsign
         return normals
 
+    def get_normal_ids(self, x, y, z):
+        """All particles share the normal of the plane, see
+        :meth:`mewarpx.emission.Emitter.get_normal_ids`."""
+        return self.get_normals([0.], [0.], [0.]), np.zeros(len(x), dtype=int)
+
 
 class ZCylinderEmitter(Emitter):
 
@@ -1594,26 +2197,19 @@ class ZCylinderEmitter(Emitter):
 
         See :func:`mewarpx.emission.BaseEmitter.get_newparticles` for details.
         """
-        if rseed is not None:
-            nprstate = np.random.get_state()
-            np.random.seed(rseed)
-            # rseedv is passed to get velocities. The basic rseed here is used
-            # for positions, below.
-            rseedv = np.random.randint(1000000000)
-        else:
-            rseedv = None
+        rng = mwxrng.get_generator("emission", rseed)
 
-        theta = np.random.uniform(0.0, 2.0*np.pi, npart)
+        theta = rng.uniform(0.0, 2.0*np.pi, npart)
         cos_theta = np.cos(theta)
         sin_theta = np.sin(theta)
 
         x = self.r * cos_theta
         y = self.r * sin_theta
-        z = np.random.uniform(self.zmin, self.zmax, npart)
+        z = rng.uniform(self.zmin, self.zmax, npart)
 
         vz, v_trans, v_long = mwxutil.get_velocities(
             npart, self.T, m=m, transverse_fac=self.transverse_fac,
-            emission_type=self.emission_type, rseed=rseedv)
+            emission_type=self.emission_type, rng=rng)
 
         # Flip the longitudinal velocity if needed. This appears to be faster
         # than an if statement for 10000 or fewer particles.
@@ -1622,9 +2218,6 @@ class ZCylinderEmitter(Emitter):
         vx = cos_theta * v_long - sin_theta * v_trans
         vy = sin_theta * v_long + cos_theta * v_trans
 
-        if rseed is not None:
-            np.random.set_state(nprstate)
-
         return x, y, z, vx, vy, vz
 
     def get_normals(self, x, y, z):
@@ -1646,6 +2239,13 @@ class ZCylinderEmitter(Emitter):
         normals[:, 1] = y / r
         return normals
 
+    def get_normal_ids(self, x, y, z):
+        """The normals vary continuously around the cylinder, so there is no
+        point in searching for distinct normals: each particle gets its own
+        row of the table. See :meth:`mewarpx.emission.Emitter.get_normal_ids`.
+        """
+        return self.get_normals(x, y, z), np.arange(len(x))
+
 
 class ArbitraryEmitter2D(Emitter):
 
@@ -1730,7 +2330,14 @@ class ArbitraryEmitter2D(Emitter):
         self.distances = np.sqrt(self.dvec[:, 0]**2 + self.dvec[:, 1]**2)
         self.area = sum(self.distances)
         self.cell_count = self.area / min(mwxrun.dx, mwxrun.dz)
-        self.CDF = np.cumsum(self.distances)/self.area
+        # Region covering every full segment, see _get_local_regions(). The
+        # segments are drawn from an alias table, in constant time per
+        # particle.
+        nsegments = self.dvec.shape[0]
+        self.full_region = (
+            np.arange(nsegments), np.zeros(nsegments), np.ones(nsegments),
+            _build_alias_table(self.distances)
+        )
 
         # Calculate Normal Vector by taking cross product with y-hat
         ndvec = self.dvec/np.tile(self.distances, (2, 1)).T
@@ -1749,82 +2356,142 @@ class ArbitraryEmitter2D(Emitter):
         nhat = self.conductor.calculatenormal(px, py, pz)
         self.normal = nhat[[0, 2], :].T
 
+        # Cosine and sine of the rotation from z-hat to each segment normal,
+        # see get_rotation_coefficients()
+        self.rot_cos, self.rot_sin = self.get_rotation_coefficients(
+            self.normal)
+
     def _get_xv_coords(self, npart, m, rseed):
         """Get particle coordinates given particle number.
 
         See :func:`mewarpx.emitter.get_newparticles` for details.
         """
-        if rseed is not None:
-            nprstate = np.random.get_state()
-            np.random.seed(rseed)
-            # rseedv is passed to get velocities. The basic rseed here is used
-            # for positions, below.
-            rseedv = np.random.randint(1000000000)
-        else:
-            rseedv = None
+        rng = mwxrng.get_generator("emission", rseed)
+
+        return self._get_xv_coords_region(npart, m, rng, self.full_region)
+
+    def _get_local_regions(self, box_bounds):
+        """Clip the contour segments to each box. Each region is a tuple
+        (segment indices, start and end of the clipped pieces as fractions of
+        the segments, alias table of the piece lengths). A piece belongs to
+        the box containing its midpoint.
+        """
+        p0 = self.contours[:-1]
+        domain_lims = [[mwxrun.xmin, mwxrun.xmax], [mwxrun.zmin, mwxrun.zmax]]
+
+        regions = []
+        measures = []
+        for box in box_bounds:
+            # Liang-Barsky clipping of all segments against the box
+            t0 = np.zeros(p0.shape[0])
+            t1 = np.ones(p0.shape[0])
+            for ii, lims in enumerate([box[0], box[2]]):
+                p = p0[:, ii]
+                d = self.dvec[:, ii]
+                inside = (p >= lims[0]) & (p <= lims[1])
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    ta = (lims[0] - p) / d
+                    tb = (lims[1] - p) / d
+                parallel = (d == 0)
+                t0 = np.maximum(t0, np.where(
+                    parallel, np.where(inside, -np.inf, np.inf),
+                    np.minimum(ta, tb)
+                ))
+                t1 = np.minimum(t1, np.where(
+                    parallel, np.where(inside, np.inf, -np.inf),
+                    np.maximum(ta, tb)
+                ))
+
+            # Segments missing the box have infinite t0 and t1
+            with np.errstate(invalid='ignore'):
+                midpoints = p0 + 0.5 * (t0 + t1)[:, None] * self.dvec
+            keep = (
+                (t1 > t0)
+                & _owns_position(midpoints[:, 0], box[0], domain_lims[0])
+                & _owns_position(midpoints[:, 1], box[2], domain_lims[1])
+            )
+            if not np.any(keep):
+                continue
+
+            idx = np.nonzero(keep)[0]
+            lengths = (t1[idx] - t0[idx]) * self.distances[idx]
+            regions.append(
+                (idx, t0[idx], t1[idx], _build_alias_table(lengths))
+            )
+            measures.append(np.sum(lengths))
+
+        return regions, measures
+
+    def _get_local_xv_coords(self, npart, m, rseed, regions, measures):
+        """Sample all local pieces of the contour together, so that
+        self.contour_idx covers every particle (see :meth:`get_normals`)."""
+        if npart == 0 or len(regions) == 0:
+            self.contour_idx = np.zeros(0, dtype=int)
+            return tuple(np.zeros(0) for _ in range(6))
+
+        idx = np.concatenate([region[0] for region in regions])
+        t0 = np.concatenate([region[1] for region in regions])
+        t1 = np.concatenate([region[2] for region in regions])
+        lengths = (t1 - t0) * self.distances[idx]
+        region = (idx, t0, t1, _build_alias_table(lengths))
+
+        rng = mwxrng.get_generator("emission", rseed)
+        return self._get_xv_coords_region(npart, m, rng, region)
+
+    def _get_xv_coords_region(self, npart, m, rng, region):
+        """Get particle coordinates on the pieces of the contour given by
+        region, see :meth:`_get_local_regions`."""
+        idx, t0, t1, alias_table = region
 
         # Draw Random Numbers to determine which face to emit from
-        self.contour_idx = np.searchsorted(self.CDF, np.random.rand(npart))
+        piece_idx = _draw_alias(alias_table, rng, npart)
+        self.contour_idx = idx[piece_idx]
 
         vels = np.column_stack(mwxutil.get_velocities(
             num_samples=npart, T=self.T, m=m,
-            rseed=rseedv,
+            rng=rng,
             transverse_fac=self.transverse_fac,
             emission_type=self.emission_type
         ))
 
-        # Rotate velocities based on angle of normal
-        newvels = self.convert_vel_zhat_nhat(
-            vels, self.normal[self.contour_idx])
-        vx = np.asarray(newvels[:, 0], order="C")
-        vy = np.asarray(newvels[:, 1], order="C")
-        vz = np.asarray(newvels[:, 2], order="C")
+        # Rotate velocities based on angle of normal, in the XZ plane
+        cos_theta = self.rot_cos[self.contour_idx]
+        sin_theta = self.rot_sin[self.contour_idx]
+        vx = cos_theta * vels[:, 0] + sin_theta * vels[:, 2]
+        vy = np.asarray(vels[:, 1], order="C")
+        vz = cos_theta * vels[:, 2] - sin_theta * vels[:, 0]
 
         # Now get positions
         pos1 = self.contours[self.contour_idx, :]
-        positions = (pos1 +
-                     (np.tile(np.random.rand(npart), (2, 1)).T
-                      * self.dvec[self.contour_idx, :]))
+        t = t0[piece_idx] + rng.random(npart) * (t1[piece_idx] - t0[piece_idx])
+        positions = pos1 + t[:, None] * self.dvec[self.contour_idx, :]
 
         x = np.asarray(positions[:, 0], order="C")
         y = np.asarray([0.]*npart, order="C")
         z = np.asarray(positions[:, 1], order="C")
 
-        if rseed is not None:
-            np.random.set_state(nprstate)
-
         return x, y, z, vx, vy, vz
 
     @staticmethod
-    # Synthetic tests showed 18 ms to 660us change from using np.dot +
-    # numba compilation. Without these changes, this function was taking 2-4% of
-    # some run times so the improvement is warranted.
-    @numba.jit(nopython=True)
-    def convert_vel_zhat_nhat(vels, nhat):
-        """Create a rotation matrix for Zhat to Nhat"""
-        Zhat = np.array([0., 1.])
-
-        newvels = np.zeros(vels.shape)
-
-        for ii in range(vels.shape[0]):
-            Cvec = Zhat - nhat[ii, :]
-            Cvec2 = np.dot(Cvec, Cvec)
-
-            theta = np.arccos(1. - Cvec2/2.)
+    def get_rotation_coefficients(nhat):
+        """Return the cosine and sine of the angle rotating z-hat onto each
+        normal in the XZ plane. A velocity is rotated, keeping vy, as
+        ``(cos*vx + sin*vz, vy, -sin*vx + cos*vz)``.
 
-            # Check to see if normal is pointing toward -xhat
-            # Resolves angle ambiguity in law of cosines
-            if nhat[ii, 0] < 0.:
-                theta = -theta
+        Arguments:
+            nhat (np.ndarray): nx2 array of (x, z) unit normals.
 
-            # Rotate in XZ plane, keeping Y the same
-            R = np.array([[np.cos(theta), 0., np.sin(theta)],
-                          [0., 1., 0.],
-                          [-np.sin(theta), 0., np.cos(theta)]])
+        Returns:
+            cos_theta, sin_theta (np.ndarray): n-length arrays.
+        """
+        Cvec2 = nhat[:, 0]**2 + (1. - nhat[:, 1])**2
+        theta = np.arccos(np.clip(1. - Cvec2/2., -1., 1.))
 
-            newvels[ii, :] = np.dot(R, vels[ii, :])
+        # Check to see if normal is pointing toward -xhat
+        # Resolves angle ambiguity in law of cosines
+        theta = np.where(nhat[:, 0] < 0., -theta, theta)
 
-        return newvels
+        return np.cos(theta), np.sin(theta)
 
     def get_normals(self, x, y, z):
         """Calculate local surface normal at specified coordinates.
@@ -1852,6 +2519,19 @@ class ArbitraryEmitter2D(Emitter):
         normals[:, 2] = self.normal[self.contour_idx, 1]
         return normals
 
+    def get_normal_ids(self, x, y, z):
+        """The normals are tabulated per contour segment, so the segment
+        indices of the most recently emitted particles are used directly. See
+        :meth:`mewarpx.emission.Emitter.get_normal_ids`."""
+        if len(x) != len(self.contour_idx):
+            raise ValueError('Length of particle coordinate list does not match'
+                             + ' the most recent number of emitted particles!')
+
+        normal_table = np.zeros((self.normal.shape[0], 3))
+        normal_table[:, 0] = self.normal[:, 0]
+        normal_table[:, 2] = self.normal[:, 1]
+        return normal_table, self.contour_idx
+
     def plot_contours(self):
         """Plots the contours generated for the assembly object and the
         assembly object. The object is plotted in yellow, and the contours
@@ -1930,6 +2610,7 @@ class VolumeEmitter(BaseEmitter):
 
     volume = 0
     geoms = ['Z', 'XZ', 'RZ', 'XYZ']
+    supports_velocity_only_draw = True
 
     def __init__(self, T, xmin=None, xmax=None, ymin=None, ymax=None,
                  zmin=None, zmax=None, rmin=None, rmax=None):
@@ -2011,28 +2692,36 @@ class VolumeEmitter(BaseEmitter):
 
     def _get_xv_coords(self, npart, m, rseed):
         """Get velocities and call specialized function for position."""
-        if rseed is not None:
-            nprstate = np.random.get_state()
-            np.random.seed(rseed)
-            # rseedv is passed to get velocities. The basic rseed here is used
-            # for positions, below.
-            rseedv = np.random.randint(1000000000)
-        else:
-            rseedv = None
+        rng = mwxrng.get_generator("emission", rseed)
 
-        x_coords = self._get_x_coords(npart)
+        return self._get_xv_coords_region(npart, m, rng, None)
+
+    def _get_xv_coords_region(self, npart, m, rng, region):
+        """Get velocities and positions within region, which gives the
+        bounds of the part of the volume to sample (None for the whole
+        volume)."""
+        if region is None:
+            x_coords = self._get_x_coords(npart, rng=rng)
+        else:
+            x_coords = self._get_x_coords(npart, rng=rng, bounds=region)
         v_coords = mwxutil.get_velocities(
-            npart, self.T, m=m, emission_type='random', rseed=rseedv
+            npart, self.T, m=m, emission_type='random', rng=rng
         )
 
-        if rseed is not None:
-            np.random.set_state(nprstate)
-
         return (
             x_coords[:, 0], x_coords[:, 1], x_coords[:, 2],
             v_coords[0], v_coords[1], v_coords[2]
         )
 
+    def _get_v_coords(self, x, y, z, m, rseed):
+        """The velocity distribution is the same everywhere in the volume, so
+        only sample velocities."""
+        rng = mwxrng.get_generator("emission", rseed)
+
+        return mwxutil.get_velocities(
+            len(x), self.T, m=m, emission_type='random', rng=rng
+        )
+
 
 class UniformDistributionVolumeEmitter(VolumeEmitter):
 
@@ -2040,60 +2729,101 @@ class UniformDistributionVolumeEmitter(VolumeEmitter):
     temperature.
     """
 
-    def _get_x_coords(self, npart):
+    def _get_x_coords(self, npart, rng=None, bounds=None):
         """Get coordinates uniformly distributed in space.
 
-        rseed, if used, is handled by the parent function.
+        rseed, if used, is handled by the parent function, which passes the
+        generator to draw from. bounds, if given, replaces self.bounds to
+        sample only part of the volume.
         """
+        if rng is None:
+            rng = mwxrng.get_generator("emission")
+        if bounds is None:
+            bounds = self.bounds
         if self.rectangular:
             xyz_pos = [
-                np.random.uniform(self.bounds[ii, 0], self.bounds[ii, 1],
-                                  npart)
+                rng.uniform(bounds[ii, 0], bounds[ii, 1], npart)
                 for ii in range(3)
             ]
 
         # handle cylindrical case
         else:
-            r = np.sqrt(np.random.uniform(
-                self.bounds[0, 1]**2, self.bounds[0, 0]**2, npart
+            r = np.sqrt(rng.uniform(
+                bounds[0, 1]**2, bounds[0, 0]**2, npart
             ))
-            theta = np.random.uniform(self.bounds[1, 0], self.bounds[1, 1],
-                                      npart)
+            theta = rng.uniform(bounds[1, 0], bounds[1, 1], npart)
             xyz_pos = [
                 r * np.cos(theta), r * np.sin(theta),
-                np.random.uniform(self.bounds[2, 0], self.bounds[2, 1],
-                                  npart)
+                rng.uniform(bounds[2, 0], bounds[2, 1], npart)
             ]
 
         return np.array(xyz_pos).T
 
+    def _get_local_regions(self, box_bounds):
+        """Intersect the volume bounds with each box. Cylindrical volumes are
+        only supported in RZ (or Z) geometry and rectangular ones in any other
+        geometry, where the box limits are along the same directions as the
+        volume bounds.
+        """
+        if self.rectangular:
+            supported = self.solver_geom != 'RZ'
+        else:
+            supported = self.solver_geom in ['Z', 'RZ']
+        if not supported:
+            raise NotImplementedError(
+                "Local injection is not supported for this volume shape in "
+                f"{self.solver_geom} geometry."
+            )
+
+        regions = []
+        measures = []
+        for box in box_bounds:
+            region = self.bounds.copy()
+            # The theta bounds of cylindrical volumes are not limited by boxes
+            for ii in ([0, 1, 2] if self.rectangular else [0, 2]):
+                region[ii, 0] = max(region[ii, 0], box[ii, 0])
+                region[ii, 1] = min(region[ii, 1], box[ii, 1])
+            if np.any(region[:, 1] <= region[:, 0]):
+                continue
+
+            if self.rectangular:
+                measures.append(np.prod(region[:, 1] - region[:, 0]))
+            else:
+                measures.append(
+                    np.pi * (region[0, 1]**2 - region[0, 0]**2)
+                    * (region[2, 1] - region[2, 0])
+                )
+            regions.append(region)
+
+        return regions, measures
+
 
 class ZSinDistributionVolumeEmitter(VolumeEmitter):
 
     """Vary density in z as a half-period sin wave."""
 
-    def _get_x_coords(self, npart):
+    def _get_x_coords(self, npart, rng=None):
         """Get coordinates with sin distribution.
 
-        rseed, if used, is handled by the parent function.
+        rseed, if used, is handled by the parent function, which passes the
+        generator to draw from.
         """
+        if rng is None:
+            rng = mwxrng.get_generator("emission")
         if self.rectangular:
-            xpos = np.random.uniform(self.bounds[0, 0], self.bounds[0, 1],
-                                     npart)
-            ypos = np.random.uniform(self.bounds[1, 0], self.bounds[1, 1],
-                                     npart)
+            xpos = rng.uniform(self.bounds[0, 0], self.bounds[0, 1], npart)
+            ypos = rng.uniform(self.bounds[1, 0], self.bounds[1, 1], npart)
 
         # handle cylindrical case
         else:
-            r = np.sqrt(np.random.uniform(
+            r = np.sqrt(rng.uniform(
                 self.bounds[0, 1]**2, self.bounds[0, 0]**2, npart
             ))
-            theta = np.random.uniform(self.bounds[1, 0], self.bounds[1, 1],
-                                      npart)
+            theta = rng.uniform(self.bounds[1, 0], self.bounds[1, 1], npart)
             xpos = r * np.cos(theta)
             ypos = r * np.sin(theta)
 
-        z_random_draw = np.random.random(npart)
+        z_random_draw = rng.random(npart)
         zpos = (
             np.arccos(1 - 2.0*z_random_draw) / np.pi
             * (self.bounds[2, 1] - self.bounds[2, 0])
@@ -2127,15 +2857,18 @@ class XGaussZSinDistributionVolumeEmitter(VolumeEmitter):
         self.truncnorm = scipy.stats.truncnorm(a=-trunc, b=trunc,
                                                loc=mu, scale=x_sigma)
 
-    def _get_x_coords(self, npart):
+    def _get_x_coords(self, npart, rng=None):
         """Get coordinates with sin distribution in z and Guassian in x.
 
-        rseed, if used, is handled by the parent function.
+        rseed, if used, is handled by the parent function, which passes the
+        generator to draw from.
         """
-        xpos = self.truncnorm.rvs(npart)
-        ypos = np.random.uniform(self.bounds[1, 0], self.bounds[1, 1], npart)
+        if rng is None:
+            rng = mwxrng.get_generator("emission")
+        xpos = self.truncnorm.rvs(npart, random_state=rng)
+        ypos = rng.uniform(self.bounds[1, 0], self.bounds[1, 1], npart)
 
-        z_random_draw = np.random.random(npart)
+        z_random_draw = rng.random(npart)
         zpos = (
             np.arccos(1 - 2.0*z_random_draw) / np.pi
             * (self.bounds[2, 1] - self.bounds[2, 0])
@@ -2165,6 +2898,21 @@ class ArbitraryDistributionVolumeEmitter(VolumeEmitter):
         self.d_grid = (interp_dgrid * mwxrun.dx * mwxrun.dz
                        * (mwxrun.ymax - mwxrun.ymin)
                        * 1e6).ravel()
+
+        # cell centers in the same (x-major) order as d_grid; particles are
+        # placed around them in this order so their cells are known
+        x = np.linspace(self.bounds[0, 0] + mwxrun.dx/2,
+                        self.bounds[0, 1] - mwxrun.dx/2, mwxrun.nx)
+        z = np.linspace(self.bounds[2, 0] + mwxrun.dz/2,
+                        self.bounds[2, 1] - mwxrun.dz/2, mwxrun.nz)
+        zz, xx = np.meshgrid(z, x)
+        self.cell_x = xx.ravel()
+        self.cell_z = zz.ravel()
+
+        # particle weights for the most recent number of particles, see
+        # _weight_function()
+        self._weights = None
+
         self.add_wfn(self._weight_function)
 
     @staticmethod
@@ -2186,24 +2934,26 @@ class ArbitraryDistributionVolumeEmitter(VolumeEmitter):
         input_z = np.linspace(-0.5, input_shape[1] + 0.5, input_shape[1] + 2)
         input_grid = np.pad(input_grid, (1,), "reflect", reflect_type="odd")
 
-        input_zz, input_xx = np.meshgrid(input_z, input_x)
-
-        input_xx = input_xx * mwxrun.nx/input_shape[0]
-        input_zz = input_zz * mwxrun.nz/input_shape[1]
-        input_coord = np.column_stack([input_xx.flatten(), input_zz.flatten()])
+        # the input is a regular grid, so interpolate bilinearly on it rather
+        # than triangulating scattered points
+        interpolator = scipy.interpolate.RegularGridInterpolator(
+            (input_x * mwxrun.nx/input_shape[0],
+             input_z * mwxrun.nz/input_shape[1]),
+            input_grid
+        )
 
         output_x = np.linspace(0.5, mwxrun.nx - 0.5, mwxrun.nx)
         output_z = np.linspace(0.5, mwxrun.nz - 0.5, mwxrun.nz)
         output_zz, output_xx = np.meshgrid(output_z, output_x)
 
-        output_grid = scipy.interpolate.griddata(
-            input_coord, input_grid.flatten(), (output_xx, output_zz)
-        )
+        output_grid = interpolator((output_xx, output_zz))
         return output_grid
 
-    def _get_x_coords(self, npart):
+    def _get_x_coords(self, npart, rng=None):
         """Uniformly samples particles in each grid cell, so each cell has the
         same number of particles."""
+        if rng is None:
+            rng = mwxrng.get_generator("emission")
         nppc = npart / (mwxrun.nx * mwxrun.nz)
 
         if not nppc.is_integer() or nppc < 1:
@@ -2212,14 +2962,12 @@ class ArbitraryDistributionVolumeEmitter(VolumeEmitter):
                              f"be an integer greater than or equal to 1. "
                              f"Currently it is {nppc}.")
 
-        random_dx = np.random.uniform(-mwxrun.dx / 2, mwxrun.dx / 2, npart)
-        random_dz = np.random.uniform(-mwxrun.dz / 2, mwxrun.dz / 2, npart)
+        random_dx = rng.uniform(-mwxrun.dx / 2, mwxrun.dx / 2, npart)
+        random_dz = rng.uniform(-mwxrun.dz / 2, mwxrun.dz / 2, npart)
 
-        x = np.linspace(self.bounds[0, 0] + mwxrun.dx/2, self.bounds[0, 1] - mwxrun.dx/2, mwxrun.nx)
-        z = np.linspace(self.bounds[2, 0] + mwxrun.dz/2, self.bounds[2, 1] - mwxrun.dz/2, mwxrun.nz)
-        zz, xx = np.meshgrid(z, x)
-        xx = np.tile(xx.ravel(), int(nppc)) + random_dx
-        zz = np.tile(zz.ravel(), int(nppc)) + random_dz
+        # particle i is in cell i % (nx*nz), see _weight_function()
+        xx = np.tile(self.cell_x, int(nppc)) + random_dx
+        zz = np.tile(self.cell_z, int(nppc)) + random_dz
         yy = np.zeros_like(xx)
 
         return np.array([xx, yy, zz]).T
@@ -2228,6 +2976,12 @@ class ArbitraryDistributionVolumeEmitter(VolumeEmitter):
         """Calculates the weight of each particle based on their position and
         the given seed density grid.
 
+        ``_get_x_coords`` places the same number of particles, nppc, in every
+        cell, with particle i in cell i % (nx*nz). Each particle therefore
+        carries 1/nppc of its cell's density, assigned by direct indexing
+        instead of binning the particles. The table is reused while the
+        number of particles is unchanged.
+
         Arguments:
             particle_dict (dict): Contains lists, each with length equal to the
                 number of particles
@@ -2235,24 +2989,9 @@ class ArbitraryDistributionVolumeEmitter(VolumeEmitter):
         Returns:
             w (np.ndarray): flattened array of particle weights
         """
+        npart = len(particle_dict["x"])
+        if self._weights is None or len(self._weights) != npart:
+            nppc = npart // self.d_grid.size
+            self._weights = np.tile(self.d_grid / nppc, nppc)
 
-        # create a bin for each grid cell
-        x_bin = np.linspace(mwxrun.xmin, mwxrun.xmax, mwxrun.nx + 1)
-        z_bin = np.linspace(mwxrun.zmin, mwxrun.zmax, mwxrun.nz + 1)
-
-        # bin particles based on position
-        ret = scipy.stats.binned_statistic_2d(
-            particle_dict["x"], particle_dict["z"], None, "count",
-            bins=[x_bin, z_bin], expand_binnumbers=True
-        )
-        bin_counts = ret.statistic.flatten()
-
-        # calculate weight per particle per cell
-        w_grid = np.divide(self.d_grid, bin_counts,
-                           out=np.zeros_like(self.d_grid),
-                           where=bin_counts != 0)
-
-        # apply particle weights to each particle
-        w = w_grid[(ret.binnumber[0, :] - 1) * mwxrun.nz + ret.binnumber[1, :] - 1]
-
-        return w
+        return self._weights.copy()
@@ -458,6 +458,52 @@ class MEWarpXRun(object):
         else:
             raise AttributeError(f"Unknown geometry: {mwxrun.geom_str}")
 
+    def get_local_box_bounds(self):
+        """Return the physical extents of the boxes owned by this processor.
+
+        Returns:
+            bounds (np.ndarray): Array of shape (nboxes, 3, 2) with the lower
+            and upper positions of each box along x (r in RZ), y and z.
+            Directions not resolved by the grid are unbounded.
+        """
+        lovects, _ = self.phi_wrappers[0]._getlovects()
+        hivects, _ = self.phi_wrappers[0]._gethivects()
+
+        # (axis, lower domain edge, cell size) of each grid dimension
+        if self.geom_str == 'Z':
+            grid_axes = [(2, self.zmin, self.dz)]
+        elif self.geom_str in ['XZ', 'RZ']:
+            grid_axes = [(0, self.xmin, self.dx), (2, self.zmin, self.dz)]
+        else:
+            grid_axes = [
+                (0, self.xmin, self.dx), (1, self.ymin, self.dy),
+                (2, self.zmin, self.dz)
+            ]
+
+        bounds = np.zeros((lovects.shape[1], 3, 2))
+        bounds[:, :, 0] = -np.inf
+        bounds[:, :, 1] = np.inf
+        # phi is nodal, so node index i is at position lo + i*d
+        for ii, (axis, lo, d) in enumerate(grid_axes):
+            bounds[:, axis, 0] = lo + lovects[ii] * d
+            bounds[:, axis, 1] = lo + hivects[ii] * d
+
+        return bounds
+
+    def write_callback_profiles(self, filename="callback_profile_data.json"):
+        """Write the timings of the Python callbacks, reduced over all
+        processors, to a JSON file. Nothing is written if the callback timers
+        are disabled. This must be called by all processors, e.g. at the end
+        of the run.
+
+        Arguments:
+            filename (str): Name of the file to write. Default
+                callback_profile_data.json, next to the profile_data.json
+                file written by the profileparser.
+        """
+        if callbacks.callbacktimersenabled():
+            callbacks.writecallbackprofiles(filename)
+
     def get_it(self):
         """Return the current integer iteration number."""
         return self.sim_ext.getistep(self.lev)
@@ -491,7 +537,8 @@ class MEWarpXRun(object):
 
         return npart_dict
 
-    def get_gathered_rho_grid(self, species_name=None, include_ghosts=False):
+    def get_gathered_rho_grid(self, species_name=None, include_ghosts=False,
+                              gather_to='all'):
         """Get the full rho on the grid on the root processor.
 
         Arguments:
@@ -499,9 +546,13 @@ class MEWarpXRun(object):
                 specific species will be returned (deposited on the grid). If
                 None, the current state of rho_fp will be returned.
             include_ghosts (bool): Whether or not to include ghost cells.
+            gather_to (str or int): 'all' (default) to return the full array
+                on every processor, or the rank of the only processor that
+                should receive it.
 
         Returns:
-            A numpy array with rho on the full domain.
+            A numpy array with rho on the full domain, or None on processors
+            that did not receive the data.
         """
 
         if species_name is not None:
@@ -510,26 +561,45 @@ class MEWarpXRun(object):
             self.sim_ext.depositChargeDensity(
                 species_name, self.lev, clear_rho=False)
 
-        return self.rho_wrappers[int(include_ghosts)][Ellipsis]
+        return self.rho_wrappers[int(include_ghosts)].gather(
+            Ellipsis, gather_to=gather_to
+        )
 
-    def get_gathered_phi_grid(self, include_ghosts=False):
+    def get_gathered_phi_grid(self, include_ghosts=False, gather_to='all'):
         """Get the full phi on the grid.
 
         Arguments:
             include_ghosts (bool): Whether or not to include ghost cells.
+            gather_to (str or int): 'all' (default) to return the full array
+                on every processor, or the rank of the only processor that
+                should receive it.
 
         Returns:
-            A numpy array with phi on the full domain.
+            A numpy array with phi on the full domain, or None on processors
+            that did not receive the data.
         """
-        return self.phi_wrappers[int(include_ghosts)][Ellipsis]
+        return self.phi_wrappers[int(include_ghosts)].gather(
+            Ellipsis, gather_to=gather_to
+        )
 
-    def set_phi_grid(self, phi_data):
-        """Sets phi on the grid to input phi data.
+    def set_phi_grid(self, phi_data, root=None):
+        """Sets phi on the grid to input phi data. Each processor only copies
+        the parts of the array that belong to its own boxes.
 
         Arguments:
-            phi_data (numpy array): Phi values on the grid.
+            phi_data (numpy array): Phi values on the full grid, including
+                ghost cells.
+            root (int or None): If None (default), phi_data must be given on
+                every processor. Otherwise only the processor with this rank
+                needs to hold phi_data, and each processor is sent the part
+                that belongs to its own boxes.
         """
-        self.phi_wrappers[1][Ellipsis] = phi_data
+        if root is not None:
+            self.phi_wrappers[1].scatter_from(phi_data, root=root)
+            return
+
+        for gslices, phi_view in self.phi_wrappers[1].local_tiles():
+            phi_view[...] = phi_data[gslices]
 
     def eval_expression_t(self, expr, t=None):
         """Function to evaluate an expression that depends on time, at the
@@ -570,18 +640,57 @@ class MEWarpXRun(object):
             self.lev
         )
 
-    def calc_Schottky_weight(self, species_name, pre_fac):
+    def calc_Schottky_weight(self, species_name, pre_fac, normal_table):
         """Function to calculate weight for field-enhanced Schottky emission.
 
         Arguments:
             species_name (str): The name of the species for which Schottky
-                enhancement will be calculated.
+                enhancement will be calculated. It must have a "norm_id" PID
+                holding the row of normal_table of each particle.
             pre_fac (float): Exponent pre-factor in the Schottky enhancement
                 calculation -> sqrt(e / 4*pi*eps0) / (kT)
+            normal_table (np.ndarray): mx3 array of surface normals.
         """
+        normal_table = np.ascontiguousarray(normal_table, dtype=np.float64)
         self.sim_ext.libwarpx_so.warpx_calcSchottkyWeight(
-            ctypes.c_char_p(species_name.encode('utf-8')), pre_fac, self.lev
+            ctypes.c_char_p(species_name.encode('utf-8')), pre_fac,
+            normal_table, normal_table.shape[0], self.lev
+        )
+
+    def inject_Schottky_particles(self, src_species_name, dst_species_name,
+                                  pre_fac, normal_table, m, qV):
+        """Apply the Schottky enhancement to the weights of the particles in
+        the source species and move them to the destination species. The
+        injected totals are summed in the same pass over the particles.
+        Components are matched by name, so components only present in the
+        source species (such as "norm_id") are dropped.
+
+        Arguments:
+            src_species_name (str): The species holding the newly injected
+                particles; it is emptied.
+            dst_species_name (str): The species the particles are moved to.
+            pre_fac (float): Exponent pre-factor in the Schottky enhancement
+                calculation -> sqrt(e / 4*pi*eps0) / (kT)
+            normal_table (np.ndarray): mx3 array of surface normals, indexed
+                by the "norm_id" PID of the source species.
+            m (float): Particle mass used for the kinetic energy.
+            qV (float): Potential energy of a physical particle at the
+                injection site, added to the kinetic energy.
+
+        Returns:
+            npart (int): Number of particles moved on this processor.
+            total_weight (float): Their total weight after enhancement.
+            total_energy (float): Their total energy w*(0.5*m*v^2 + qV).
+        """
+        normal_table = np.ascontiguousarray(normal_table, dtype=np.float64)
+        totals = np.zeros(3)
+        self.sim_ext.libwarpx_so.warpx_injectSchottkyParticles(
+            ctypes.c_char_p(src_species_name.encode('utf-8')),
+            ctypes.c_char_p(dst_species_name.encode('utf-8')),
+            pre_fac, normal_table, normal_table.shape[0], m, qV, self.lev,
+            totals
         )
+        return int(totals[0]), totals[1], totals[2]
 
 
 mwxrun = MEWarpXRun()
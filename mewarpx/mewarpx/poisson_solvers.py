@@ -131,12 +131,14 @@ class PoissonSolverPseudo1D(ElectrostaticSolver):
         if not mwxrun.initialized:
             return
 
-        # get rho from WarpX
-        self.rho_data = mwxrun.get_gathered_rho_grid()[:,:,0]
-        # run superLU solver to get phi
-        self.solve()
-        # write phi to WarpX
-        mwxrun.set_phi_grid(self.phi)
+        # get rho from WarpX, only the root processor performs the solve
+        rho_data = mwxrun.get_gathered_rho_grid(gather_to=0)
+        if mwxrun.me == 0:
+            self.rho_data = rho_data[:,:,0]
+            # run superLU solver to get phi
+            self.solve()
+        # write phi to WarpX, each processor only receives its own boxes
+        mwxrun.set_phi_grid(self.phi, root=0)
 
     def solve(self):
         """The solution step. Includes getting the boundary potentials and
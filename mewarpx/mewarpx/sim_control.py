@@ -87,7 +87,9 @@ class SimControl(WarpXDiagnostic):
         callbacks.installoncheckpointsignal(self.trigger_checkpoint)
 
         # install a callback to check whether any termination criteria is met
-        callbacks.installafterstep(self.check_criteria)
+        self.install_periodic_callback(
+            callbacks.installafterstep, self.check_criteria
+        )
 
     def add_checker(self, criterion):
         """Install a single function to check.
@@ -160,6 +162,10 @@ class SimControl(WarpXDiagnostic):
         """Executes the WarpX loop."""
         mwxrun.simulation.step()
 
+        # all processors leave the loop together, so the callback timings can
+        # be reduced here
+        mwxrun.write_callback_profiles()
+
         # create fluxdiag checkpoint file if checkpointing is installed
         self.trigger_checkpoint()
 
@@ -0,0 +1,111 @@
+"""Struct-of-arrays record store which can be appended to efficiently.
+"""
+import collections
+
+import numpy as np
+
+
+class ColumnStore(object):
+
+    """Store records as one array per column, each with its own dtype. Like
+    :class:`mewarpx.utils_store.appendablearray.AppendableArray` the arrays
+    are larger than the data and only grow (doubling in size) when they fill
+    up. Records are appended with a single bulk copy per column, and the data
+    is read back as views of the column arrays.
+
+    Create an instance like so
+    >>> store = ColumnStore({'species_id': np.int16, 'w': np.float32})
+    Append records from arrays, optionally picking out some of them, and with
+    scalar values for some columns
+    >>> store.append({'w': w_arr}, idx=[0, 3], species_id=1)
+    The data can be obtained as a dict of views
+    >>> store.data()['w']
+    """
+
+    def __init__(self, columns=None, capacity=16):
+        """Initialize an empty store.
+
+        Arguments:
+            columns (dict): Column names and their dtypes, in order.
+            capacity (int): Initial number of records the store can hold.
+        """
+        self._columns = collections.OrderedDict()
+        self._len = 0
+        self._capacity = capacity
+        for name, dtype in (columns or {}).items():
+            self.add_column(name, dtype)
+
+    def __len__(self):
+        return self._len
+
+    @property
+    def columns(self):
+        """List of the column names."""
+        return list(self._columns.keys())
+
+    def add_column(self, name, dtype):
+        """Add a column. Only possible while the store is empty.
+
+        Arguments:
+            name (str): Name of the column.
+            dtype (np.dtype): dtype of the column.
+        """
+        if self._len != 0:
+            raise RuntimeError("Cannot add a column to a non-empty store.")
+        self._columns[name] = np.empty(self._capacity, dtype=dtype)
+
+    def reserve(self, capacity):
+        """Make sure the store can hold capacity records, keeping the stored
+        data. The capacity at least doubles when it grows."""
+        if capacity <= self._capacity:
+            return
+        self._capacity = max(capacity, 2*self._capacity)
+        for name, col in self._columns.items():
+            new_col = np.empty(self._capacity, dtype=col.dtype)
+            new_col[:self._len] = col[:self._len]
+            self._columns[name] = new_col
+
+    def append(self, data, idx=None, **values):
+        """Append records.
+
+        Arguments:
+            data (dict): 1D array for each column not given in values.
+            idx (np.ndarray): If given, only append the records at these
+                indices of the data arrays.
+            values: Scalar value of the appended records for some columns.
+        """
+        if idx is not None:
+            nrecords = len(idx)
+        else:
+            nrecords = len(next(
+                data[name] for name in self._columns if name not in values
+            ))
+        if nrecords == 0:
+            return
+
+        self.reserve(self._len + nrecords)
+        for name, col in self._columns.items():
+            out = col[self._len:self._len + nrecords]
+            if name in values:
+                out[...] = values[name]
+            elif idx is not None:
+                np.take(data[name], idx, out=out)
+            else:
+                out[...] = data[name]
+        self._len += nrecords
+
+    def data(self):
+        """Return the stored records.
+
+        Returns:
+            data (collections.OrderedDict): A view of the records of each
+            column. The views are overwritten by appends after
+            :meth:`cleardata`.
+        """
+        return collections.OrderedDict(
+            (name, col[:self._len]) for name, col in self._columns.items()
+        )
+
+    def cleardata(self):
+        """Remove all records, keeping the allocated space."""
+        self._len = 0
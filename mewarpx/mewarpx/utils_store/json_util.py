@@ -42,7 +42,10 @@ class MEWarpXEncoder(json.JSONEncoder):
             obj_dict.pop("dvec", None)
             obj_dict.pop("distances", None)
             obj_dict.pop("CDF", None)
+            obj_dict.pop("full_region", None)
             obj_dict.pop("normal", None)
+            obj_dict.pop("rot_cos", None)
+            obj_dict.pop("rot_sin", None)
             return obj_dict
 
         elif isinstance(object, np.ndarray):
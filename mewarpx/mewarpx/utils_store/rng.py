@@ -0,0 +1,232 @@
+"""
+Central source of random numbers for mewarpx sampling.
+
+By default the generators returned here draw from numpy's legacy global random
+state, so ``np.random.seed`` keeps controlling all mewarpx sampling. Once a
+seed is given with ``mwxrng.set_seed``, counter-based Philox generators are
+used instead. Their streams are derived from the seed and a key (a stream
+name, the step, the processor rank and a per-step call counter), so
+independent streams are created without saving and restoring any global
+state.
+
+Usage::
+
+    from mewarpx.utils_store.rng import mwxrng
+
+    rng = mwxrng.get_generator("emission", rseed=rseed)
+    x = rng.uniform(xmin, xmax, npart)
+"""
+import zlib
+
+import numpy as np
+
+
+class MEWarpXRNG(object):
+
+    """Provide random number generators for mewarpx. This should be a
+    singleton object.
+    """
+
+    def __init__(self):
+        self.seed = None
+        self._call_counts = {}
+        self._count_step = None
+
+    def set_seed(self, seed):
+        """Set the seed from which all generators are derived.
+
+        Arguments:
+            seed (int or None): If None, generators draw from numpy's legacy
+                global random state. Otherwise each generator is an
+                independent Philox stream derived from this seed.
+        """
+        self.seed = seed
+        self._call_counts = {}
+        self._count_step = None
+
+    @staticmethod
+    def _key_to_int(key):
+        """Convert a stream key to a non-negative integer."""
+        if isinstance(key, str):
+            return zlib.crc32(key.encode('utf-8'))
+        return int(key)
+
+    def stream(self, *keys, seed=None):
+        """Return the generator for the stream identified by keys. The same
+        seed and keys always give the same stream, and different keys give
+        independent streams.
+
+        Arguments:
+            keys (ints or strs): Identify the stream. Integers must be
+                non-negative; strings are hashed.
+            seed (int, np.random.SeedSequence or None): Seed to derive the
+                stream from. Defaults to the seed of the service.
+
+        Returns:
+            rng (np.random.Generator or np.random.RandomState): A Philox
+            generator, or numpy's global RandomState if no seed is set.
+        """
+        if seed is None:
+            seed = self.seed
+        if seed is None:
+            # The global RandomState used by the np.random functions
+            return np.random.mtrand._rand
+
+        seedseq = self._seed_sequence(seed, keys)
+        return np.random.Generator(np.random.Philox(seedseq))
+
+    def _seed_sequence(self, seed, keys):
+        """Return the SeedSequence of the stream identified by seed and
+        keys."""
+        spawn_key = tuple(self._key_to_int(key) for key in keys)
+        if isinstance(seed, np.random.SeedSequence):
+            return np.random.SeedSequence(
+                seed.entropy, spawn_key=seed.spawn_key + spawn_key
+            )
+        return np.random.SeedSequence(seed, spawn_key=spawn_key)
+
+    def get_generator(self, name, rseed=None):
+        """Return a generator for the named draws on this processor at the
+        current step. Each call gives a new stream, numbered by the calls made
+        with the same name during the step, so repeated calls (e.g. by several
+        injectors) are independent.
+
+        Arguments:
+            name (str): Name of the draws, e.g. "emission".
+            rseed (int, np.random.SeedSequence or None): If given, return the
+                stream derived from this seed only, ignoring the step and
+                processor. Used for reproducible tests.
+
+        Returns:
+            rng (np.random.Generator or np.random.RandomState): See
+            :meth:`stream`.
+        """
+        if rseed is not None:
+            return self.stream(seed=rseed)
+        if self.seed is None:
+            return self.stream()
+
+        from mewarpx.mwxrun import mwxrun
+        step, count = self._next_call(name)
+        return self.stream(name, step, mwxrun.me, count)
+
+    def get_seed(self, name):
+        """Return a seed for draws made later or in another thread, where the
+        per-step call counters can't be used. Pass it as ``rseed`` to
+        :meth:`get_generator`.
+
+        Arguments:
+            name (str): Name of the draws, e.g. "prefetch".
+
+        Returns:
+            seed (np.random.SeedSequence): With a seed set, the seed of the
+            stream :meth:`get_generator` would have returned. Otherwise the
+            entropy is drawn from numpy's global random state, so
+            ``np.random.seed`` still makes the draws repeatable.
+        """
+        if self.seed is None:
+            entropy = self.stream().randint(2**32, size=4, dtype=np.uint64)
+            return np.random.SeedSequence([int(e) for e in entropy])
+
+        from mewarpx.mwxrun import mwxrun
+        step, count = self._next_call(name)
+        return self._seed_sequence(self.seed, (name, step, mwxrun.me, count))
+
+    def shared_generator(self, name):
+        """Return a generator that gives the same draws on every processor,
+        e.g. to split particles between processors. It must be called the same
+        number of times on every processor. Like :meth:`get_generator` each
+        call gives a new stream; if no seed is set the streams are derived
+        from a seed of 0.
+
+        Arguments:
+            name (str): Name of the draws, e.g. "local_injection".
+
+        Returns:
+            rng (np.random.Generator): The shared generator.
+        """
+        step, count = self._next_call("shared_" + name)
+        seed = self.seed if self.seed is not None else 0
+        return self.stream("shared", name, step, count, seed=seed)
+
+    def _next_call(self, name):
+        """Return the current step and the number of previous calls for this
+        name during the step."""
+        from mewarpx.mwxrun import mwxrun
+        step = mwxrun.get_it() if mwxrun.initialized else 0
+        if step != self._count_step:
+            self._call_counts = {}
+            self._count_step = step
+        count = self._call_counts.get(name, 0)
+        self._call_counts[name] = count + 1
+        return step, count
+
+    @staticmethod
+    def spawn_seeds(rseed, n):
+        """Derive independent child seeds from rseed.
+
+        Arguments:
+            rseed (int, np.random.SeedSequence or None): The parent seed.
+            n (int): Number of child seeds.
+
+        Returns:
+            seeds (list): n SeedSequences, or n Nones if rseed is None.
+        """
+        if rseed is None:
+            return [None]*n
+        if not isinstance(rseed, np.random.SeedSequence):
+            rseed = np.random.SeedSequence(rseed)
+        return rseed.spawn(n)
+
+    def fill_uniform(self, out, rng=None, low=0.0, high=1.0):
+        """Fill a preallocated float32 or float64 array with uniform draws in
+        [low, high).
+
+        Arguments:
+            out (np.ndarray): Array to fill.
+            rng (np.random.Generator or np.random.RandomState): Generator to
+                draw from. Defaults to a new "uniform" generator.
+            low (float): Lower bound of the draws.
+            high (float): Upper bound of the draws.
+
+        Returns:
+            out (np.ndarray): The filled array.
+        """
+        if rng is None:
+            rng = self.get_generator("uniform")
+        if isinstance(rng, np.random.Generator) and out.flags.c_contiguous:
+            rng.random(out=out, dtype=out.dtype)
+        else:
+            out[...] = rng.random(out.shape)
+        if low != 0.0 or high != 1.0:
+            out *= high - low
+            out += low
+        return out
+
+    def fill_normal(self, out, rng=None, loc=0.0, scale=1.0):
+        """Fill a preallocated float32 or float64 array with normal draws.
+
+        Arguments:
+            out (np.ndarray): Array to fill.
+            rng (np.random.Generator or np.random.RandomState): Generator to
+                draw from. Defaults to a new "normal" generator.
+            loc (float): Mean of the distribution.
+            scale (float): Standard deviation of the distribution.
+
+        Returns:
+            out (np.ndarray): The filled array.
+        """
+        if rng is None:
+            rng = self.get_generator("normal")
+        if isinstance(rng, np.random.Generator) and out.flags.c_contiguous:
+            rng.standard_normal(out=out, dtype=out.dtype)
+        else:
+            out[...] = rng.standard_normal(out.shape)
+        if scale != 1.0:
+            out *= scale
+        if loc != 0.0:
+            out += loc
+        return out
+
+
+mwxrng = MEWarpXRNG()
@@ -13,6 +13,7 @@ from pywarpx import geometry
 
 import mewarpx
 from mewarpx.utils_store import mwxconstants as constants
+from mewarpx.utils_store.rng import mwxrng
 
 logger = logging.getLogger(__name__)
 
@@ -71,7 +72,7 @@ def check_version(script_version, script_physics_version):
 
 
 def get_velocities(num_samples, T, m, emission_type='thermionic',
-                   transverse_fac=1.0, rseed=None):
+                   transverse_fac=1.0, rseed=None, rng=None):
     """Generate array of random [vx, vy, vz] for cathode-emitted electrons.
 
     Arguments:
@@ -86,9 +87,10 @@ def get_velocities(num_samples, T, m, emission_type='thermionic',
         transverse_fac (float): Scale the particle's x and y average energies
             by this factor, scales z average energy to conserve total average
             particle energy in the distribution. Default 1., Min 0., Max 2.
-        rseed (positive int): If specified, seed the random number generator.
-            Used for testing. The random number generator is set back at the
-            end of the function.
+        rseed (positive int): If specified, draw from a stream derived from
+            this seed only. Used for testing.
+        rng (np.random.Generator or np.random.RandomState): If specified,
+            draw from this generator and ignore rseed.
 
     Returns:
         velocities (np.ndarray): array of shape (num_samples, 3) with (vx, vy,
@@ -98,9 +100,8 @@ def get_velocities(num_samples, T, m, emission_type='thermionic',
         return ValueError('transverse_fac is a support argument only for '
                           'thermionic emissiion models!')
 
-    if rseed is not None:
-        nprstate = np.random.get_state()
-        np.random.seed(rseed)
+    if rng is None:
+        rng = mwxrng.get_generator("velocities", rseed)
     sigma = np.sqrt(constants.kb_J * T / m)
 
     if transverse_fac < 0.:
@@ -117,29 +118,27 @@ def get_velocities(num_samples, T, m, emission_type='thermionic',
     alpha = np.sqrt(2. - beta**2.)
 
     # vx and vy follow Maxwellian distributions
-    vx = sigma * np.random.randn(num_samples) * beta
-    vy = sigma * np.random.randn(num_samples) * beta
+    vx = sigma * rng.standard_normal(num_samples) * beta
+    vy = sigma * rng.standard_normal(num_samples) * beta
 
     if emission_type == 'random':
-        vz = sigma * np.random.randn(num_samples) * beta
+        vz = sigma * rng.standard_normal(num_samples) * beta
     elif emission_type == 'thermionic':
         # vz is truncated with k_B*T/m << Phi assumed. See
         # "Emission Distribution from a Thermionic Cathode" document
         # on Bloomfire.
-        P = np.random.rand(num_samples)
+        P = rng.random(num_samples)
         vz = np.sqrt(-2 * sigma**2 * np.log(1 - P)) * alpha
     elif emission_type == 'half_maxwellian':
-        vz = np.abs(sigma * np.random.randn(num_samples) * beta)
+        vz = np.abs(sigma * rng.standard_normal(num_samples) * beta)
     else:
         raise ValueError(f'Unsupported emission type "{emission_type}".')
 
-    if rseed is not None:
-        np.random.set_state(nprstate)
     return vx, vy, vz
 
 
 def get_positions(num_samples, xmin, xmax, ymin=0, ymax=0, z=0,
-                  rseed=None):
+                  rseed=None, rng=None):
     """Provide random samples of [x, y, z] for electrons in simulation.
     In x and y, positions are uniformly distributed. In z, positions are
     placed at the emitter.
@@ -151,30 +150,27 @@ def get_positions(num_samples, xmin, xmax, ymin=0, ymax=0, z=0,
         ymin (float): Min position in y (meters)
         ymax (float): Max position in y (meters)
         z (float): Position of the emitter on the z-axis (meters)
-        rseed (positive int): If specified, seed the random number generator.
-            Used for testing. The random number generator is set back at the
-            end of the function.
+        rseed (positive int): If specified, draw from a stream derived from
+            this seed only. Used for testing.
+        rng (np.random.Generator or np.random.RandomState): If specified,
+            draw from this generator and ignore rseed.
 
     Returns:
         positions (np.ndarray): Array of shape (num_samples, 3) with positions.
     """
-    if rseed is not None:
-        nprstate = np.random.get_state()
-        np.random.seed(rseed)
+    if rng is None:
+        rng = mwxrng.get_generator("positions", rseed)
 
     # Random x and y positions
-    x = np.random.uniform(xmin, xmax, num_samples)
-    y = np.random.uniform(ymin, ymax, num_samples)
+    x = rng.uniform(xmin, xmax, num_samples)
+    y = rng.uniform(ymin, ymax, num_samples)
     z = np.ones_like(x) * z
 
-    if rseed is not None:
-        np.random.set_state(nprstate)
-
     return x, y, z
 
 
 def get_positions_RZ(num_samples, rmin, rmax, theta_min=0, theta_max=(2*np.pi),
-                     z=0, rseed=None):
+                     z=0, rseed=None, rng=None):
     """Provide random samples of [x, y, z] for electrons in simulation.
     Positions are uniformly distributed in r. In z, positions are
     placed at the emitter.
@@ -186,20 +182,20 @@ def get_positions_RZ(num_samples, rmin, rmax, theta_min=0, theta_max=(2*np.pi),
         theta_min (float): Min angle (radians)
         theta_max (float): Max angle (radians)
         z (float): Position of the emitter on the z-axis (meters)
-        rseed (positive int): If specified, seed the random number generator.
-            Used for testing. The random number generator is set back at the
-            end of the function.
+        rseed (positive int): If specified, draw from a stream derived from
+            this seed only. Used for testing.
+        rng (np.random.Generator or np.random.RandomState): If specified,
+            draw from this generator and ignore rseed.
 
     Returns:
         positions (np.ndarray): Array of shape (num_samples, 3) with positions.
     """
-    if rseed is not None:
-        nprstate = np.random.get_state()
-        np.random.seed(rseed)
+    if rng is None:
+        rng = mwxrng.get_generator("positions", rseed)
 
     # Random r and theta positions
-    r = np.sqrt(np.random.uniform(rmin**2, rmax**2, num_samples))
-    theta = np.random.uniform(theta_min, theta_max, num_samples)
+    r = np.sqrt(rng.uniform(rmin**2, rmax**2, num_samples))
+    theta = rng.uniform(theta_min, theta_max, num_samples)
 
     # Transform to x and y
     x = r * np.cos(theta)
@@ -208,9 +204,6 @@ def get_positions_RZ(num_samples, rmin, rmax, theta_min=0, theta_max=(2*np.pi),
     # Fixed z
     z = np.ones_like(x) * z
 
-    if rseed is not None:
-        np.random.set_state(nprstate)
-
     return x, y, z
 
 
@@ -325,14 +318,21 @@ def plasma_Debye_length(T, n):
     )
 
 
-def get_vel_vector(v_mag):
+def get_vel_vector(v_mag, rng=None):
     """Function that returns a random velocity vector given a magnitude.
     The random point on a unit sphere is found according to
     https://math.stackexchange.com/questions/44689/how-to-find-a-random-
     axis-or-unit-vector-in-3d.
+
+    Arguments:
+        v_mag (np.ndarray): Velocity magnitudes.
+        rng (np.random.Generator or np.random.RandomState): Generator to draw
+            from. Defaults to a new "vel_vector" generator from ``mwxrng``.
     """
-    theta = np.random.rand(*v_mag.shape) * 2.0 * np.pi
-    z = 2.0 * np.random.rand(*v_mag.shape) - 1.0
+    if rng is None:
+        rng = mwxrng.get_generator("vel_vector")
+    theta = rng.random(v_mag.shape) * 2.0 * np.pi
+    z = 2.0 * rng.random(v_mag.shape) - 1.0
     vel_vectors = np.zeros(v_mag.shape + (3,))
     vel_vectors[..., 0] = np.sqrt(1.0 - z**2) * np.cos(theta)
     vel_vectors[..., 1] = np.sqrt(1.0 - z**2) * np.sin(theta)
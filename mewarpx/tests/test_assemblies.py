@@ -1,10 +1,13 @@
 """Test the mewarpx wrapper for embedded boundaries. This test is the same
 as the test in warpx/Examples/Tests/ElectrostaticSphereEB/inputs_3d but in 2d.
 """
+import collections
 import os
 
 import matplotlib.pyplot as plt
 import numpy as np
+import pytest
+from pywarpx import callbacks
 
 from mewarpx import assemblies, emission
 from mewarpx.diags_store.flux_diagnostic import SurfaceFluxDiag
@@ -336,3 +339,300 @@ def test_infinite_cylinder_z():
     key = ('scrape', 'anode', 'electrons')
     J_diode = run.fluxdiag.ts_dict[key].get_averagevalue_by_key('J')
     assert np.isclose(J_diode, 1.5039225852677167)
+
+
+def _near_surface_points(assembly, rng, npts, spread):
+    """Points scattered around the surface of an assembly, including its
+    corners for rectangles, and uniformly in the domain around it."""
+    if isinstance(assembly, assemblies.InfCylinderY):
+        theta = rng.uniform(0, 2*np.pi, npts)
+        r = assembly.radius + rng.normal(0, spread, npts)
+        X = assembly.center_x + r*np.cos(theta)
+        Z = assembly.center_z + r*np.sin(theta)
+    else:
+        # half of the points along the edges, half around the corners
+        t = rng.uniform(0, 1, npts)
+        X = np.where(
+            t < 0.5, assembly.xmin + 2*t*assembly.length_x,
+            rng.choice([assembly.xmin, assembly.xmax], npts)
+        )
+        Z = np.where(
+            t < 0.5, rng.choice([assembly.zmin, assembly.zmax], npts),
+            rng.choice([assembly.zmin, assembly.zmax], npts)
+        )
+        X = X + rng.normal(0, spread, npts)
+        Z = Z + rng.normal(0, spread, npts)
+    X = np.concatenate((X, rng.uniform(-0.5, 0.5, npts)))
+    Z = np.concatenate((Z, rng.uniform(0, 1, npts)))
+    return X, np.zeros_like(X), Z
+
+
+def test_baked_level_set():
+    """Baked isinside and calculatenormal agree with the analytic versions,
+    including next to surfaces and corners."""
+    grid = assemblies.LevelSetGrid(-0.5, 0.5, 0.0, 1.0, 1/256, 1/256)
+    rng = np.random.default_rng(40213)
+
+    cylinder = assemblies.InfCylinderY(
+        center_x=0.0, center_z=0.5, radius=0.1, V=0, T=300, WF=4.7,
+        name="cylinder", install_in_simulation=False,
+        read_scraped_particles=False
+    )
+    rectangle = assemblies.Rectangle(
+        center_x=0.2, center_z=0.4, length_x=0.2, length_z=0.4, V=0, T=300,
+        WF=1.2, name="rectangle", install_in_simulation=False,
+        read_scraped_particles=False
+    )
+
+    for assembly in [cylinder, rectangle]:
+        X, Y, Z = _near_surface_points(assembly, rng, 50000, 2e-3)
+        inside = [assembly.isinside(X, Y, Z, aura=aura) for aura in (0, 1e-3)]
+        nhat = assembly.calculatenormal(X, Y, Z)
+
+        assembly.bake_level_set(grid=grid)
+
+        for aura, ref in zip((0, 1e-3), inside):
+            assert np.array_equal(assembly.isinside(X, Y, Z, aura=aura), ref)
+        baked_nhat = assembly.calculatenormal(X, Y, Z)
+        if assembly is rectangle:
+            # region normals are exact, including across the diagonals
+            assert np.array_equal(baked_nhat, nhat)
+        else:
+            assert np.allclose(baked_nhat, nhat, rtol=0, atol=1e-3)
+
+    # Classifying particles against both baked assemblies at once matches
+    # the analytic results
+    X, Y, Z = [
+        np.concatenate(coords) for coords in zip(
+            _near_surface_points(cylinder, rng, 20000, 2e-3),
+            _near_surface_points(rectangle, rng, 20000, 2e-3)
+        )
+    ]
+    owners = assemblies.scrape_dispatcher._classify(
+        [cylinder, rectangle], X, Y, Z
+    )
+    ref_owners = np.full(len(X), -1)
+    ref_owners[rectangle.isinside.__wrapped__(rectangle, X, Y, Z) == 1] = 1
+    ref_owners[cylinder.isinside.__wrapped__(cylinder, X, Y, Z) == 1] = 0
+    assert np.array_equal(owners, ref_owners)
+
+
+class _MockBoundaryBuffers(object):
+
+    """Boundary buffers returning each particle once, like reads with a
+    cursor."""
+
+    def __init__(self, buffers):
+        self.buffers = buffers
+        self.reads = []
+
+    def particle_boundary_buffer_cursor(self):
+        return set()
+
+    def get_particle_boundary_buffer_since(self, species_name, label, cursor,
+                                           comp_names, level):
+        self.reads.append((species_name, label))
+        tiles = self.buffers.get((species_name, label), [])
+        new_tiles = [tile for ii, tile in enumerate(tiles) if ii not in cursor]
+        cursor.update(range(len(tiles)))
+        return {
+            comp: [np.array(tile[comp], dtype=float) for tile in new_tiles]
+            for comp in comp_names
+        }
+
+
+def test_scrape_dispatcher(monkeypatch):
+    """Each boundary buffer is read once per step, and particles are handed to
+    the assemblies they were scraped on."""
+    installed = []
+    monkeypatch.setattr(callbacks, "installbeforeEsolve", installed.append)
+
+    Species = collections.namedtuple("Species", ["name", "species_number"])
+    sim_ext = _MockBoundaryBuffers({
+        ("electrons", "eb"): [
+            # in the first cylinder, in the second one, and scraped earlier
+            {"step_scraped": [5, 5, 4], "x": [0.05, 0.3, 0.02],
+             "y": [0.5, 0.55, 0.5], "w": [1., 2., 3.]},
+            # inside neither cylinder
+            {"step_scraped": [5], "x": [-0.4], "y": [0.9], "w": [4.]},
+        ],
+        ("ions", "z_lo"): [
+            {"step_scraped": [5, 5], "x": [0.1, 0.2], "y": [0., 0.],
+             "w": [5., 6.]},
+        ],
+    })
+    monkeypatch.setattr(mwxrun, "geom_str", "XZ", raising=False)
+    monkeypatch.setattr(mwxrun, "lev", 0, raising=False)
+    monkeypatch.setattr(mwxrun, "get_it", lambda: 5)
+    monkeypatch.setattr(mwxrun, "sim_ext", sim_ext, raising=False)
+    monkeypatch.setattr(mwxrun, "simulation", collections.namedtuple(
+        "Simulation", ["species"])(species=[
+            Species("electrons", 0), Species("ions", 1)
+        ]), raising=False
+    )
+
+    cylinder1 = assemblies.InfCylinderY(
+        center_x=0.0, center_z=0.5, radius=0.1, V=0, T=300, WF=4.7,
+        name="cylinder1", install_in_simulation=False,
+        read_scraped_particles=False
+    )
+    cylinder2 = assemblies.InfCylinderY(
+        center_x=0.3, center_z=0.5, radius=0.1, V=0, T=300, WF=4.7,
+        name="cylinder2", install_in_simulation=False,
+        read_scraped_particles=False
+    )
+    plane = assemblies.ZPlane(
+        z=0.0, zsign=-1, V=0, T=300, WF=4.7, name="plane",
+        read_scraped_particles=False
+    )
+    plane.scraper_label = 'z_lo'
+
+    scraped = collections.defaultdict(list)
+    dispatcher = assemblies.ScrapeDispatcher()
+    for assembly in [cylinder1, cylinder2, plane]:
+        assembly.add_diag_fn(
+            lambda lpdict, name=assembly.name: scraped[name].append(
+                {key: np.array(val) for key, val in lpdict.items()}
+            ),
+            ['x', 'z', 'w']
+        )
+        dispatcher.register(assembly)
+    assert installed == [dispatcher.dispatch]
+
+    dispatcher.dispatch()
+    # one read per (species, boundary), shared by both cylinders
+    assert sorted(sim_ext.reads) == [
+        ("electrons", "eb"), ("electrons", "z_lo"),
+        ("ions", "eb"), ("ions", "z_lo"),
+    ]
+    for name, x, z, w, species_id in [
+        ("cylinder1", [0.05], [0.5], [1.], [0]),
+        ("cylinder2", [0.3], [0.55], [2.], [0]),
+        ("plane", [0.1, 0.2], [0., 0.], [5., 6.], [1, 1]),
+    ]:
+        lpdict = scraped[name][-1]
+        assert np.allclose(lpdict['x'], x)
+        assert np.allclose(lpdict['z'], z)
+        assert np.allclose(lpdict['w'], w)
+        assert np.array_equal(lpdict['step_scraped'], [5] * len(x))
+        assert np.array_equal(lpdict['species_id'], species_id)
+
+    # Nothing new is read on the next step
+    dispatcher.dispatch()
+    assert len(sim_ext.reads) == 8
+    for name in ["cylinder1", "cylinder2", "plane"]:
+        assert len(scraped[name]) == 2
+        assert len(scraped[name][-1]['x']) == 0
+
+    # Assemblies recording particles need a scraper label
+    unlabeled = assemblies.ZPlane(
+        z=1.0, zsign=1, V=0, T=300, WF=4.7, name="unlabeled",
+        read_scraped_particles=False
+    )
+    unlabeled.add_diag_fn(lambda lpdict: None, ['w'])
+    dispatcher.register(unlabeled)
+    with pytest.raises(AttributeError, match="does not have a scraper label"):
+        dispatcher.dispatch()
+
+
+def test_boundary_buffer_cursor():
+    name = "boundary_buffer_cursor"
+    # Include a random run number to allow parallel runs to not collide. Using
+    # python randint prevents collisions due to numpy rseed below
+    testing_util.initialize_testingdir(name)
+
+    np.random.seed(42147820)
+
+    D_CA = 0.025  # m
+    run = diode_setup.DiodeRun_V1(
+        GEOM_STR='XZ',
+        D_CA=D_CA,
+        NX=64,
+        NZ=64,
+        DT=1e-10,
+        TOTAL_TIMESTEPS=10,
+        DIAG_STEPS=10,
+        INERT_GAS_TYPE='positron'
+    )
+    run.setup_run(
+        init_conductors=False,
+        init_scraper=False,
+        init_electrons=True,
+        init_inert_gas=True,
+        init_solver=False,
+        init_injectors=False,
+        init_simcontrol=True,
+        init_simulation=False
+    )
+
+    assemblies.InfCylinderY(
+        center_x=0.0, center_z=0.5*D_CA, radius=0.1*D_CA,
+        V=-0.5, T=300, WF=4.7, name="Cylinder"
+    )
+
+    run.init_solver()
+    run.init_conductors()
+    run.electrons.save_particles_at_eb = 1
+
+    volemitter = emission.ZSinDistributionVolumeEmitter(
+        T=3000, zmin=0, zmax=run.D_CA,
+    )
+    emission.PlasmaInjector(
+        emitter=volemitter, species1=run.electrons, species2=run.ions,
+        npart=4000, plasma_density=1e14,
+    )
+
+    run.init_simulation()
+    run.init_warpx()
+
+    # Read the buffer with a separate cursor each step and compare to a full
+    # read of the buffer, then check that reading again gives nothing new.
+    cursor = mwxrun.sim_ext.particle_boundary_buffer_cursor()
+    results = []
+
+    def _concatenate(arrays):
+        return np.concatenate(arrays) if len(arrays) else np.zeros(0)
+
+    def check_cursor():
+        new = mwxrun.sim_ext.get_particle_boundary_buffer_since(
+            run.electrons.name, 'eb', cursor, ['w', 'step_scraped']
+        )
+        full = mwxrun.sim_ext.get_particle_boundary_buffer(
+            run.electrons.name, 'eb', 'w', 0
+        )
+        again = mwxrun.sim_ext.get_particle_boundary_buffer_since(
+            run.electrons.name, 'eb', cursor, ['w']
+        )
+        results.append((
+            np.sort(_concatenate(new['w'])), np.sort(_concatenate(full)),
+            len(_concatenate(again['w']))
+        ))
+
+    callbacks.installbeforeEsolve(check_cursor)
+    run.control.run()
+
+    assert sum(len(new_w) for new_w, _, _ in results) > 0
+    for new_w, full_w, nagain in results:
+        assert np.array_equal(new_w, full_w)
+        assert nagain == 0
+
+
+def test_boundary_buffer_cursor_offsets():
+    """The per tile offsets of a cursor are only used while the tiles are
+    unchanged; otherwise the cursor falls back to selection by step."""
+    cursor = mwxrun.sim_ext.particle_boundary_buffer_cursor()
+    # first read: everything in the buffer is new
+    assert cursor.get_tile_offsets(2, reorder_count=0) == [0, 0]
+
+    cursor.tile_offsets = [3, 5]
+    cursor.reorder_count = 0
+    assert cursor.get_tile_offsets(2, reorder_count=0) == [3, 5]
+    # a tile was added or removed so the offsets can't be matched to tiles
+    assert cursor.get_tile_offsets(3, reorder_count=0) is None
+    assert cursor.get_tile_offsets(1, reorder_count=0) is None
+    # the particles were redistributed
+    assert cursor.get_tile_offsets(2, reorder_count=1) is None
+
+    # nothing was left in the buffer at the previous read
+    cursor.tile_offsets = []
+    assert cursor.get_tile_offsets(4, reorder_count=0) == [0, 0, 0, 0]
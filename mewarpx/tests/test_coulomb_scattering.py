@@ -30,6 +30,8 @@ def test_coulomb_scattering():
         get_velocities function when sampling velocities for the electrons since
         we want to inject them with a delta function."""
 
+        supports_velocity_only_draw = False
+
         def __init__(self, T, v_beam):
 
             self.v_beam = v_beam
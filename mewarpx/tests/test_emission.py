@@ -134,6 +134,147 @@ def test_thermionic_emission_with_Schottky():
     assert np.allclose(net_rho_grid, ref_rho_grid, rtol=5e-4)
 
 
+def test_thermionic_injector_handle():
+    name = "thermionicInjectorHandle"
+    # Include a random run number to allow parallel runs to not collide.  Using
+    # python randint prevents collisions due to numpy rseed below
+    testing_util.initialize_testingdir(name)
+
+    # Initialize each run with consistent, randomly-chosen, rseed.
+    np.random.seed(83612954)
+
+    DT = 0.5e-12 # s
+
+    run = diode_setup.DiodeRun_V1(
+        GEOM_STR='XZ',
+        CATHODE_TEMP=1100 + 273.15,
+        CATHODE_PHI=2.1,
+        USE_SCHOTTKY=True,
+        V_ANODE_CATHODE=25,
+        D_CA=5e-4,
+        NPPC=10,
+        NX=8,
+        NZ=32,
+        DIRECT_SOLVER=True,
+        DT=DT,
+        TOTAL_TIMESTEPS=2,
+        DIAG_STEPS=2,
+        DIAG_INTERVAL=2*DT
+    )
+    run.setup_run(
+        init_conductors=True,
+        init_scraper=False,
+        init_warpx=True
+    )
+
+    # The injection handle is created on the first injection and reused after
+    assert run.injector.particle_injector is None
+    mwxrun.simulation.step(1)
+    handle = run.injector.particle_injector
+    assert handle is not None
+    npart = mwxrun.sim_ext.get_particle_count(run.electrons.name)
+    assert npart > 0
+
+    mwxrun.simulation.step(1)
+    assert run.injector.particle_injector is handle
+    assert mwxrun.sim_ext.get_particle_count(run.electrons.name) > npart
+
+    # Injected particles carry their energy, and the Schottky injection moved
+    # all of them out of the temporary injection species
+    E_total = run.electrons.get_array_from_pid('E_total')
+    assert all(np.all(arr > 0) for arr in E_total)
+    assert mwxrun.sim_ext.get_particle_count(
+        run.injector.injection_species.name) == 0
+
+
+def test_inject_Schottky_particles():
+    name = "injectSchottkyParticles"
+    # Include a random run number to allow parallel runs to not collide.  Using
+    # python randint prevents collisions due to numpy rseed below
+    testing_util.initialize_testingdir(name)
+
+    # Initialize each run with consistent, randomly-chosen, rseed.
+    np.random.seed(52917304)
+
+    DT = 0.5e-12 # s
+
+    run = diode_setup.DiodeRun_V1(
+        GEOM_STR='XZ',
+        CATHODE_TEMP=1100 + 273.15,
+        CATHODE_PHI=2.1,
+        USE_SCHOTTKY=True,
+        V_ANODE_CATHODE=25,
+        D_CA=5e-4,
+        NPPC=10,
+        NX=8,
+        NZ=32,
+        DIRECT_SOLVER=True,
+        DT=DT,
+        TOTAL_TIMESTEPS=1,
+        DIAG_STEPS=1,
+        DIAG_INTERVAL=DT
+    )
+    run.setup_run(
+        init_conductors=True,
+        init_scraper=False,
+        init_warpx=True
+    )
+    src_name = run.injector.injection_species.name
+    dst_name = run.electrons.name
+
+    # Add particles just above the cathode to the temporary injection species
+    npart = 200
+    weight = 3.0
+    vz = 1e5
+    zeros = np.zeros(npart)
+    mwxrun.sim_ext.add_particles(
+        src_name,
+        x=np.random.uniform(mwxrun.xmin, mwxrun.xmax, npart),
+        y=zeros,
+        z=np.full(npart, 0.1 * mwxrun.dz),
+        ux=zeros, uy=zeros, uz=np.full(npart, vz),
+        w=np.full(npart, weight),
+        E_total=zeros, norm_id=zeros,
+        unique_particles=True
+    )
+    normal_table = np.array([[0., 0., 1.]])
+    m = picmi.constants.m_e
+
+    # Without enhancement the weights are kept, and the energy sums the
+    # kinetic and potential energy of every particle
+    qV = picmi.constants.q_e * 0.5
+    moved, total_weight, total_energy = mwxrun.inject_Schottky_particles(
+        src_name, dst_name, 0.0, normal_table=normal_table, m=m, qV=qV
+    )
+    assert moved == npart
+    assert np.isclose(total_weight, npart * weight)
+    assert np.isclose(
+        total_energy, npart * weight * (0.5 * m * vz**2 + qV), rtol=1e-6
+    )
+    assert mwxrun.sim_ext.get_particle_count(src_name) == 0
+    assert mwxrun.sim_ext.get_particle_count(dst_name) == npart
+    w = np.concatenate(mwxrun.sim_ext.get_particle_weight(dst_name))
+    assert np.allclose(w, weight)
+
+    # The enhancement never lowers the weights
+    mwxrun.sim_ext.add_particles(
+        src_name,
+        x=np.random.uniform(mwxrun.xmin, mwxrun.xmax, npart),
+        y=zeros,
+        z=np.full(npart, 0.1 * mwxrun.dz),
+        ux=zeros, uy=zeros, uz=np.full(npart, vz),
+        w=np.full(npart, weight),
+        E_total=zeros, norm_id=zeros,
+        unique_particles=True
+    )
+    moved, total_weight, _ = mwxrun.inject_Schottky_particles(
+        src_name, dst_name, 1.0e3, normal_table=normal_table, m=m, qV=0.0
+    )
+    assert moved == npart
+    assert total_weight >= npart * weight
+    assert mwxrun.sim_ext.get_particle_count(dst_name) == 2 * npart
+
+
 def test_vacuum_thermionic_diode():
     name = "vacuum_thermionic_diode"
     # Include a random run number to allow parallel runs to not collide. Using
@@ -417,6 +558,13 @@ def test_zcylinder_emitter():
         testname="zcylinder_emitter", df=df, margin=0.3
     )
 
+    # The normals vary continuously, so each particle has its own row
+    x, y, z = res_dict['x'], res_dict['y'], res_dict['z']
+    normal_table, normal_ids = emitter.get_normal_ids(x, y, z)
+    assert normal_table.shape == (len(x), 3)
+    assert np.array_equal(normal_ids, np.arange(len(x)))
+    assert np.allclose(normal_table[normal_ids], emitter.get_normals(x, y, z))
+
 
 def test_rectangle_emitter():
     name = "rectangleEmitter"
@@ -488,6 +636,63 @@ def test_rectangle_emitter():
     assert os.path.exists(plotfile)
 
 
+def test_normal_ids():
+    name = "normalIds"
+    # Include a random run number to allow parallel runs to not collide.  Using
+    # python randint prevents collisions due to numpy rseed below
+    testing_util.initialize_testingdir(name)
+
+    np.random.seed(61830275)
+
+    mwxrun.init_grid(
+        lower_bound=[0, 0], upper_bound=[0.6, 1], number_of_cells=[20, 20],
+        min_tiles=16
+    )
+    solver = picmi.ElectrostaticSolver(
+        grid=mwxrun.grid, method='Multigrid', required_precision=1e-6
+    )
+
+    T_rectangle = 2173.15 # K
+    rectangle = assemblies.Rectangle(
+        center_x=0.2, center_z=0.4, length_x=0.2, length_z=0.4, V=0,
+        T=T_rectangle, WF=1.2, name="rectangle")
+    cathode = assemblies.ZPlane(
+        z=0.0, zsign=-1, V=0, T=T_rectangle, WF=1.2, name="cathode"
+    )
+
+    electrons = mespecies.Species(particle_type='electron', name='electrons')
+
+    mwxrun.simulation.solver = solver
+    mwxrun.init_run()
+
+    # The normal of each particle is the row of the table given by its id
+    emitter = emission.ArbitraryEmitter2D(
+        conductor=rectangle, T=T_rectangle, res_fac=10
+    )
+    res_dict = emitter.get_newparticles(
+        1000, 1, electrons.sq, electrons.sm, randomdt=False, velhalfstep=False
+    )
+    x, y, z = res_dict['x'], res_dict['y'], res_dict['z']
+    normal_table, normal_ids = emitter.get_normal_ids(x, y, z)
+    assert normal_table.shape[1] == 3
+    assert normal_ids.shape == x.shape
+    assert np.array_equal(normal_table[normal_ids], emitter.get_normals(x, y, z))
+    # Only a few distinct normals on the sides of a rectangle
+    assert len(normal_table) < 10
+    assert len(np.unique(normal_table, axis=0)) == len(normal_table)
+
+    # Planar emitters have a single normal
+    emitter = emission.ZPlaneEmitter(conductor=cathode, T=T_rectangle)
+    res_dict = emitter.get_newparticles(
+        100, 1, electrons.sq, electrons.sm, randomdt=False, velhalfstep=False
+    )
+    x, y, z = res_dict['x'], res_dict['y'], res_dict['z']
+    normal_table, normal_ids = emitter.get_normal_ids(x, y, z)
+    assert normal_table.shape == (1, 3)
+    assert np.all(normal_ids == 0)
+    assert np.allclose(normal_table[normal_ids], emitter.get_normals(x, y, z))
+
+
 def test_plasma_injector():
     name = "plasmainjector"
     # Include a random run number to allow parallel runs to not collide.  Using
@@ -674,6 +879,227 @@ def test_plasma_injector_fixedT2():
     assert testing_util.test_df_vs_ref(testname=name, df=df, margin=0.3)
 
 
+def test_get_newparticles_multi():
+    name = "getnewparticles_multi"
+    # Include a random run number to allow parallel runs to not collide.  Using
+    # python randint prevents collisions due to numpy rseed below
+    testing_util.initialize_testingdir(name)
+
+    np.random.seed(30571924)
+
+    run = diode_setup.DiodeRun_V1(
+        GEOM_STR='XZ', PERIOD=0.8e-06*256, D_CA=0.8e-06*256, DT=1e-12,
+        TOTAL_TIMESTEPS=1
+    )
+    run.setup_run(init_inert_gas=True, init_scraper=False, init_injectors=False)
+    run.init_warpx()
+
+    class FixedVelocityEmitter(emission.UniformDistributionVolumeEmitter):
+
+        """Emitter overriding _get_xv_coords, to give every particle the
+        same velocity."""
+
+        supports_velocity_only_draw = False
+
+        def _get_xv_coords(self, npart, m, rseed):
+            x, y, z, vx, vy, vz = super()._get_xv_coords(npart, m, rseed)
+            return x, y, z, np.zeros(npart), np.zeros(npart), np.full(npart, m)
+
+    species_params = [
+        (run.electrons.sq, run.electrons.sm, None),
+        (run.ions.sq, run.ions.sm, 800.0),
+    ]
+
+    emitter = emission.UniformDistributionVolumeEmitter(
+        T=1550, zmin=0, zmax=run.D_CA,
+    )
+    electron_dict, ion_dict = emitter.get_newparticles_multi(
+        1000, 1, species_params, rseed=5, randomdt=False, velhalfstep=False
+    )
+    # The first species matches get_newparticles with the same seed
+    ref_dict = emitter.get_newparticles(
+        1000, 1, run.electrons.sq, run.electrons.sm, rseed=5,
+        randomdt=False, velhalfstep=False
+    )
+    for key in ['x', 'y', 'z', 'vx', 'vy', 'vz', 'w']:
+        assert np.array_equal(electron_dict[key], ref_dict[key])
+    # Both species share the positions, but not the velocities
+    for key in ['x', 'y', 'z', 'w']:
+        assert np.array_equal(ion_dict[key], electron_dict[key])
+    assert not np.allclose(ion_dict['vx'], electron_dict['vx'])
+    # Ion velocities are thermal at their own temperature
+    assert np.isclose(
+        np.std(ion_dict['vx']),
+        np.sqrt(picmi.constants.kb * 800.0 / run.ions.sm), rtol=0.1
+    )
+
+    # Velocities of an emitter overriding _get_xv_coords come from it for
+    # every species
+    emitter = FixedVelocityEmitter(T=1550, zmin=0, zmax=run.D_CA)
+    particle_dicts = emitter.get_newparticles_multi(
+        1000, 1, species_params, rseed=5, randomdt=False, velhalfstep=False
+    )
+    for (_, m, _), particle_dict in zip(species_params, particle_dicts):
+        assert np.all(particle_dict['vx'] == 0)
+        assert np.all(particle_dict['vz'] == m)
+
+    # Without seeds the global random state is drawn from in the same order
+    # as separate get_newparticles calls, so seeded results don't change
+    emitter = emission.UniformDistributionVolumeEmitter(
+        T=1550, zmin=0, zmax=run.D_CA,
+    )
+    np.random.seed(8312)
+    electron_dict, ion_dict = emitter.get_newparticles_multi(
+        1000, 1, species_params[:1] + [(run.ions.sq, run.ions.sm, None)],
+        randomdt=False, velhalfstep=False
+    )
+    np.random.seed(8312)
+    ref_dicts = [
+        emitter.get_newparticles(
+            1000, 1, q, m, randomdt=False, velhalfstep=False
+        )
+        for q, m in [
+            (run.electrons.sq, run.electrons.sm), (run.ions.sq, run.ions.sm)
+        ]
+    ]
+    for key in ['x', 'y', 'z', 'vx', 'vy', 'vz', 'w']:
+        assert np.array_equal(electron_dict[key], ref_dicts[0][key])
+    for key in ['vx', 'vy', 'vz']:
+        assert np.array_equal(ion_dict[key], ref_dicts[1][key])
+
+
+def test_local_injection():
+    name = "local_injection"
+    # Include a random run number to allow parallel runs to not collide.  Using
+    # python randint prevents collisions due to numpy rseed below
+    testing_util.initialize_testingdir(name)
+
+    np.random.seed(48120573)
+
+    run = diode_setup.DiodeRun_V1(
+        GEOM_STR='XZ', PERIOD=0.8e-06*256, D_CA=0.8e-06*256, DT=1e-12,
+        TOTAL_TIMESTEPS=1
+    )
+    run.setup_run(init_inert_gas=True, init_scraper=False, init_injectors=False)
+    run.init_warpx()
+
+    surfaceemitter = emission.ZPlaneEmitter(
+        conductor=run.cathode, T=run.CATHODE_TEMP, ymin=0.0, ymax=0.0,
+        transverse_fac=1.0,
+    )
+    volemitter = emission.UniformDistributionVolumeEmitter(
+        T=1550, zmin=0, zmax=run.D_CA,
+    )
+
+    # Split the domain in two boxes along x, and add a box above the cathode
+    xmid = 0.5*(mwxrun.xmin + mwxrun.xmax)
+    zmid = 0.5*(mwxrun.zmin + mwxrun.zmax)
+    box_bounds = np.array([
+        [[mwxrun.xmin, xmid], [-np.inf, np.inf], [mwxrun.zmin, zmid]],
+        [[xmid, mwxrun.xmax], [-np.inf, np.inf], [mwxrun.zmin, zmid]],
+        [[mwxrun.xmin, mwxrun.xmax], [-np.inf, np.inf], [zmid, mwxrun.zmax]],
+    ])
+
+    # The cathode plane is only in the lower boxes, which split its area
+    regions, measures = surfaceemitter._get_local_regions(box_bounds)
+    assert len(regions) == 2
+    assert np.isclose(np.sum(measures), surfaceemitter.area)
+    assert np.isclose(regions[0][1], xmid) and np.isclose(regions[1][0], xmid)
+
+    # The volume is split between all three boxes
+    regions, measures = volemitter._get_local_regions(box_bounds)
+    assert len(regions) == 3
+    assert np.isclose(np.sum(measures), volemitter.volume)
+
+    # On a single processor all particles are injected locally, inside the
+    # emitter bounds
+    for emitter in [surfaceemitter, volemitter]:
+        npart = emitter.compute_local_npart(1000)
+        assert npart == 1000
+        particle_dict = emitter.get_newparticles(
+            npart, 1, run.electrons.sq, run.electrons.sm, rseed=3,
+            randomdt=False, velhalfstep=False, local=True
+        )
+        assert len(particle_dict['x']) == npart
+        bounds = np.array(emitter.bounds).reshape(-1, 2)
+        assert np.all(particle_dict['x'] >= bounds[0, 0])
+        assert np.all(particle_dict['x'] <= bounds[0, 1])
+
+    # Local injection needs unique particles
+    with pytest.raises(ValueError, match="requires unique_particles"):
+        emission.FixedNumberInjector(
+            surfaceemitter, run.electrons, npart=100, injectfreq=1,
+            unique_particles=False, local_injection=True
+        )
+
+
+def test_particle_prefetcher():
+    prefetcher = emission.ParticlePrefetcher()
+    assert not prefetcher.pending
+
+    with pytest.raises(RuntimeError, match="No batch has been submitted"):
+        prefetcher.collect()
+
+    prefetcher.submit(np.arange, 5)
+    assert prefetcher.pending
+    with pytest.raises(RuntimeError, match="has not been collected"):
+        prefetcher.submit(np.arange, 3)
+    assert np.array_equal(prefetcher.collect(), np.arange(5))
+    assert not prefetcher.pending
+
+    # Errors in the worker thread are raised when collecting
+    def fail():
+        raise ValueError("sampling failed")
+
+    prefetcher.submit(fail)
+    with pytest.raises(ValueError, match="sampling failed"):
+        prefetcher.collect()
+
+    prefetcher.submit(np.arange, 5)
+    prefetcher.shutdown()
+    assert not prefetcher.pending
+
+
+def test_prefetched_injection():
+    name = "prefetched_injection"
+    # Include a random run number to allow parallel runs to not collide.  Using
+    # python randint prevents collisions due to numpy rseed below
+    testing_util.initialize_testingdir(name)
+
+    np.random.seed(72950316)
+
+    run = diode_setup.DiodeRun_V1(
+        GEOM_STR='XZ', PERIOD=0.8e-06*256, D_CA=0.8e-06*256, DT=1e-12,
+        TOTAL_TIMESTEPS=3
+    )
+    run.setup_run(init_inert_gas=True, init_scraper=False, init_injectors=False)
+
+    emitter = emission.UniformDistributionVolumeEmitter(
+        T=1550, zmin=0, zmax=run.D_CA,
+    )
+    injector = emission.FixedNumberInjector(
+        emitter, run.electrons, npart=500, injectfreq=1, injectoffset=0,
+        weight=1., prefetch=True
+    )
+    run.init_warpx()
+
+    # Each injection collects the prefetched batch and starts the next one
+    assert not injector.prefetcher.pending
+    mwxrun.simulation.step(1)
+    assert injector.prefetcher.pending
+    mwxrun.simulation.step(2)
+    assert injector.prefetcher.pending
+    # A few particles near the domain edges may already have been absorbed
+    npart = mwxrun.sim_ext.get_particle_count(run.electrons.name)
+    assert 2 * 500 < npart <= 3 * 500
+
+    # Prefetched particles get their energy on the main thread
+    E_total = run.electrons.get_array_from_pid('E_total')
+    assert all(np.all(arr > 0) for arr in E_total)
+
+    injector.prefetcher.shutdown()
+
+
 def test_arbitrary_distribution_emitter():
     """Seeds the simulation with a parabolic cylinder distribution"""
     name = "arbitrary_distribution_emitter"
@@ -819,3 +1245,76 @@ def test_patchy_vacuum_diode():
     ref_electron_density = np.load(
         os.path.join(ref_path, "electrons_particle_density.npy"))
     assert np.allclose(electron_density, ref_electron_density)
+
+
+@pytest.mark.parametrize(
+    ("x_start", "xmin", "xmax"),
+    [
+        (0.0, -2.3e-6, 2.3e-6),
+        (1e-6, -2.3e-6, 2.3e-6),
+        (0.0, -4.1e-6, 3.1e-6),
+        (1e-6, -0.5e-6, 5.5e-6),
+        (0.0, -10.3e-6, 12.7e-6),
+    ]
+)
+def test_patch_set_map_to_patches(monkeypatch, x_start, xmin, xmax):
+    """The closed form mapping onto the patches gives the same positions as
+    shifting them at every patch boundary in turn."""
+    patch_size = 1e-6
+    monkeypatch.setattr(mwxrun, 'xmin', xmin, raising=False)
+    monkeypatch.setattr(mwxrun, 'xmax', xmax, raising=False)
+
+    patch_set = emission.ZPlanePatchSet.__new__(emission.ZPlanePatchSet)
+    patch_set.conductor = collections.namedtuple(
+        'Conductor', ['x_start', 'patch_size'])(x_start, patch_size)
+
+    # Include positions beyond the sampled range. Positions exactly on a
+    # patch edge may round to either side, so they are left out.
+    rng = np.random.default_rng(5193)
+    x = np.concatenate((
+        rng.uniform(xmin, xmax, 1000),
+        (np.arange(-6, 7) + 0.5) * patch_size
+    ))
+
+    # Reference: shift positions at each patch boundary in the domain
+    x_ref = x + x_start
+    point = x_start + patch_size
+    while point < xmax:
+        x_ref[x_ref > point] += patch_size
+        point += 2.0*patch_size
+    point = x_start
+    while point > xmin:
+        x_ref[x_ref < point] -= patch_size
+        point -= 2.0*patch_size
+
+    assert np.allclose(patch_set._map_to_patches(x), x_ref, rtol=0, atol=1e-18)
+
+
+def test_alias_table():
+    """Indices drawn from an alias table follow the weights, and indices of
+    zero weight are never drawn."""
+    rng = np.random.default_rng(2741)
+    weights = rng.random(50)
+    weights[[3, 17]] = 0.0
+
+    alias_table = emission._build_alias_table(weights)
+    idx = emission._draw_alias(alias_table, rng, 2000000)
+
+    counts = np.bincount(idx, minlength=len(weights))
+    assert counts[3] == 0 and counts[17] == 0
+    assert np.allclose(
+        counts / len(idx), weights / np.sum(weights), rtol=0, atol=1e-3
+    )
+
+
+def test_arbitrary_emitter_rotation_coefficients():
+    """The cached rotation coefficients rotate z-hat onto each normal."""
+    angles = np.linspace(-np.pi, np.pi, 37)
+    nhat = np.column_stack((np.sin(angles), np.cos(angles)))
+
+    cos_theta, sin_theta = (
+        emission.ArbitraryEmitter2D.get_rotation_coefficients(nhat)
+    )
+    # Rotation of z-hat = (vx, vz) = (0, 1)
+    assert np.allclose(sin_theta, nhat[:, 0], atol=1e-12)
+    assert np.allclose(cos_theta, nhat[:, 1], atol=1e-12)
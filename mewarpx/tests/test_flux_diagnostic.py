@@ -1,3 +1,4 @@
+import collections
 import logging
 import os
 import re
@@ -5,11 +6,13 @@ import re
 import dill
 import numpy as np
 import pandas
+import pytest
 
-from mewarpx.diags_store import flux_diagnostic, timeseries
+from mewarpx.diags_store import (flux_diagnostic, flux_ledger, flux_records,
+                                  timeseries)
 from mewarpx.mwxrun import mwxrun
 from mewarpx.setups_store import diode_setup
-from mewarpx.utils_store import testing_util
+from mewarpx.utils_store import parallel_util, testing_util
 from mewarpx.utils_store import util as mwxutil
 
 
@@ -43,6 +46,167 @@ def test_timeseries():
     ))
 
 
+def test_flux_ledger(monkeypatch):
+    # Mock two processors recording the same data, and count the reductions
+    reductions = []
+
+    def parallelsum(array):
+        reductions.append(array.shape)
+        return 2 * array
+
+    step = [13]
+    monkeypatch.setattr(parallel_util, "parallelsum", parallelsum)
+    monkeypatch.setattr(mwxrun, "get_it", lambda: step[0])
+    monkeypatch.setattr(
+        mwxrun, "simulation", collections.namedtuple(
+            "Simulation", ["species"])(species=["electrons", "ions"]),
+        raising=False
+    )
+
+    ledger = flux_ledger.FluxLedger(capacity=2)
+    injector_id = ledger.register()
+    surface_id = ledger.register()
+
+    # Fields are t, step, species_id, V_e, n, q, E_total
+    ledger.append(injector_id, [1e-12, 10, 0, 0.5, 4, -2e-19, 3.0])
+    ledger.append(injector_id, np.array([
+        [1e-12, 10, 0, 0.5, 1, -1e-19, 1.0],
+        [3e-12, 12, 1, 0.7, 2, 3e-19, 5.0],
+    ]))
+    ledger.append(surface_id, [2e-12, 11, 1, 0.0, 6, 1e-19, 2.0])
+
+    with pytest.raises(ValueError, match="Rows of 3 fields"):
+        ledger.append(surface_id, [1e-12, 10, 0])
+    with pytest.raises(ValueError, match="before step 10"):
+        ledger.append(surface_id, [1e-12, 9, 0, 0.0, 1, 1e-19, 1.0])
+
+    # Rows of the same species and step are added, and rows are ordered by
+    # step
+    rows = ledger.get_rows(injector_id)
+    assert list(rows.keys()) == ledger.fields
+    assert np.array_equal(rows['step'], [10, 12])
+    assert np.array_equal(rows['species_id'], [0, 1])
+    assert np.allclose(rows['t'], [1e-12, 3e-12])
+    assert np.allclose(rows['V_e'], [0.5, 0.7])
+    assert np.allclose(rows['n'], [10, 4])
+    assert np.allclose(rows['q'], [-6e-19, 6e-19])
+    assert np.allclose(rows['E_total'], [8.0, 10.0])
+
+    # All sources are summed over processors with a single reduction, of all
+    # steps up to the current one
+    rows = ledger.get_rows(surface_id, clear=True)
+    assert np.array_equal(rows['step'], [11])
+    assert np.allclose(rows['n'], [12])
+    assert reductions == [(2, 2, 4, 4)]
+
+    # Cleared sources stay empty until new data is recorded
+    assert len(ledger.get_rows(surface_id)['step']) == 0
+    assert len(reductions) == 1
+    step[0] = 14
+    ledger.append(surface_id, [4e-12, 14, 0, 0.0, 1, 1e-19, 1.0])
+    rows = ledger.get_rows(surface_id, clear=True)
+    assert np.array_equal(rows['step'], [14])
+    assert len(reductions) == 2
+
+    # Once all sources are cleared a new period starts
+    ledger.get_rows(injector_id, clear=True)
+    assert ledger.step_begin is None
+    ledger.append(injector_id, [5e-12, 15, 0, 0.5, 1, -1e-19, 1.0])
+    assert ledger.step_begin == 15
+
+
+def test_group_by_species():
+    columns = collections.OrderedDict([
+        ('step', np.array([1, 1, 2, 2, 3, 3])),
+        ('species_id', np.array([1, 0, 1, 0, 2, 1])),
+        ('n', np.array([1., 2., 3., 4., 5., 6.])),
+    ])
+
+    species_columns = flux_diagnostic.group_by_species(columns)
+    assert sorted(species_columns.keys()) == [0, 1, 2]
+    # The rows of each species keep their order
+    assert list(species_columns[1].keys()) == ['step', 'species_id', 'n']
+    assert np.array_equal(species_columns[1]['step'], [1, 2, 3])
+    assert np.array_equal(species_columns[1]['n'], [1., 3., 6.])
+    assert np.array_equal(species_columns[0]['n'], [2., 4.])
+    assert np.array_equal(species_columns[2]['n'], [5.])
+    assert np.all(species_columns[0]['species_id'] == 0)
+
+    assert flux_diagnostic.group_by_species(
+        {'species_id': np.zeros(0, dtype=int), 'n': np.zeros(0)}
+    ) == {}
+
+    # Columns are summed per species, except for the step and time columns
+    diag = flux_diagnostic.ParticleCSVDiag.__new__(
+        flux_diagnostic.ParticleCSVDiag
+    )
+    accumulate_dict = {('n', 0): 10.}
+    diag._accumulate_columns(columns, accumulate_dict=accumulate_dict)
+    assert accumulate_dict == {('n', 0): 16., ('n', 1): 10., ('n', 2): 5.}
+
+
+def test_flux_records():
+    name = "flux_records"
+    # Include a random run number to allow parallel runs to not collide.  Using
+    # python randint prevents collisions due to numpy rseed below
+    testing_util.initialize_testingdir(name)
+
+    path = "surface" + flux_records.RECORD_EXTENSION
+
+    def rows(steps):
+        steps = np.asarray(steps)
+        return collections.OrderedDict([
+            ('step', steps.astype(np.int64)),
+            ('species_id', np.zeros(len(steps), dtype=np.int16)),
+            ('n', 2. * steps),
+        ])
+
+    writer = flux_records.FluxRecordWriter(path)
+    writer.append(rows([1, 2, 3]))
+    writer.append(rows([]))
+    writer.append(rows([4, 6]))
+
+    records = flux_records.FluxRecordFile(path)
+    assert len(records) == 5
+    assert records.fields == ['step', 'species_id', 'n']
+    assert records.dtype['species_id'] == np.int16
+
+    # Range queries include step_begin and exclude step_end
+    columns = records.get_records(step_begin=2, step_end=6)
+    assert np.array_equal(columns['step'], [2, 3, 4])
+    assert np.array_equal(columns['n'], [4., 6., 8.])
+    assert np.array_equal(
+        records.get_records(step_begin=5)['step'], [6]
+    )
+    assert np.array_equal(records.get_records(step_end=2)['step'], [1])
+    del records, columns
+
+    # After a restart from step 4 the rows written since are replaced
+    writer = flux_records.FluxRecordWriter(path)
+    writer.append(rows([4, 5]))
+    records = flux_records.FluxRecordFile(path)
+    assert np.array_equal(records.get_records()['step'], [1, 2, 3, 4, 5])
+    del records
+
+    # A partially written record is dropped when the file is reopened
+    with open(path, 'ab') as wfile:
+        wfile.write(b'\1\2\3')
+    assert len(flux_records.FluxRecordFile(path)) == 5
+    writer = flux_records.FluxRecordWriter(path)
+    writer.append(rows([6]))
+    records = flux_records.FluxRecordFile(path)
+    columns = records.get_records()
+    assert np.array_equal(columns['step'], [1, 2, 3, 4, 5, 6])
+    assert np.array_equal(columns['n'], 2. * columns['step'])
+    del records, columns
+
+    # Other files are rejected
+    with open("not_records.fluxrec", 'wb') as wfile:
+        wfile.write(b'0' * 64)
+    with pytest.raises(IOError, match="Not a flux record file"):
+        flux_records.FluxRecordFile("not_records.fluxrec")
+
+
 def test_injector_flux_diagnostic():
     name = "injectorfluxDiagnostic"
     # Include a random run number to allow parallel runs to not collide.  Using
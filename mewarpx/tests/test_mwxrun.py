@@ -1,8 +1,12 @@
 """Tests for functionality in mwxrun.py"""
+import io
+import json
 import logging
+import os
 
 import numpy as np
 import pytest
+from pywarpx import callbacks
 import yt
 
 from mewarpx.mwxrun import mwxrun
@@ -86,3 +90,362 @@ def test_capacitive_discharge_multigrid(caplog, name):
     # make sure out isn't empty
     outstr = "SimControl: Total steps reached."
     assert outstr in all_log_output
+
+
+def test_set_phi_grid_scatter():
+    name = "set_phi_grid_scatter"
+    # Include a random run number to allow parallel runs to not collide. Using
+    # python randint prevents collisions due to numpy rseed below
+    testing_util.initialize_testingdir(name)
+
+    # Initialize each run with consistent, randomly-chosen, rseed.
+    np.random.seed(71549302)
+
+    run = diode_setup.DiodeRun_V1(
+        GEOM_STR='XZ',
+        V_ANODE_CATHODE=10.0,
+        D_CA=1e-3,
+        NX=16,
+        NZ=32,
+        DT=1e-12,
+        TOTAL_TIMESTEPS=1,
+        DIAG_STEPS=1,
+        DIAG_INTERVAL=1e-12
+    )
+    run.setup_run(
+        init_conductors=False,
+        init_scraper=False,
+        init_injectors=False,
+        init_warpx=True
+    )
+
+    phi = mwxrun.get_gathered_phi_grid(include_ghosts=True)
+    phi_data = np.random.random(phi.shape)
+
+    # Scatter from each end of the rank range, so the second call cannot
+    # reuse the box slices gathered to the first root
+    for root in (0, mwxrun.n_procs - 1):
+        phi_data += 1.0
+        mwxrun.set_phi_grid(
+            phi_data if mwxrun.me == root else None, root=root
+        )
+        assert np.allclose(
+            mwxrun.get_gathered_phi_grid(include_ghosts=True), phi_data
+        )
+
+    # Setting phi from the array on every processor gives the same result
+    phi_data += 1.0
+    mwxrun.set_phi_grid(phi_data)
+    assert np.allclose(
+        mwxrun.get_gathered_phi_grid(include_ghosts=True), phi_data
+    )
+
+
+def test_gathered_grid_root():
+    name = "gathered_grid_root"
+    # Include a random run number to allow parallel runs to not collide. Using
+    # python randint prevents collisions due to numpy rseed below
+    testing_util.initialize_testingdir(name)
+
+    np.random.seed(20571934)
+
+    run = diode_setup.DiodeRun_V1(
+        GEOM_STR='XZ',
+        V_ANODE_CATHODE=10.0,
+        D_CA=1e-3,
+        NX=16,
+        NZ=32,
+        DT=1e-12,
+        TOTAL_TIMESTEPS=1,
+        DIAG_STEPS=1,
+        DIAG_INTERVAL=1e-12
+    )
+    run.setup_run(
+        init_conductors=False,
+        init_scraper=False,
+        init_injectors=False,
+        init_warpx=True
+    )
+    mwxrun.simulation.step(1)
+
+    # Gathering to a single processor gives the same array as gathering to
+    # all of them, and nothing on the other processors
+    for include_ghosts in (False, True):
+        phi_all = mwxrun.get_gathered_phi_grid(include_ghosts=include_ghosts)
+        rho_all = mwxrun.get_gathered_rho_grid(include_ghosts=include_ghosts)
+        for root in (0, mwxrun.n_procs - 1):
+            phi = mwxrun.get_gathered_phi_grid(
+                include_ghosts=include_ghosts, gather_to=root
+            )
+            rho = mwxrun.get_gathered_rho_grid(
+                include_ghosts=include_ghosts, gather_to=root
+            )
+            if mwxrun.me == root:
+                assert np.array_equal(phi, phi_all)
+                assert np.array_equal(rho, rho_all)
+            else:
+                assert phi is None
+                assert rho is None
+
+    # The anode voltage gives a non-trivial phi to compare
+    assert np.max(np.abs(phi_all)) > 0
+
+
+class _MockLibWarpX(object):
+
+    """Stands in for libwarpx in the call back tests, recording the call
+    backs and schedules passed to WarpX."""
+
+    def __init__(self):
+        self.libwarpx_so = self
+        self.step = 0
+        self.registered = set()
+        self.schedules = {}
+
+    def warpx_getistep(self, lev):
+        return self.step
+
+    def warpx_set_callback_py(self, name, func):
+        self.registered.add(name.value.decode('utf-8'))
+
+    def warpx_clear_callback_py(self, name):
+        self.registered.discard(name.value.decode('utf-8'))
+        self.schedules.pop(name.value.decode('utf-8'), None)
+
+    def warpx_set_callback_py_schedule(self, name, nschedules, periods,
+                                       offsets):
+        self.schedules[name.value.decode('utf-8')] = list(
+            zip(periods[:nschedules], offsets[:nschedules])
+        )
+
+
+@pytest.fixture
+def mock_callbacks(monkeypatch):
+    """Use a mocked libwarpx and keep the test call back lists out of the
+    global list of call backs."""
+    lib = _MockLibWarpX()
+    monkeypatch.setattr(callbacks, "libwarpx", lib)
+    monkeypatch.setattr(callbacks, "_callbacklists", [])
+    return lib
+
+
+def test_callback_profile():
+    profile = callbacks.CallbackProfile()
+    assert profile.todict() == {
+        'ncalls': 0, 'total': 0., 'min': 0., 'max': 0., 'last': []
+    }
+
+    durations = np.arange(1, callbacks.profile_history_length + 3) * 0.5
+    for dt in durations:
+        profile.add(dt)
+    profile_dict = profile.todict()
+    assert profile_dict['ncalls'] == len(durations)
+    assert np.isclose(profile_dict['total'], np.sum(durations))
+    assert profile_dict['min'] == durations[0]
+    assert profile_dict['max'] == durations[-1]
+    # only the most recent durations are kept
+    assert profile_dict['last'] == list(
+        durations[-callbacks.profile_history_length:]
+    )
+
+
+def test_callback_profiles_output(mock_callbacks):
+    testing_util.initialize_testingdir("test_callback_profiles_output")
+
+    calls = []
+
+    def diag_func():
+        calls.append('diag')
+
+    def other_func():
+        calls.append('other')
+
+    cb = callbacks.CallbackFunctions('testcallbacks')
+    cb.installfuncinlist(diag_func)
+    cb.installfuncinlist(other_func)
+    for _ in range(3):
+        cb()
+    assert calls == ['diag', 'other'] * 3
+
+    # profiles are keyed by the qualified function names
+    diag_name = diag_func.__qualname__
+    other_name = other_func.__qualname__
+    profiles = callbacks.getcallbackprofiles()
+    assert list(profiles) == ['testcallbacks']
+    assert profiles['testcallbacks'][diag_name]['ncalls'] == 3
+
+    # On a single processor the reduction keeps the local totals
+    profiles = callbacks.gathercallbackprofiles()
+    metrics = profiles['testcallbacks'][diag_name]
+    assert metrics['ncalls'] == 3
+    assert metrics['npes'] == 1
+    assert metrics['imbalance'] == 1.
+    assert np.isclose(metrics['total_sum'], metrics['total_max'])
+    assert len(metrics['last']) == 3
+
+    callbacks.writecallbackprofiles("callback_profiles.json")
+    with open("callback_profiles.json", "r") as data_file:
+        profile_dicts = json.load(data_file)
+    assert profile_dicts[0]['frame']['name'] == "callback_profiles"
+    assert sorted(
+        child['frame']['name'] for child in profile_dicts[0]['children']
+    ) == sorted(
+        [f"testcallbacks:{diag_name}", f"testcallbacks:{other_name}"]
+    )
+
+    # The printed columns are the total, the average and the imbalance
+    ff = io.StringIO()
+    mock_callbacks.step = 3
+    callbacks.printcallbacktimers(tmin=-1., ff=ff)
+    lines = ff.getvalue().splitlines()
+    assert len(lines) == 2
+    fields = lines[0].split()
+    assert fields[:2] == ['testcallbacks', diag_name]
+    assert float(fields[4]) == 1.
+
+    # Without timers the functions are still called, but not profiled and no
+    # file is written
+    callbacks.enablecallbacktimers(False)
+    assert not callbacks.callbacktimersenabled()
+    cb()
+    assert calls[-2:] == ['diag', 'other']
+    assert callbacks.getcallbackprofiles()['testcallbacks'][diag_name][
+        'ncalls'] == 3
+    mwxrun.write_callback_profiles("no_profiles.json")
+    assert not os.path.exists("no_profiles.json")
+
+    callbacks.enablecallbacktimers(True)
+    assert callbacks.callbacktimersenabled()
+    mwxrun.write_callback_profiles("profiles.json")
+    assert os.path.exists("profiles.json")
+
+
+@pytest.mark.parametrize("timers", [True, False])
+def test_callback_schedules(mock_callbacks, timers):
+    """Scheduled functions are only called on matching steps, also when
+    mixed with functions called on every step, and the schedules passed to
+    WarpX follow the installed functions."""
+    calls = []
+
+    def every_step():
+        calls.append(('every', mock_callbacks.step))
+
+    def every_third():
+        calls.append(('third', mock_callbacks.step))
+
+    class Diag(object):
+        def every_other(self):
+            calls.append(('other', mock_callbacks.step))
+
+    diag = Diag()
+    cb = callbacks.CallbackFunctions('testschedules')
+    callbacks.enablecallbacktimers(timers)
+
+    cb.installfuncinlist(every_third, period=3, offset=1)
+    assert mock_callbacks.schedules['testschedules'] == [(3, 1)]
+    # a function called on every step means WarpX always calls the list
+    cb.installfuncinlist(every_step)
+    assert mock_callbacks.schedules['testschedules'] == []
+    cb.installfuncinlist(diag.every_other, weak=True, period=2)
+
+    for step in range(6):
+        mock_callbacks.step = step
+        cb()
+    assert calls == [
+        ('every', 0), ('other', 0),
+        ('third', 1), ('every', 1),
+        ('every', 2), ('other', 2),
+        ('every', 3),
+        ('third', 4), ('every', 4), ('other', 4),
+        ('every', 5),
+    ]
+
+    # once only scheduled functions are left WarpX is given their schedules
+    cb.uninstallfuncinlist(every_step)
+    assert mock_callbacks.schedules['testschedules'] == [(2, 0), (3, 1)]
+    calls.clear()
+    for step in range(6, 9):
+        mock_callbacks.step = step
+        cb()
+    assert calls == [('other', 6), ('third', 7), ('other', 8)]
+
+    cb.uninstallfuncinlist(diag.every_other)
+    assert mock_callbacks.schedules['testschedules'] == [(3, 1)]
+    cb.uninstallfuncinlist(every_third)
+    assert 'testschedules' not in mock_callbacks.registered
+    assert 'testschedules' not in mock_callbacks.schedules
+
+
+@pytest.mark.parametrize(
+    ("period", "offset"), [(0, 0), (3, -1), (3, 3), (3, 7)]
+)
+def test_callback_schedule_invalid(mock_callbacks, period, offset):
+    cb = callbacks.CallbackFunctions('testinvalid')
+    with pytest.raises(ValueError):
+        cb.installfuncinlist(lambda: None, period=period, offset=offset)
+    assert not cb.hasfuncsinstalled()
+    assert 'testinvalid' not in mock_callbacks.registered
+
+
+def test_callback_schedules_warpx(monkeypatch):
+    """WarpX only calls into Python on scheduled steps when all functions of
+    a call back are scheduled, and on every step otherwise."""
+    name = "callback_schedules_warpx"
+    # Include a random run number to allow parallel runs to not collide. Using
+    # python randint prevents collisions due to numpy rseed below
+    testing_util.initialize_testingdir(name)
+
+    np.random.seed(38105772)
+
+    run = diode_setup.DiodeRun_V1(
+        GEOM_STR='XZ',
+        V_ANODE_CATHODE=10.0,
+        D_CA=1e-3,
+        NX=16,
+        NZ=32,
+        DT=1e-12,
+        TOTAL_TIMESTEPS=12,
+        DIAG_STEPS=12,
+        DIAG_INTERVAL=12e-12
+    )
+    run.setup_run(
+        init_conductors=False,
+        init_scraper=False,
+        init_injectors=False,
+        init_warpx=True
+    )
+    assert not callbacks._afterstep.hasfuncsinstalled()
+
+    # Count the calls WarpX makes into the Python call back list
+    entries = []
+    callfuncsinlist = callbacks._afterstep.callfuncsinlist
+
+    def counting_callfuncsinlist(*args, **kw):
+        entries.append(mwxrun.get_it())
+        return callfuncsinlist(*args, **kw)
+
+    monkeypatch.setattr(
+        callbacks._afterstep, "callfuncsinlist", counting_callfuncsinlist
+    )
+    callbacks.enablecallbacktimers(True)
+
+    scheduled_steps = []
+
+    def scheduled():
+        scheduled_steps.append(mwxrun.get_it())
+
+    callbacks.installafterstep(scheduled, period=3, offset=1)
+    mwxrun.simulation.step(6)
+    assert len(scheduled_steps) == 2
+    assert all(step % 3 == 1 for step in scheduled_steps)
+    assert entries == scheduled_steps
+
+    # With a function called on every step WarpX always calls into Python,
+    # while the scheduled function is still skipped in Python
+    entries.clear()
+    scheduled_steps.clear()
+    callbacks.installafterstep(lambda: None)
+    mwxrun.simulation.step(6)
+    assert len(entries) == 6
+    assert len(scheduled_steps) == 2
+    assert all(step % 3 == 1 for step in scheduled_steps)
@@ -9,6 +9,8 @@ import mewarpx
 from mewarpx.utils_store import (oracle_control, plasma_density_oracle,
                                  testing_util)
 from mewarpx.utils_store import util as mwxutil
+from mewarpx.utils_store.columnstore import ColumnStore
+from mewarpx.utils_store.rng import MEWarpXRNG
 
 
 def test_utils_check_version(caplog):
@@ -111,3 +113,123 @@ def test_oracle_control():
     assert os.path.isfile(os.path.join(
         os.curdir, "seed_density", "ar_ions_particle_density_prediction.npy"
     ))
+
+
+def test_rng_streams(monkeypatch):
+    from mewarpx.mwxrun import mwxrun
+    monkeypatch.setattr(mwxrun, "me", 0, raising=False)
+    rng = MEWarpXRNG()
+
+    # Without a seed the global numpy state is used
+    np.random.seed(17)
+    draws = rng.get_generator("emission").random(5)
+    np.random.seed(17)
+    assert np.array_equal(draws, np.random.random(5))
+
+    # With a seed, repeated calls in a step give independent streams that are
+    # reproduced after the seed is reset
+    rng.set_seed(42)
+    first = rng.get_generator("emission").random(5)
+    second = rng.get_generator("emission").random(5)
+    other = rng.get_generator("scattering").random(5)
+    assert not np.array_equal(first, second)
+    assert not np.array_equal(first, other)
+
+    rng.set_seed(42)
+    assert np.array_equal(rng.get_generator("emission").random(5), first)
+    assert np.array_equal(rng.get_generator("emission").random(5), second)
+
+    # get_seed gives the seed of the stream get_generator would return
+    rng.set_seed(42)
+    seed = rng.get_seed("emission")
+    assert np.array_equal(
+        rng.get_generator("emission", rseed=seed).random(5), first
+    )
+
+    # An explicit rseed ignores the step and processor
+    assert np.array_equal(
+        rng.get_generator("emission", rseed=7).random(5),
+        rng.get_generator("other", rseed=7).random(5)
+    )
+
+    # Shared generators don't depend on the processor
+    rng.set_seed(None)
+    shared = rng.shared_generator("local_injection").random(5)
+    monkeypatch.setattr(mwxrun, "me", 3, raising=False)
+    rng.set_seed(None)
+    assert np.array_equal(
+        rng.shared_generator("local_injection").random(5), shared
+    )
+
+
+def test_rng_spawn_seeds():
+    assert MEWarpXRNG.spawn_seeds(None, 3) == [None]*3
+
+    seeds = MEWarpXRNG.spawn_seeds(11, 3)
+    seeds_again = MEWarpXRNG.spawn_seeds(11, 3)
+    draws = [np.random.default_rng(seed).random(4) for seed in seeds]
+    for seed, draw in zip(seeds_again, draws):
+        assert np.array_equal(np.random.default_rng(seed).random(4), draw)
+    assert not np.array_equal(draws[0], draws[1])
+    assert not np.array_equal(draws[1], draws[2])
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_rng_fill(dtype):
+    rng = MEWarpXRNG()
+    npart = 200000
+
+    out = np.empty(npart, dtype=dtype)
+    result = rng.fill_uniform(
+        out, rng=rng.stream(seed=3), low=-2.0, high=4.0
+    )
+    assert result is out
+    assert out.dtype == dtype
+    assert np.all(out >= -2.0) and np.all(out < 4.0)
+    assert np.isclose(np.mean(out), 1.0, atol=0.03)
+
+    out = np.empty(npart, dtype=dtype)
+    rng.fill_normal(out, rng=rng.stream(seed=3), loc=5.0, scale=2.0)
+    assert np.isclose(np.mean(out), 5.0, atol=0.03)
+    assert np.isclose(np.std(out), 2.0, atol=0.03)
+
+    # Non-contiguous arrays and legacy RandomStates are filled too
+    out = np.zeros((npart, 2), dtype=dtype)[:, 0]
+    rng.fill_uniform(out, rng=np.random.RandomState(3))
+    assert np.all(out >= 0.0) and np.all(out < 1.0)
+    assert np.isclose(np.mean(out), 0.5, atol=0.01)
+
+
+def test_column_store():
+    store = ColumnStore({'species_id': np.int16, 'w': np.float32}, capacity=2)
+    assert store.columns == ['species_id', 'w']
+    assert len(store) == 0
+
+    # Scalar values, picked records and growth beyond the initial capacity
+    w = np.array([1.0, 2.0, 3.0, 4.0])
+    store.append({'w': w}, idx=[0, 3], species_id=1)
+    store.append({'w': w, 'species_id': np.array([2, 3, 4, 5])})
+    store.append({'w': w}, idx=[], species_id=7)
+    assert len(store) == 6
+    data = store.data()
+    assert list(data.keys()) == ['species_id', 'w']
+    assert data['species_id'].dtype == np.int16
+    assert data['w'].dtype == np.float32
+    assert np.array_equal(data['species_id'], [1, 1, 2, 3, 4, 5])
+    assert np.array_equal(data['w'], [1.0, 4.0, 1.0, 2.0, 3.0, 4.0])
+
+    # Columns can only be added while the store is empty
+    with pytest.raises(RuntimeError, match="non-empty store"):
+        store.add_column('E_total', np.float64)
+
+    # Clearing keeps the allocated space, and the data is then overwritten
+    store.cleardata()
+    assert len(store) == 0
+    assert len(store.data()['w']) == 0
+    store.append({'w': w[:1]}, species_id=9)
+    assert np.array_equal(data['species_id'][:1], [9])
+
+    store.cleardata()
+    store.add_column('E_total', np.float64)
+    store.append({'w': w, 'E_total': 2 * w}, species_id=0)
+    assert np.array_equal(store.data()['E_total'], 2 * w)